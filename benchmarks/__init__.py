@@ -0,0 +1,6 @@
+"""Performance benchmarks for the profile and export pipeline.
+
+Benchmarks run against large synthetic inputs generated from a fixed seed, so results
+from different runs and machines measure the same work. See benchmarks/__main__.py for
+running them and comparing results against a baseline.
+"""
@@ -0,0 +1,177 @@
+"""Runs the benchmarks and compares results against a baseline.
+
+Usage:
+
+    python -m benchmarks run [--output results.json] [--filter dcs] [--rounds 5]
+    python -m benchmarks compare baseline.json results.json [--threshold 0.15]
+
+A baseline is a results file kept from an earlier run on the same machine, for example
+with "run --output benchmarks/baseline.json" before making a change. Compare exits with
+status 1 when the median time of any benchmark has grown by more than the threshold.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+from benchmarks.suite import BENCHMARKS, Benchmark
+
+RESULTS_FORMAT = 1
+DEFAULT_THRESHOLD = 0.15
+
+
+@contextmanager
+def isolated_data_root():
+    "Points the application data folder at an empty temporary one, leaving the user's alone"
+    from joystick_diagrams.db import db_handler
+
+    with tempfile.TemporaryDirectory(prefix="jd-benchmark-data-") as directory:
+        with (
+            mock.patch(
+                "joystick_diagrams.utils.data_root", return_value=Path(directory)
+            ),
+            mock.patch(
+                "joystick_diagrams.db.db_connection.data_root",
+                return_value=Path(directory),
+            ),
+        ):
+            db_handler.init()
+            yield
+
+
+def run_benchmark(bench: Benchmark, rounds: int | None = None) -> dict:
+    "Runs one warm up call and then the timed rounds, returns timings in seconds"
+    with tempfile.TemporaryDirectory(prefix="jd-benchmark-") as directory:
+        func = bench.setup(Path(directory))
+        func()
+
+        timings = []
+        for _ in range(rounds or bench.rounds):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+
+    return {
+        "rounds": len(timings),
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "max": max(timings),
+    }
+
+
+def run(args: argparse.Namespace) -> int:
+    selected = [
+        bench
+        for name, bench in BENCHMARKS.items()
+        if not args.filter or args.filter in name
+    ]
+    if not selected:
+        print(f"No benchmarks match {args.filter!r}")
+        return 1
+
+    # Parsers log every binding, which would dominate their timings
+    logging.disable(logging.CRITICAL)
+
+    results = {}
+    try:
+        with isolated_data_root():
+            for bench in selected:
+                print(f"{bench.name} ...", end=" ", flush=True)
+                results[bench.name] = run_benchmark(bench, args.rounds)
+                print(f"median {results[bench.name]['median'] * 1000:.1f} ms")
+    finally:
+        logging.disable(logging.NOTSET)
+
+    output = {
+        "format": RESULTS_FORMAT,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": results,
+    }
+    args.output.write_text(json.dumps(output, indent=2) + "\n", encoding="utf-8")
+    print(f"Results written to {args.output}")
+    return 0
+
+
+def compare_results(
+    baseline: dict, results: dict, threshold: float = DEFAULT_THRESHOLD
+) -> list[str]:
+    "Returns the names of benchmarks whose median grew by more than threshold"
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if before is None:
+            print(f"  {name}: no baseline")
+            continue
+
+        change = result["median"] / before["median"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"  {name}: {before['median'] * 1000:.1f} ms -> "
+            f"{result['median'] * 1000:.1f} ms ({change:+.1%}){flag}"
+        )
+
+    return regressions
+
+
+def compare(args: argparse.Namespace) -> int:
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    results = json.loads(args.results.read_text(encoding="utf-8"))
+
+    print(f"Comparing {args.results} against {args.baseline}")
+    regressions = compare_results(baseline, results, args.threshold)
+
+    if regressions:
+        print(
+            f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}"
+        )
+        return 1
+    print("No regressions")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument(
+        "--output", type=Path, default=Path("benchmark-results.json")
+    )
+    run_parser.add_argument("--filter", help="only run benchmarks containing this")
+    run_parser.add_argument("--rounds", type=int, help="timed rounds per benchmark")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser(
+        "compare", help="flag regressions against a baseline"
+    )
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("results", type=Path)
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed growth of the median, as a fraction",
+    )
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
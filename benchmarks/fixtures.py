@@ -0,0 +1,230 @@
+"""Deterministic generators for large synthetic benchmark inputs.
+
+Every generator takes a seed, so the same arguments always produce byte-identical
+files. Each writes the layout its parser expects below a given directory and returns
+the path to hand to the parser. Profiles and templates come from
+joystick_diagrams.synthetic.
+"""
+
+import random
+import uuid
+from pathlib import Path
+from urllib.parse import quote
+
+from joystick_diagrams import synthetic
+from joystick_diagrams.synthetic import DEFAULT_SEED, command_name
+
+# Modifier keys as the games write them
+MODIFIER_KEYS = ["LAlt", "RAlt", "LCtrl", "RCtrl", "LShift", "RShift"]
+HAT_DIRECTIONS = ["U", "R", "D", "L"]
+AXIS_DIRECTIONS = ["X", "Y", "Z", "RX", "RY", "RZ"]
+
+
+def device_guid(rng: random.Random) -> str:
+    "Returns an upper case GUID, in the form games write them"
+    return synthetic.device_guid(rng).upper()
+
+
+def write_dcs_install(
+    directory: Path,
+    profiles: int = 50,
+    devices_per_profile: int = 10,
+    bindings_per_device: int = 60,
+    seed: int = DEFAULT_SEED,
+) -> Path:
+    """Writes a DCS Saved Games folder, one .diff.lua file per profile device.
+
+    Every file has distinct content, so none are served from the parser's cache.
+    """
+    rng = random.Random(seed)
+    guids = [device_guid(rng) for _ in range(devices_per_profile)]
+
+    for profile in range(profiles):
+        joystick_dir = (
+            directory / "Config" / "Input" / f"Aircraft{profile:03}" / "joystick"
+        )
+        joystick_dir.mkdir(parents=True, exist_ok=True)
+
+        for number, guid in enumerate(guids):
+            path = joystick_dir / f"Synthetic Device {number} {{{guid}}}.diff.lua"
+            path.write_text(dcs_device_diff(rng, bindings_per_device), encoding="utf-8")
+
+    return directory
+
+
+def dcs_device_diff(rng: random.Random, bindings: int) -> str:
+    lines = ["local diff = {", '\t["axisDiffs"] = {']
+    for axis in AXIS_DIRECTIONS:
+        lines += [
+            f'\t\t["a{rng.randrange(2000, 3000)}cdnil{axis}"] = {{',
+            '\t\t\t["added"] = {',
+            f'\t\t\t\t[1] = {{ ["key"] = "JOY_{axis}" }},',
+            "\t\t\t},",
+            f'\t\t\t["name"] = "{command_name(rng, rng.randrange(1000))}",',
+            "\t\t},",
+        ]
+    lines += ["\t},", '\t["keyDiffs"] = {']
+
+    for index in range(bindings):
+        if index % 10 == 9:
+            key = f"JOY_BTN_POV1_{rng.choice(HAT_DIRECTIONS)}"
+        else:
+            key = f"JOY_BTN{rng.randrange(1, 129)}"
+
+        lines += [
+            f'\t\t["d{rng.randrange(3000, 4000)}pnilu{index}cd{rng.randrange(100)}vd1vpnilvu0"] = {{',
+            '\t\t\t["added"] = {',
+            f'\t\t\t\t[1] = {{ ["key"] = "{key}" }},',
+        ]
+        if index % 3 == 0:
+            modifier = rng.choice(MODIFIER_KEYS)
+            lines.append(
+                f'\t\t\t\t[2] = {{ ["key"] = "{key}", ["reformers"] = {{ [1] = "{modifier}" }} }},'
+            )
+        lines += [
+            "\t\t\t},",
+            f'\t\t\t["name"] = "{command_name(rng, index)}",',
+            "\t\t},",
+        ]
+
+    lines += ["\t},", "}", "return diff", ""]
+    return "\n".join(lines)
+
+
+def write_star_citizen_actionmaps(
+    path: Path,
+    actions: int = 20000,
+    devices: int = 4,
+    actions_per_map: int = 100,
+    seed: int = DEFAULT_SEED,
+) -> Path:
+    "Writes a Star Citizen actionmaps.xml, with every action bound to a joystick"
+    from joystick_diagrams.plugins.star_citizen_plugin.star_citizen import (
+        PROFILE_MAPPINGS,
+    )
+
+    rng = random.Random(seed)
+    map_names = list(PROFILE_MAPPINGS)
+
+    lines = [
+        "<ActionMaps>",
+        ' <ActionProfiles version="1" optionsVersion="2" rebindVersion="2" profileName="default">',
+    ]
+    lines += [
+        f'  <options type="joystick" instance="{instance}" Product=" Synthetic Stick {instance}   {{{device_guid(rng)}}}"/>'
+        for instance in range(1, devices + 1)
+    ]
+    lines.append("  <modifiers />")
+
+    for index in range(actions):
+        if index % actions_per_map == 0:
+            if index:
+                lines.append("  </actionmap>")
+            map_name = map_names[(index // actions_per_map) % len(map_names)]
+            lines.append(f'  <actionmap name="{map_name}">')
+
+        instance = rng.randrange(1, devices + 1)
+        match index % 8:
+            case 6:
+                control = f"hat1_{rng.choice(['up', 'down', 'left', 'right'])}"
+            case 7:
+                control = rng.choice(["x", "y", "z", "rotx", "roty", "rotz"])
+            case _:
+                control = f"button{rng.randrange(1, 129)}"
+        if index % 5 == 0:
+            control = f"{rng.choice(['lalt', 'rctrl'])}+{control}"
+
+        lines += [
+            f'   <action name="v_synthetic_action_{index}">',
+            f'    <rebind input="js{instance}_{control}"/>',
+            "   </action>",
+        ]
+
+    if actions:
+        lines.append("  </actionmap>")
+    lines += [" </ActionProfiles>", "</ActionMaps>", ""]
+
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return path
+
+
+def write_gremlin_profile(
+    path: Path,
+    modes: int = 50,
+    devices: int = 4,
+    buttons_per_mode: int = 64,
+    seed: int = DEFAULT_SEED,
+) -> Path:
+    """Writes a Joystick Gremlin profile, each mode of a device inheriting the previous one.
+
+    Later modes bind only part of their buttons, so inheritance has work to do.
+    """
+    rng = random.Random(seed)
+
+    lines = ['<?xml version="1.0" ?>', '<profile version="9">', "    <devices>"]
+    for device in range(devices):
+        lines.append(
+            f'        <device device-guid="{{{device_guid(rng)}}}" label="" name="Synthetic Device {device}" type="joystick">'
+        )
+        for mode in range(modes):
+            inherit = f' inherit="Mode {mode - 1}"' if mode else ""
+            lines.append(f'            <mode{inherit} name="Mode {mode}">')
+            lines += [
+                f'                <axis description="{command_name(rng, axis)}" id="{axis}"/>'
+                for axis in range(1, 7)
+            ]
+            for button in range(1, buttons_per_mode + 1):
+                bound = mode == 0 or rng.random() < 0.3
+                description = command_name(rng, button) if bound else ""
+                lines.append(
+                    f'                <button description="{description}" id="{button}"/>'
+                )
+            lines += [
+                '                <hat description="" id="1">',
+                '                    <container type="basic">',
+                f'                        <description description="{command_name(rng, mode)}"/>',
+                '                        <virtual-button north="1" east="1"/>',
+                "                    </container>",
+                "                </hat>",
+                "            </mode>",
+            ]
+        lines.append("        </device>")
+
+    lines += ["    </devices>", "    <plugins/>", "</profile>", ""]
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return path
+
+
+def write_il2_config(
+    directory: Path,
+    devices: int = 8,
+    bindings: int = 2000,
+    seed: int = DEFAULT_SEED,
+) -> Path:
+    "Writes an IL-2 input folder, a devices.txt and a global.actions file"
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    device_lines = ["configId,guid,model|"]
+    for device in range(devices):
+        guid = quote('"' + str(uuid.UUID(int=rng.getrandbits(128))) + '"')
+        model = quote(f"Synthetic Device {device}")
+        device_lines.append(f"{device},{guid},{model}|")
+    (directory / "devices.txt").write_text("\n".join(device_lines) + "\n", "utf-8")
+
+    action_lines = ["// Input map preset.", "&actions=action,command,invert|"]
+    for index in range(bindings):
+        device = rng.randrange(devices)
+        match index % 10:
+            case 8:
+                control = f"joy{device}_axis_{rng.choice(['x', 'y', 'z', 'rz'])}"
+            case 9:
+                control = f"joy{device}_pov0_{rng.choice([0, 90, 180, 270])}"
+            case _:
+                control = f"joy{device}_b{rng.randrange(0, 128)}"
+        action_lines.append(
+            f"synthetic_action_{index},{control},0| // {command_name(rng, index)}"
+        )
+    (directory / "global.actions").write_text("\n".join(action_lines) + "\n", "utf-8")
+
+    return directory
@@ -0,0 +1,126 @@
+"""The benchmarks, one per pipeline stage.
+
+Each benchmark is a setup function registered with @benchmark. Setup receives an empty
+working directory, writes any fixtures it needs there, and returns the function to
+time. Only calls to the returned function are measured.
+"""
+
+from collections.abc import Callable
+from copy import deepcopy
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+
+from benchmarks import fixtures
+from joystick_diagrams import synthetic
+from joystick_diagrams.synthetic import SyntheticSpec
+
+Setup = Callable[[Path], Callable[[], object]]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    setup: Setup
+    rounds: int
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, rounds: int = 5):
+    "Registers a benchmark setup function under name"
+
+    def decorator(setup: Setup) -> Setup:
+        BENCHMARKS[name] = Benchmark(name, setup, rounds)
+        return setup
+
+    return decorator
+
+
+@benchmark("dcs_world.parse_500_device_files")
+def dcs_world_parse(directory: Path):
+    from joystick_diagrams.plugins.dcs_world_plugin.dcs_world import DCSWorldParser
+
+    path = fixtures.write_dcs_install(directory)
+
+    # A new parser each round, so its cache of parsed files starts empty
+    return lambda: DCSWorldParser(path).process_profiles()
+
+
+@benchmark("star_citizen.parse_20k_actions")
+def star_citizen_parse(directory: Path):
+    from joystick_diagrams.plugins.star_citizen_plugin.star_citizen import StarCitizen
+
+    path = fixtures.write_star_citizen_actionmaps(directory / "actionmaps.xml")
+    return lambda: StarCitizen(path).parse()
+
+
+@benchmark("joystick_gremlin.parse_50_modes")
+def joystick_gremlin_parse(directory: Path):
+    from joystick_diagrams.plugins.joystick_gremlin_plugin.joystick_gremlin import (
+        JoystickGremlinParser,
+    )
+
+    path = fixtures.write_gremlin_profile(directory / "profile.xml")
+    return lambda: JoystickGremlinParser(path).create_dictionary()
+
+
+@benchmark("il2.parse_2k_bindings")
+def il2_parse(directory: Path):
+    from joystick_diagrams.plugins.il2_sturmovik_plugin.il2_parser import IL2Parser
+
+    path = fixtures.write_il2_config(directory / "input")
+    return lambda: IL2Parser(path).process_profiles()
+
+
+# A fully bound device with modifiers, and a template padded to 4 MB with its keys
+TEMPLATE_SPEC = SyntheticSpec(profiles=1, devices_per_profile=1, buttons=128)
+TEMPLATE_SIZE = 4 * 1024 * 1024
+
+
+@benchmark("profile.merge_200_profile_chain", rounds=3)
+def merge_profile_chain(directory: Path):
+    spec = SyntheticSpec(profiles=200, devices_per_profile=2, buttons=24, axes=3)
+    chain = list(synthetic.generate(spec).collection.profiles.values())
+
+    def merge():
+        # As ProfileWrapper.inherit_parents_into_profile folds parents into a profile
+        merged = deepcopy(chain[0])
+        for parent in chain[1:]:
+            merged = merged.merge_profiles(parent)
+        return merged
+
+    return merge
+
+
+@benchmark("template.scan_4mb_template")
+def template_scan(directory: Path):
+    from joystick_diagrams.template import Template
+
+    path = synthetic.write_template(
+        directory / "template.svg", TEMPLATE_SPEC, TEMPLATE_SIZE
+    )
+    return lambda: Template(str(path)).summary
+
+
+@benchmark("export.populate_4mb_template")
+def populate_template(directory: Path):
+    from joystick_diagrams.export import populate_template
+    from joystick_diagrams.export_device import ExportDevice
+    from joystick_diagrams.template import Template
+
+    path = synthetic.write_template(
+        directory / "template.svg", TEMPLATE_SPEC, TEMPLATE_SIZE
+    )
+    template = Template(str(path))
+    template.raw_data  # noqa: B018 - read the template outside the timed function
+
+    profile = synthetic.generate(TEMPLATE_SPEC).collection.profiles.popitem()[1]
+    export_device = ExportDevice(
+        next(iter(profile.devices.values())),
+        template,
+        SimpleNamespace(profile_name="Synthetic Profile"),
+    )
+
+    return lambda: populate_template(export_device)
@@ -0,0 +1,4 @@
+import time
+
+# Taken when the package is first imported, so startup timings include importing the app
+LAUNCH_TIME = time.perf_counter()
@@ -16,34 +16,29 @@ if getattr(sys, "frozen", False):
         os.environ.setdefault("QT_PLUGIN_PATH", str(_plugins))
 
 import logging
-from logging.handlers import RotatingFileHandler
+import multiprocessing
 from pathlib import Path
 
-from joystick_diagrams import app_init
+from joystick_diagrams import app_init, app_logging
 from joystick_diagrams.utils import create_directory, data_root
 
 log_path = Path.joinpath(data_root(), "logs")
 create_directory(str(log_path))
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(module)s %(filename)s - %(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        RotatingFileHandler(
-            str(Path.joinpath(log_path, "application.log")),
-            mode="a",
-            maxBytes=5 * 1000000,
-            backupCount=1,
-        ),
-    ],
-)
+_log_listener = app_logging.configure(log_path)
 _logger = logging.getLogger(__name__)
 _logger.setLevel(logging.INFO)
 
 if __name__ == "__main__":
+    # Required for ProcessPoolExecutor workers in the frozen Windows executable
+    multiprocessing.freeze_support()
+
     try:
         app_init.init()
 
     except Exception as error:
         _logger.exception(error)
+
+    finally:
+        # Writes out any records still queued
+        _log_listener.stop()
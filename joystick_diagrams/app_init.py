@@ -5,20 +5,22 @@ import sys
 from PySide6 import QtWidgets
 from qt_material import apply_stylesheet
 
-from joystick_diagrams import utils
+from joystick_diagrams import LAUNCH_TIME, profiling, tracing, utils
 from joystick_diagrams.app_state import AppState
 from joystick_diagrams.db import db_handler
 from joystick_diagrams.plugins.output_plugin_manager import OutputPluginManager
 from joystick_diagrams.plugins.plugin_manager import ParserPluginManager
 from joystick_diagrams.ui import resources_rc
-from joystick_diagrams.ui.main_window import MainWindow
+from joystick_diagrams.ui.main_window import MainWindow, StartupTiming
 
 _logger = logging.getLogger(__name__)
 
 
-def init():
+def _create_application() -> tuple[QtWidgets.QApplication, MainWindow]:
+    """Set up the datastore, plugins and state, then create and show the main window"""
     # Setup datastore
     db_handler.init()
+    tracing.configure()
     # -------------------------------
 
     # -- Initialise Plugins System --
@@ -31,7 +33,7 @@ def init():
     output_plugins.create_plugin_wrappers()
 
     # Setup global state with plugins
-    _state = AppState(plugin_manager=plugins, output_plugin_manager=output_plugins)
+    AppState(plugin_manager=plugins, output_plugin_manager=output_plugins)
     # -------------------------------
 
     # Setup UI and begin thread
@@ -44,6 +46,14 @@ def init():
 
     QtWidgets.QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
 
+    # PNG export serves in-memory SVGs through a custom scheme, registered before the app exists
+    try:
+        from joystick_diagrams.export_image import register_svg_scheme
+
+        register_svg_scheme()
+    except ImportError as e:
+        _logger.warning(f"QtWebEngine unavailable, PNG export will not work: {e}")
+
     app = QtWidgets.QApplication(sys.argv)
 
     window = MainWindow()
@@ -61,6 +71,25 @@ def init():
         extra=extra,
         css_file=os.path.join(utils.install_root(), "./theme/custom.css"),
     )
+
+    # Warm start from the last successful plugin run, and check for updates, once the
+    # window has painted
+    timing = StartupTiming(window, LAUNCH_TIME)
+    timing.first_painted.connect(window.start_deferred_work)
+    window.startup_finished.connect(timing.log_interactive)
+
+    return app, window
+
+
+def init():
+    # Profile the launch itself when capturing is requested from the environment
+    if profiling.configure():
+        profiling.start_capture("startup")
+
+    with profiling.profiled("startup"):
+        app, _window = _create_application()
+    profiling.finish_capture("startup")
+
     _logger.info(f"Starting up... Install root: {utils.install_root()}")
     app.exec()
 
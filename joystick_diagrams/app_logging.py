@@ -0,0 +1,140 @@
+"""Configures application logging so the threads that log do not wait on file I/O.
+
+Records are put on a bounded queue by a QueueHandler on the root logger, and written
+to the console and the rotating application.log by a QueueListener on a background
+thread, so the UI thread and plugin workers are not stalled by slow writes.
+
+When the writer falls behind, such as with debug mode on during a large parse, the
+full queue holds callers back until it has room. Records are only dropped when the
+writer makes no progress for FULL_QUEUE_TIMEOUT seconds, after which the number
+dropped is logged once the queue has room again.
+
+Worker processes, such as those parsing DCS World device files, have no UI to keep
+responsive and write directly to the console only. Only the main process writes to
+application.log, as several processes rotating the same file fail on Windows and
+interleave their writes.
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+LOG_FORMAT = "%(module)s %(filename)s - %(asctime)s - %(levelname)s - %(message)s"
+LOG_FILE_NAME = "application.log"
+LOG_FILE_MAX_BYTES = 5 * 1000000
+QUEUE_SIZE = 10000
+FULL_QUEUE_TIMEOUT = 1.0
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler that waits for room in a full queue, rather than raising
+
+    dropped counts the records lost since the last report, and is only changed while
+    holding the handler lock.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener runs in this process, so only the message arguments need merging
+        # before they change, rather than copying and formatting the whole record
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # Already held when called through handle(), the lock is reentrant
+        with self.lock:
+            if self.dropped and self._put(self._dropped_record()):
+                self.dropped = 0
+
+            if not self._put(record):
+                self.dropped += 1
+
+    def _put(self, record: logging.LogRecord) -> bool:
+        try:
+            # Once dropping, don't hold up every caller waiting on a stalled writer
+            self.queue.put(record, block=not self.dropped, timeout=FULL_QUEUE_TIMEOUT)
+        except queue.Full:
+            return False
+        return True
+
+    def _dropped_record(self) -> logging.LogRecord:
+        return logging.LogRecord(
+            __name__,
+            logging.WARNING,
+            __file__,
+            0,
+            f"{self.dropped} log records were dropped as the log queue was full",
+            None,
+            None,
+        )
+
+
+class LogListener(QueueListener):
+    """QueueListener that waits for room in a full queue when stopping"""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+def configure(
+    log_path: Path, level: int = logging.INFO, queue_size: int = QUEUE_SIZE
+) -> LogListener | None:
+    """Routes the root logger through a queue to the console and application.log.
+
+    Returns the started listener, which should be stopped on exit to flush the queue,
+    or None in a worker process, which logs only to the console.
+    """
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+
+    if multiprocessing.parent_process() is not None:
+        # A spawned worker process, importing __main__ again
+        root.addHandler(stream_handler)
+        return None
+
+    file_handler = RotatingFileHandler(
+        str(Path.joinpath(log_path, LOG_FILE_NAME)),
+        mode="a",
+        maxBytes=LOG_FILE_MAX_BYTES,
+        backupCount=1,
+    )
+    file_handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    queue_handler = BoundedQueueHandler(log_queue)
+    root.addHandler(queue_handler)
+
+    listener = LogListener(
+        log_queue, stream_handler, file_handler, respect_handler_level=True
+    )
+    listener.start()
+
+    if hasattr(os, "register_at_fork"):
+        # Forked worker processes do not inherit the listener thread
+        os.register_at_fork(
+            after_in_child=lambda: _log_directly(root, queue_handler, stream_handler)
+        )
+    return listener
+
+
+def _log_directly(
+    root: logging.Logger, queue_handler: QueueHandler, handler: logging.Handler
+) -> None:
+    """Replaces the queue handler with the worker's own handler"""
+    if queue_handler not in root.handlers:
+        return
+
+    root.removeHandler(queue_handler)
+    root.addHandler(handler)
@@ -1,8 +1,10 @@
 import logging
+import time
 from copy import deepcopy
 
 from PySide6.QtCore import QTimer
 
+from joystick_diagrams import profile_snapshot, tracing
 from joystick_diagrams.conflict_strategy import (
     AliasConflictStrategy,
     apply_input_conflict,
@@ -58,8 +60,11 @@ class AppState:
 
         self.profileParentMapping: dict[str, list[str]] = {}
         self.processedProfileObjectMapping: dict[str, Profile_] = {}
+        # Plugin wrappers whose results came from a snapshot, pending revalidation
+        self.restored_plugin_wrappers: list[PluginWrapper] = []
         self.process_profiles_from_collections()
 
+    @tracing.traced()
     def process_profiles_from_collections(self):
         plugin_collections = self.get_plugin_wrapper_collections()
 
@@ -85,6 +90,36 @@ class AppState:
         # Apply GUID alias resolution on fully inherited profiles
         self._apply_guid_aliases()
 
+    def restore_profile_snapshot(
+        self, snapshot: dict[str, profile_snapshot.PluginSnapshot] | None = None
+    ) -> list[PluginWrapper]:
+        """Restore plugin collections saved by a previous session, without running the plugins.
+
+        The snapshot is read from disk unless one already loaded is given. Returns the
+        restored plugin wrappers, which should be revalidated against their sources
+        with profile_snapshot.stale_plugin_wrappers.
+        """
+        start = time.perf_counter()
+        if snapshot is None:
+            snapshot = profile_snapshot.load_snapshot()
+        restored = profile_snapshot.restore_snapshot(
+            self.plugin_manager.plugin_wrappers, snapshot
+        )
+        self.restored_plugin_wrappers = restored
+        if restored:
+            self.process_profiles_from_collections()
+
+        _logger.info(
+            f"Restored {len(restored)} plugin results from snapshot in {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+        return restored
+
+    def save_profile_snapshot(self) -> None:
+        """Snapshot the current plugin collections for the next session to restore."""
+        profile_snapshot.save_snapshot(
+            self.plugin_manager.get_enabled_plugin_wrappers()
+        )
+
     def reprocess_profiles_with_notice(
         self, message: str = "Settings applied — profiles reprocessed"
     ) -> None:
@@ -121,12 +156,14 @@ class AppState:
         label.setText(message)
         QTimer.singleShot(duration_ms, lambda: _restore_status_label(label, previous))
 
+    @tracing.traced()
     def initialise_profile_wrappers(self):
         _logger.debug(f"Initialising {len(self.profile_wrappers)} profile wrappers ")
 
         for wrapper in self.profile_wrappers:
             wrapper.initialise_wrapper()
 
+    @tracing.traced()
     def create_profile_wrappers(self, plugin_wrappers: list[PluginWrapper]):
         # Clear Existing Wrappers
         self.profile_wrappers.clear()
@@ -149,6 +186,7 @@ class AppState:
             )
 
     @staticmethod
+    @tracing.traced("AppState._apply_input_routes")
     def _apply_input_routes(
         profile_wrappers: list["ProfileWrapper"],
         strategy: AliasConflictStrategy,
@@ -184,6 +222,7 @@ class AppState:
                     names[guid] = device.name
         return names
 
+    @tracing.traced()
     def _apply_guid_aliases(self):
         """Apply device GUID alias resolution to all profile wrappers.
 
@@ -15,6 +15,7 @@ from joystick_diagrams.db import (
     db_profile_parents,
     db_profiles,
     db_settings,
+    db_template_index,
 )
 
 _logger = logging.getLogger(__name__)
@@ -32,6 +33,7 @@ def init() -> None:
     db_plugin_trust.create_new_db_if_not_exist()
     db_profiles.create_new_db_if_not_exist()
     db_profile_parents.create_new_db_if_not_exist()
+    db_template_index.create_new_db_if_not_exist()
 
 
 if __name__ == "__main__":
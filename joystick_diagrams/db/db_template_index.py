@@ -0,0 +1,38 @@
+import logging
+
+from joystick_diagrams.db.db_connection import connection
+
+_logger = logging.getLogger(__name__)
+
+TABLE_NAME = "template_index"
+
+
+def create_new_db_if_not_exist():
+    con = connection()
+    cur = con.cursor()
+
+    cur.execute(
+        f"CREATE TABLE IF NOT EXISTS {TABLE_NAME}(path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT, summary TEXT)"
+    )
+    con.commit()
+
+
+def get_template_entry(path: str) -> tuple | None:
+    """Returns (size, mtime_ns, sha256, summary) for an indexed template"""
+    con = connection()
+    cur = con.cursor()
+
+    query = "SELECT size, mtime_ns, sha256, summary from template_index WHERE path = ?"
+    cur.execute(query, (path,))
+    return cur.fetchone()
+
+
+def add_update_template_entry(
+    path: str, size: int, mtime_ns: int, sha256: str, summary: str
+) -> None:
+    con = connection()
+    cur = con.cursor()
+
+    query = "INSERT OR REPLACE INTO template_index (path, size, mtime_ns, sha256, summary) VALUES(?,?,?,?,?)"
+    cur.execute(query, (path, size, mtime_ns, sha256, summary))
+    con.commit()
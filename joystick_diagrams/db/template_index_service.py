@@ -0,0 +1,107 @@
+"""Persistent index of template scans, so unchanged templates are never reopened.
+
+Entries are keyed by the resolved template path. A matching size and modification
+time is trusted without touching the file, otherwise the file is hashed and only
+rescanned when its contents differ from the indexed copy.
+"""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from pathlib import Path
+
+from joystick_diagrams.db import db_template_index
+from joystick_diagrams.template import Template, TemplateSummary
+
+_logger = logging.getLogger(__name__)
+
+# Bump when the template scanning changes, to discard summaries made by older versions
+INDEX_VERSION = 1
+
+_SET_FIELDS = ("buttons", "hats", "axis", "modifiers")
+
+
+def summary_to_json(summary: TemplateSummary) -> str:
+    data = dataclasses.asdict(summary)
+    for field in _SET_FIELDS:
+        data[field] = sorted(data[field])
+    return json.dumps({"version": INDEX_VERSION, **data})
+
+
+def summary_from_json(data: str) -> TemplateSummary | None:
+    """Returns the stored summary, None if it was made by another index version"""
+    values = json.loads(data)
+    if values.pop("version", None) != INDEX_VERSION:
+        return None
+    for field in _SET_FIELDS:
+        values[field] = frozenset(values[field])
+    return TemplateSummary(**values)
+
+
+def file_sha256(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _indexed_summary(
+    path: Path, stat: os.stat_result, entry: tuple
+) -> tuple[TemplateSummary | None, str]:
+    """Returns the indexed summary if still valid for the file, and the file hash if one was taken"""
+    size, mtime_ns, indexed_sha256, data = entry
+    try:
+        summary = summary_from_json(data)
+    except (ValueError, TypeError) as e:
+        _logger.warning(f"Discarding unreadable template index entry for {path}: {e}")
+        summary = None
+
+    if summary is None:
+        return None, ""
+
+    if size == stat.st_size and mtime_ns == stat.st_mtime_ns:
+        return summary, indexed_sha256
+
+    # Touched but possibly unchanged, such as a copy or checkout
+    sha256 = file_sha256(path)
+    return (summary if sha256 == indexed_sha256 else None), sha256
+
+
+def load_template(template_path: str | Path) -> Template:
+    """Create a Template, reusing the indexed summary of the file when it is unchanged.
+
+    The index is only an optimisation, any failure to use it falls back to scanning the file.
+    """
+    path = Path(template_path).resolve()
+
+    try:
+        stat = path.stat()
+        entry = db_template_index.get_template_entry(str(path))
+        summary, sha256 = _indexed_summary(path, stat, entry) if entry else (None, "")
+    except (OSError, sqlite3.Error) as e:
+        _logger.warning(f"Template index unavailable for {path}: {e}")
+        return Template(template_path)
+
+    template = Template(template_path, summary=summary)
+
+    if summary is not None and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+        _logger.debug(f"Template index hit for {path}")
+        return template
+
+    if summary is None:
+        _logger.debug(f"Scanning template {path} for the index")
+        summary = template.summary
+
+    try:
+        db_template_index.add_update_template_entry(
+            str(path),
+            stat.st_size,
+            stat.st_mtime_ns,
+            sha256 or file_sha256(path),
+            summary_to_json(summary),
+        )
+    except (OSError, sqlite3.Error) as e:
+        _logger.warning(f"Unable to update template index for {path}: {e}")
+
+    return template
@@ -5,15 +5,21 @@ Supplied <DeviceMapping> and list[Profile]
 Author: Robert Cox
 """
 
+import gzip
+import html
 import logging
 import re
+from collections.abc import Iterable, Iterator
 from datetime import datetime
+from enum import Enum
 from pathlib import Path
 from xml.sax.saxutils import escape, unescape
 
-from joystick_diagrams import utils
+from joystick_diagrams import tracing, utils
 from joystick_diagrams.app_state import AppState
+from joystick_diagrams.db import db_settings
 from joystick_diagrams.export_device import ExportDevice
+from joystick_diagrams.export_image import RenderJob
 from joystick_diagrams.input.modifier import Modifier
 from joystick_diagrams.template import Template
 
@@ -22,19 +28,87 @@ _logger = logging.getLogger(__name__)
 TEMPLATE_NAMING_KEY = "TEMPLATE_NAME"
 TEMPLATE_DATING_KEY = "CURRENT_DATE"
 
+# Every key is a whole word containing an underscore, candidates are matched in one pass
+TEMPLATE_KEY_CANDIDATE = re.compile(r"\b\w*_\w*\b")
+UNUSED_KEY_PATTERNS = [
+    Template.BUTTON_KEY,
+    Template.AXIS_KEY,
+    Template.HAT_KEY,
+    *Template.MODIFIER_KEYS,
+]
+
+EDITOR_PAYLOAD_SETTING_KEY = "export_editor_payload"
+SVGZ_COMPRESSION_SETTING_KEY = "svgz_compression_level"
+
+DEFAULT_SVGZ_COMPRESSION_LEVEL = 6
 
-def export(
-    export_device: ExportDevice, output_directory: str, export_format: str = "SVG"
-) -> tuple[str, str | None] | None:
-    """Export a device. Returns (svg_path, png_path_or_None) on success, None on failure.
 
-    For SVG format: returns (svg_path, None).
-    For PNG format: returns (svg_path, png_path) so the caller can queue conversion.
+class EditorPayloadMode(str, Enum):
+    """What to do with the draw.io editor payload embedded in templates on export.
+
+    - KEEP: exported diagrams carry the payload, with keys substituted in it too.
+    - STRIP: the payload is dropped before substitution.
+    - ARCHIVE: the payload is dropped, and the template's copy saved alongside as .drawio.
     """
+
+    KEEP = "KEEP"
+    STRIP = "STRIP"
+    ARCHIVE = "ARCHIVE"
+
+
+DEFAULT_EDITOR_PAYLOAD_MODE = EditorPayloadMode.KEEP
+
+
+def get_editor_payload_mode() -> EditorPayloadMode:
+    raw = db_settings.get_setting(EDITOR_PAYLOAD_SETTING_KEY)
+    if raw is None:
+        return DEFAULT_EDITOR_PAYLOAD_MODE
     try:
-        return export_device_to_templates(
-            export_device, Path(output_directory), export_format
+        return EditorPayloadMode(raw)
+    except ValueError:
+        _logger.warning(
+            f"Invalid editor payload mode in settings: {raw!r}, using default"
         )
+        return DEFAULT_EDITOR_PAYLOAD_MODE
+
+
+def get_svgz_compression_level() -> int:
+    raw = db_settings.get_setting(SVGZ_COMPRESSION_SETTING_KEY)
+    if raw is None:
+        return DEFAULT_SVGZ_COMPRESSION_LEVEL
+    try:
+        level = int(raw)
+    except ValueError:
+        level = -1
+    if not 1 <= level <= 9:
+        _logger.warning(
+            f"Invalid SVGZ compression level in settings: {raw!r}, using default"
+        )
+        return DEFAULT_SVGZ_COMPRESSION_LEVEL
+    return level
+
+
+def export(
+    export_device: ExportDevice,
+    output_directory: str,
+    export_format: str = "SVG",
+    editor_payload: EditorPayloadMode = DEFAULT_EDITOR_PAYLOAD_MODE,
+) -> tuple[str, None] | RenderJob | None:
+    """Export a device. Returns the export result on success, None on failure.
+
+    For SVG and SVGZ formats: returns (file_path, None).
+    For PNG format: returns a RenderJob holding the populated SVG in memory so the
+    caller can queue conversion, no SVG file is written.
+    """
+    try:
+        with tracing.span(
+            "export device",
+            device=export_device.device_name,
+            profile=export_device.profile_wrapper.profile_name,
+        ):
+            return export_device_to_templates(
+                export_device, Path(output_directory), export_format, editor_payload
+            )
     except PermissionError as e:
         _logger.error(
             f"Permission denied exporting to '{output_directory}': {e}. "
@@ -47,8 +121,11 @@ def export(
 
 
 def export_device_to_templates(
-    export_device: ExportDevice, export_location: Path, export_format: str = "SVG"
-) -> tuple[str, str | None] | None:
+    export_device: ExportDevice,
+    export_location: Path,
+    export_format: str = "SVG",
+    editor_payload: EditorPayloadMode = DEFAULT_EDITOR_PAYLOAD_MODE,
+) -> tuple[str, None] | RenderJob | None:
     """Handles the manipulation of the template."""
 
     if export_device.template is None:
@@ -57,30 +134,92 @@ def export_device_to_templates(
         )
         return None
 
-    # Replace strings in the template data with device data
-    result = populate_template(export_device)
+    template = export_device.template
+    with tracing.span("read template"):
+        template_data = (
+            template.raw_data
+            if editor_payload == EditorPayloadMode.KEEP
+            else template.raw_data_without_editor_payload
+        )
+
+    # Replace strings in the template data with device data, streamed as chunks
+    result = populate_template_chunks(export_device, template_data)
 
     # TODO handle duplicate file names due to device name clashes
     base_name = f"{export_device.device_id[:5]}-{export_device.device.name}-{export_device.profile_wrapper.profile_name}"
 
-    # Always save SVG first
-    svg_file = f"{base_name}.svg"
-    save_template(result, svg_file, export_location)
-    svg_path = str(export_location / svg_file)
+    if editor_payload == EditorPayloadMode.ARCHIVE and template.editor_payload:
+        save_template(
+            html.unescape(template.editor_payload),
+            f"{base_name}.drawio",
+            export_location,
+        )
 
     if export_format == "PNG":
-        png_path = str(export_location / f"{base_name}.png")
-        return (svg_path, png_path)
+        # PNGs are rendered straight from memory, the SVG never touches disk
+        utils.create_directory(export_location)
+        with tracing.span("populate template"):
+            svg = "".join(result)
+        return RenderJob.from_svg(
+            svg,
+            export_location / f"{base_name}.png",
+            template.requires_web_engine,
+        )
+
+    if export_format == "SVGZ":
+        svgz_file = f"{base_name}.svgz"
+        # Populating is streamed into the write, so the two are timed together
+        with tracing.span("populate and write template", format=export_format):
+            save_compressed_template(
+                result, svgz_file, export_location, get_svgz_compression_level()
+            )
+        return (str(export_location / svgz_file), None)
+
+    svg_file = f"{base_name}.svg"
+    with tracing.span("populate and write template", format=export_format):
+        save_template(result, svg_file, export_location)
+    svg_path = str(export_location / svg_file)
 
     return (svg_path, None)
 
 
-def save_template(template_data, file_name, export_path):
+def save_template(template_data: str | Iterable[str], file_name, export_path):
+    """Save template data, given whole or as an iterable of chunks written as they arrive."""
     utils.create_directory(export_path)
 
+    if isinstance(template_data, str):
+        template_data = (template_data,)
+
     try:
         with open(export_path.joinpath(file_name), "w", encoding="UTF-8") as f:
-            f.write(template_data)
+            f.writelines(template_data)
+    except PermissionError as err:
+        raise PermissionError(
+            f"Permission denied writing to '{export_path}'. "
+            f"Choose a different export location or check folder permissions."
+        ) from err
+
+
+def save_compressed_template(
+    template_data: str | Iterable[str],
+    file_name,
+    export_path,
+    compression_level=DEFAULT_SVGZ_COMPRESSION_LEVEL,
+):
+    """Save template data gzip compressed, as an .svgz file browsers can display directly."""
+    utils.create_directory(export_path)
+
+    if isinstance(template_data, str):
+        template_data = (template_data,)
+
+    try:
+        with gzip.open(
+            export_path.joinpath(file_name),
+            "wt",
+            encoding="UTF-8",
+            compresslevel=compression_level,
+        ) as f:
+            f.writelines(template_data)
     except PermissionError as err:
         raise PermissionError(
             f"Permission denied writing to '{export_path}'. "
@@ -94,16 +233,52 @@ def _resolve_command(command: str) -> str:
     return AppState().label_service.resolve(command)
 
 
-def populate_template(export_device: ExportDevice) -> str:
-    """Manipulates template_data to replace known keys with data from Device_"""
-    modified_template_data = export_device.template.raw_data
+def populate_template(
+    export_device: ExportDevice, template_data: str | None = None
+) -> str:
+    """Manipulates template_data to replace known keys with data from Device_
+
+    Uses the template's raw data unless template_data is given.
+    """
+    return "".join(populate_template_chunks(export_device, template_data))
+
+
+def populate_template_chunks(
+    export_device: ExportDevice, template_data: str | None = None
+) -> Iterator[str]:
+    """Yields the populated template as literal template slices and replacement values.
+
+    Keys are found in a single pass over the template, so no intermediate copies of
+    the template are made. Keys without a replacement are removed.
+    """
+    data = export_device.template.raw_data if template_data is None else template_data
+    replacements = get_template_replacements(export_device)
+
+    position = 0
+    for match in TEMPLATE_KEY_CANDIDATE.finditer(data):
+        key = match.group(0)
+        replacement = replacements.get(key.lower())
+
+        if replacement is None:
+            if not any(pattern.fullmatch(key) for pattern in UNUSED_KEY_PATTERNS):
+                continue
+            replacement = ""
+
+        yield data[position : match.start()]
+        yield replacement
+        position = match.end()
+
+    yield data[position:]
+
+
+def get_template_replacements(export_device: ExportDevice) -> dict[str, str]:
+    """Maps each lower cased template key supported by the device to its replacement"""
+    replacements = {}
 
     for input_key, input_object in export_device.device.get_combined_inputs().items():
-        resolved_command = _resolve_command(input_object.command)
-        modified_template_data = replace_input_string(
-            input_key,
-            resolved_command,
-            modified_template_data,
+        key = input_key.lower()
+        replacements.setdefault(
+            key, sanitize_string_for_svg(_resolve_command(input_object.command))
         )
 
         if input_object.modifiers:
@@ -111,24 +286,32 @@ def populate_template(export_device: ExportDevice) -> str:
                 Modifier(m.modifiers, _resolve_command(m.command))
                 for m in input_object.modifiers
             ]
-            modified_template_data = replace_input_modifiers_string(
-                input_key, resolved_modifiers, modified_template_data
+
+            # Due to way SVG handles new lines, this is a compromise for modifiers to be joined and look reasonable
+            replacements.setdefault(
+                f"{key}_modifiers",
+                " | ".join(sanitize_string_for_svg(str(m)) for m in resolved_modifiers),
             )
 
             for modifier_number, modifier in enumerate(resolved_modifiers, 1):
-                modified_template_data = replace_input_modifier_id_key(
-                    input_key, modifier_number, modifier, modified_template_data
+                modifier_key = f"{key}_modifier_{modifier_number}"
+                replacements.setdefault(
+                    modifier_key, sanitize_string_for_svg(str(modifier))
+                )
+                replacements.setdefault(
+                    f"{modifier_key}_key",
+                    sanitize_string_for_svg("+".join(modifier.modifiers)),
+                )
+                replacements.setdefault(
+                    f"{modifier_key}_action", sanitize_string_for_svg(modifier.command)
                 )
 
-    modified_template_data = replace_template_name_string(
-        export_device.profile_wrapper.profile_name, modified_template_data
+    replacements.setdefault(
+        TEMPLATE_NAMING_KEY.lower(), export_device.profile_wrapper.profile_name
     )
+    replacements.setdefault(TEMPLATE_DATING_KEY.lower(), get_template_date())
 
-    modified_template_data = replace_template_date_string(modified_template_data)
-
-    modified_template_data = replace_unused_keys(modified_template_data)
-
-    return modified_template_data
+    return replacements
 
 
 def sanitize_string_for_svg(value_to_sanitize: str) -> str:
@@ -149,98 +332,9 @@ def sanitize_string_for_svg(value_to_sanitize: str) -> str:
     )
 
 
-def replace_input_modifiers_string(
-    input_key: str, modifiers: list[Modifier], data: str
-) -> str:
-    """Replaces the INPUT_KEY_MODIFIERS key with combined modifiers from input"""
-    search = re.compile(rf"\b{input_key}_Modifiers\b", re.IGNORECASE)
-
-    # Create Modifier Strings
-    mod_string = ""
-    total_modifiers = len(modifiers)
-    for modifier_index, modifier in enumerate(modifiers, 1):
-        mod_string = mod_string + sanitize_string_for_svg(str(modifier))
-
-        # Due to way SVG handles new lines, this is a compromise for modifiers to be joined and look reasonable
-        if modifier_index != total_modifiers:
-            mod_string = mod_string + " | "
-
-    return re.sub(search, mod_string, data)
-
-
-def replace_input_modifier_id_key(
-    input_key: str, modifier_number: int, modifier: Modifier, data: str
-) -> str:
-    """Replaces instances where a particular Modifier key has been used, either with an overall ID, or with specific ID/Value combinations"""
-    # Handle INPUT_KEY_MODIFIER_X
-    search = re.compile(rf"\b{input_key}_Modifier_{modifier_number}\b", re.IGNORECASE)
-    replacement = str(modifier)
-
-    data = re.sub(search, sanitize_string_for_svg(replacement), data)
-
-    # INPUT_KEY_Modifier_1_KEY
-    search = re.compile(
-        rf"\b{input_key}_Modifier_{modifier_number}_Key\b", re.IGNORECASE
-    )
-    replacement = "+".join(modifier.modifiers)
-    data = re.sub(search, sanitize_string_for_svg(replacement), data)
-
-    # INPUT_KEY_Modifier_1_ACTION
-    search = re.compile(
-        rf"\b{input_key}_Modifier_{modifier_number}_Action\b", re.IGNORECASE
-    )
-    replacement = f"{modifier.command}"
-    data = re.sub(search, sanitize_string_for_svg(replacement), data)
-
-    return data
-
-
-def replace_input_string(search_key: str, replacement: str, data: str) -> str:
-    """Replaces basic keys with their expected action
-
-    BUTTON_X, AXIS_X, POV_X_X
-    """
-    search = re.compile(rf"\b{search_key}\b", re.IGNORECASE)
-    return re.sub(search, sanitize_string_for_svg(replacement), data)
-
-
-def replace_unused_keys(data: str) -> str:
-    """Replaces all unused keys in the template with default values"""
-    search_keys = [Template.BUTTON_KEY, Template.AXIS_KEY, Template.HAT_KEY]
-    search_keys.extend(Template.MODIFIER_KEYS)
-
-    def find_keys(search_keys: list[re.Pattern]) -> set[str]:
-        found_keys = set()
-        for key in search_keys:
-            result = re.findall(key, data)
-            found_keys.update(set(result))
-        return found_keys
-
-    aggregated_keys = find_keys(search_keys)
-
-    # Best effort fix to gain performance, word boundaries required to prevent partial replacement depending on ordering of keys
-    joined_keys = "|".join({rf"\b{x}\b" for x in aggregated_keys})
-
-    data = re.sub(joined_keys, "", data, flags=re.IGNORECASE)
-
-    return data
-
-
-def replace_template_date_string(data: str) -> str:
-    """Basic replacement of the key with a date at time of run"""
+def get_template_date() -> str:
+    """The current date in the configured export date format"""
     from joystick_diagrams.db.db_settings import get_setting
 
-    search = re.compile(rf"\b{TEMPLATE_DATING_KEY}\b", re.IGNORECASE)
     date_format = get_setting("export_date_format") or "%d/%m/%Y"
-
-    return re.sub(search, datetime.now().strftime(date_format), data)
-
-
-def replace_template_name_string(replacement: str, data: str) -> str:
-    """Basic replacement of the key with a replacement as name"""
-    search = re.compile(rf"\b{TEMPLATE_NAMING_KEY}\b", re.IGNORECASE)
-    return re.sub(search, replacement, data)
-
-
-if __name__ == "__main__":
-    replace_unused_keys("button_2")
+    return datetime.now().strftime(date_format)
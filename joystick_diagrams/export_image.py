@@ -3,132 +3,563 @@
 draw.io SVG templates use <foreignObject> for HTML text rendering, which
 QSvgRenderer cannot handle. QWebEngineView (Chromium-based) renders these
 perfectly but must run on the main thread — so conversion is done as a
-post-processing step after SVG files are saved by the export worker thread.
+post-processing step after the export worker thread has populated the SVGs.
+Several views are kept rendering concurrently to make use of Chromium's
+multi-process rendering. SVGs without any foreignObject are rasterized with
+QSvgRenderer on worker threads instead, see rasterize_without_web_engine.
+
+Populated SVGs are handed over in memory as RenderJobs and served to the views
+through a custom URL scheme, so PNG exports never write the intermediate SVG.
+``QWebEnginePage.setContent`` is not used as it is limited to 2MB of content,
+which several of the bundled WinWing templates exceed.
+
+With ``offscreen=True`` the views are never mapped to a screen, so conversion
+also works headless under the ``offscreen`` Qt platform plugin. Batch use:
+
+    python -m joystick_diagrams.export_image --output pngs/ diagram1.svg diagram2.svg
 """
 
+import argparse
 import logging
-import re
+import os
+import statistics
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
-from PySide6.QtCore import QEventLoop, QObject, QSize, QTimer, QUrl, Signal
-from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import (
+    QByteArray,
+    QEventLoop,
+    QObject,
+    QSize,
+    Qt,
+    QTimer,
+    QUrl,
+    Signal,
+)
+
+from joystick_diagrams import tracing
+from joystick_diagrams.template import (
+    SVG_HEADER_SIZE,
+    Template,
+    parse_svg_header_dimensions,
+)
 
 _logger = logging.getLogger(__name__)
 
+PNG_RENDER_PAGES_SETTING_KEY = "png_render_pages"
+
+# URL scheme the render pages load in-memory SVGs from
+SVG_SCHEME = b"jdsvg"
+
 # Timeout per file in case WebEngine hangs (ms)
 _LOAD_TIMEOUT_MS = 15000
-# Delay after load to allow rendering to complete before grab (ms)
-_RENDER_DELAY_MS = 500
+# Longest wait for the page to report it has painted before grabbing anyway (ms)
+_RENDER_READY_TIMEOUT_MS = 3000
+# Interval between render readiness polls, roughly one frame (ms)
+_RENDER_POLL_INTERVAL_MS = 16
+# Upper bound on concurrent render pages, each is a Chromium renderer
+_MAX_RENDER_PAGES = 8
+
+# Installs a one-off readiness flag on first call and returns its state. The flag
+# is set once web fonts have loaded and two animation frames have passed, i.e.
+# the content has been laid out and committed for painting.
+_RENDER_READY_PROBE = """
+(function () {
+    if (window.__jdRenderReady === undefined) {
+        window.__jdRenderReady = false;
+        var fontsReady = document.fonts ? document.fonts.ready : Promise.resolve();
+        fontsReady.then(function () {
+            requestAnimationFrame(function () {
+                requestAnimationFrame(function () {
+                    window.__jdRenderReady = true;
+                });
+            });
+        });
+    }
+    return window.__jdRenderReady;
+})();
+"""
 
 
 def parse_svg_dimensions(svg_path: Path) -> tuple[int, int]:
     """Extract width and height from an SVG file's root element."""
     with open(svg_path, "r", encoding="utf-8") as f:
-        header = f.read(2000)
+        header = f.read(SVG_HEADER_SIZE)
 
-    width_match = re.search(r'width="(\d+)', header)
-    height_match = re.search(r'height="(\d+)', header)
+    return parse_svg_header_dimensions(header)
 
-    width = int(width_match.group(1)) if width_match else 800
-    height = int(height_match.group(1)) if height_match else 600
 
-    return width, height
+@dataclass
+class RenderJob:
+    """A populated SVG held in memory, waiting to be rendered to a PNG file."""
 
+    svg_data: bytes
+    width: int
+    height: int
+    png_path: Path
+    requires_web_engine: bool = True
 
-class PngConverter(QObject):
-    """Converts a queue of SVG files to PNG using QWebEngineView.
+    @classmethod
+    def from_svg(
+        cls,
+        svg: str,
+        png_path: str | Path,
+        requires_web_engine: bool | None = None,
+    ) -> "RenderJob":
+        """Create a job from SVG text, detecting whether WebEngine is needed unless told."""
+        width, height = parse_svg_header_dimensions(svg[:SVG_HEADER_SIZE])
+        if requires_web_engine is None:
+            requires_web_engine = svg_requires_web_engine(svg)
+        return cls(
+            svg.encode("utf-8"), width, height, Path(png_path), requires_web_engine
+        )
+
+    @classmethod
+    def from_file(cls, svg_path: str | Path, png_path: str | Path) -> "RenderJob":
+        return cls.from_svg(Path(svg_path).read_text(encoding="utf-8"), png_path)
+
+
+def register_svg_scheme():
+    """Register the in-memory SVG URL scheme with WebEngine.
 
-    Must be used on the main thread. Processes files one at a time using
-    a local event loop so the main event loop stays responsive between files.
+    Must be called before the QApplication is created.
     """
+    from PySide6.QtWebEngineCore import QWebEngineUrlScheme
 
-    progress = Signal(int, int)  # current, total
-    finished = Signal()
+    scheme = QWebEngineUrlScheme(SVG_SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Path)
+    scheme.setFlags(
+        QWebEngineUrlScheme.Flag.SecureScheme
+        | QWebEngineUrlScheme.Flag.LocalAccessAllowed
+    )
+    QWebEngineUrlScheme.registerScheme(scheme)
 
-    def __init__(self, conversions: list[tuple[str, str]], scale: int = 2):
-        super().__init__()
-        self._queue = [(Path(s), Path(p)) for s, p in conversions]
-        self._total = len(self._queue)
-        self._current = 0
-        self._scale = scale
 
-    def start(self):
-        # Process the first file after a brief delay to let the UI update
-        QTimer.singleShot(100, self._process_queue)
+def _create_svg_scheme_handler(jobs: dict[str, RenderJob], parent: QObject):
+    """Create a scheme handler serving the SVG data of the given jobs, keyed by URL path."""
+    from PySide6.QtCore import QBuffer, QIODevice
+    from PySide6.QtWebEngineCore import (
+        QWebEngineUrlRequestJob,
+        QWebEngineUrlSchemeHandler,
+    )
 
-    def _process_queue(self):
-        """Process all files sequentially, yielding to the event loop between each."""
+    class SvgSchemeHandler(QWebEngineUrlSchemeHandler):
+        def requestStarted(self, request: QWebEngineUrlRequestJob):  # noqa: N802
+            job = jobs.get(request.requestUrl().path())
+            if job is None:
+                request.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+                return
+
+            # Parented to the request so the buffer lives exactly as long as the reply
+            buffer = QBuffer(request)
+            buffer.setData(job.svg_data)
+            buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+            request.reply(b"image/svg+xml", buffer)
+
+    return SvgSchemeHandler(parent)
+
+
+def svg_requires_web_engine(svg: str) -> bool:
+    """Whether an SVG uses HTML labels, and so can only be rendered by WebEngine."""
+    return bool(Template.FOREIGN_OBJECT.search(svg))
+
+
+def rasterize_svg(job: RenderJob, scale: int = 2) -> bool:
+    """Render an SVG to PNG with QSvgRenderer. Returns False if the SVG could not be rendered.
+
+    Safe to call from worker threads, a QGuiApplication must exist for font access.
+    """
+    with tracing.span("rasterize PNG", path=job.png_path.name):
+        return _rasterize_svg(job, scale)
+
+
+def _rasterize_svg(job: RenderJob, scale: int) -> bool:
+    from PySide6.QtGui import QImage, QPainter
+    from PySide6.QtSvg import QSvgRenderer
+
+    renderer = QSvgRenderer(QByteArray(job.svg_data))
+    if not renderer.isValid():
+        return False
+
+    image = QImage(job.width * scale, job.height * scale, QImage.Format.Format_RGB32)
+    # Match the white page background of the WebEngine render
+    image.fill(Qt.GlobalColor.white)
+
+    painter = QPainter(image)
+    renderer.render(painter)
+    painter.end()
+
+    if not image.save(str(job.png_path), "PNG"):
+        return False
+
+    _logger.info(
+        f"Exported PNG ({image.width()}x{image.height()}) to {job.png_path} using QSvgRenderer"
+    )
+    return True
+
+
+def rasterize_without_web_engine(
+    conversions: list[RenderJob], scale: int = 2
+) -> list[RenderJob]:
+    """Rasterize jobs that do not need HTML layout on a thread pool.
+
+    Returns the jobs left for WebEngine, those with foreignObject content and any
+    QSvgRenderer failed to render.
+    """
+    fast_jobs = [job for job in conversions if not job.requires_web_engine]
+    if not fast_jobs:
+        return conversions
+
+    with ThreadPoolExecutor() as executor:
+        results = list(executor.map(lambda job: rasterize_svg(job, scale), fast_jobs))
+
+    failed = set()
+    for job, rendered in zip(fast_jobs, results, strict=True):
+        if not rendered:
+            _logger.warning(
+                f"QSvgRenderer could not render {job.png_path}, falling back to WebEngine"
+            )
+            failed.add(id(job))
+
+    return [job for job in conversions if job.requires_web_engine or id(job) in failed]
+
+
+def default_page_count() -> int:
+    """Number of concurrent render pages, half the CPU count capped to bound Chromium memory use."""
+    return max(1, min(_MAX_RENDER_PAGES, (os.cpu_count() or 2) // 2))
+
+
+class _RenderPage:
+    """A single offscreen QWebEngineView and the conversion it is currently rendering.
+
+    Rendering is driven by signals and timers rather than a local event loop,
+    so several pages can load and paint concurrently on the main thread.
+    """
+
+    def __init__(
+        self, converter: "PngConverter", profile, number: int, offscreen: bool = False
+    ):
+        from PySide6.QtWebEngineCore import QWebEnginePage
         from PySide6.QtWebEngineWidgets import QWebEngineView
 
-        view = QWebEngineView()
-        # Position offscreen but show it — WebEngine needs a visible widget to render
-        view.move(-10000, -10000)
-        view.show()
+        self._converter = converter
+        self._track = f"PNG render page {number}"
+        self.job: RenderJob | None = None
+        self._url: QUrl | None = None
+        self._started = 0.0
+        self._ready_deadline = 0.0
+
+        self.view = QWebEngineView()
+        self.view.setPage(QWebEnginePage(profile, self.view))
+        if offscreen:
+            # Rendered and grabbed without ever being mapped to a screen
+            self.view.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen)
+        else:
+            # Position offscreen but show it — WebEngine needs a visible widget to render
+            self.view.move(-10000, -10000)
+        self.view.show()
+        self.view.page().loadingChanged.connect(self._on_loading_changed)
+
+        self._load_timeout = QTimer()
+        self._load_timeout.setSingleShot(True)
+        self._load_timeout.timeout.connect(self._on_load_timeout)
+
+    @property
+    def idle(self) -> bool:
+        return self.job is None
+
+    def render(self, job: RenderJob, url: QUrl):
+        """Start loading an SVG, the PNG is written once the page has painted."""
+        self.job = job
+        self._started = time.perf_counter()
+
+        try:
+            # Set view to native SVG size — the SVG fills the viewport exactly.
+            # Use zoomFactor for crisp higher-resolution output.
+            scale = self._converter.scale
+            self.view.setFixedSize(QSize(job.width * scale, job.height * scale))
+            self.view.setZoomFactor(scale)
+
+            self._url = url
+            self._load_timeout.start(_LOAD_TIMEOUT_MS)
+            self.view.load(self._url)
+        except Exception as e:
+            _logger.error(f"PNG conversion failed for {job.png_path}: {e}")
+            self._complete()
+
+    def _on_loading_changed(self, info):
+        from PySide6.QtWebEngineCore import QWebEngineLoadingInfo
+
+        # Ignore signals from aborted loads of a previous job
+        if self.job is None or info.url() != self._url:
+            return
+
+        status = info.status()
+        if status == QWebEngineLoadingInfo.LoadStatus.LoadStartedStatus:
+            return
+
+        self._load_timeout.stop()
+
+        if status != QWebEngineLoadingInfo.LoadStatus.LoadSucceededStatus:
+            _logger.error(
+                f"Failed to load SVG ({info.errorString()}) for {self.job.png_path}"
+            )
+            self._complete()
+            return
+
+        self._ready_deadline = time.perf_counter() + _RENDER_READY_TIMEOUT_MS / 1000
+        self._poll_render_ready(self.job)
+
+    def _poll_render_ready(self, job: RenderJob):
+        """Ask the page whether it has painted, grabbing once it has or the deadline passes."""
+        if self.job is not job:
+            return
+
+        def on_result(ready):
+            if self.job is not job:
+                return
+
+            if ready:
+                self._grab(job)
+            elif time.perf_counter() >= self._ready_deadline:
+                _logger.warning(
+                    f"Render readiness not reported within {_RENDER_READY_TIMEOUT_MS}ms, grabbing anyway: {job.png_path}"
+                )
+                self._grab(job)
+            else:
+                QTimer.singleShot(
+                    _RENDER_POLL_INTERVAL_MS, lambda: self._poll_render_ready(job)
+                )
+
+        self.view.page().runJavaScript(_RENDER_READY_PROBE, on_result)
+
+    def _on_load_timeout(self):
+        if self.job is None:
+            return
 
-        for svg_path, png_path in self._queue:
-            self._current += 1
+        _logger.error(f"Failed to load SVG (timeout) for {self.job.png_path}")
+        self._url = None
+        self.view.stop()
+        self._complete()
 
-            try:
-                self._convert_one(view, svg_path, png_path)
-            except Exception as e:
-                _logger.error(f"PNG conversion failed for {svg_path}: {e}")
+    def _grab(self, job: RenderJob):
+        if self.job is not job:
+            return
 
-            # Clean up intermediate SVG
-            try:
-                svg_path.unlink(missing_ok=True)
-            except OSError:
-                pass
+        png_path = job.png_path
+        try:
+            pixmap = self.view.grab()
+
+            if not pixmap.isNull():
+                pixmap.save(str(png_path), "PNG")
+                finished = time.perf_counter()
+                latency_ms = (finished - self._started) * 1000
+                tracing.record(
+                    "render PNG",
+                    int(self._started * 1e9),
+                    int(finished * 1e9),
+                    track=self._track,
+                    path=png_path.name,
+                )
+                self._converter.render_latencies.append(latency_ms)
+                self._converter.written.append(png_path)
+                _logger.info(
+                    f"Exported PNG ({pixmap.width()}x{pixmap.height()}) to {png_path} in {latency_ms:.0f}ms"
+                )
+            else:
+                _logger.error(f"grab() returned null pixmap for {png_path}")
+        except Exception as e:
+            _logger.error(f"PNG conversion failed for {png_path}: {e}")
+
+        self._complete()
+
+    def _complete(self):
+        job = self.job
+        self.job = None
+        self._url = None
+        self._converter._on_page_complete(self, job)
+
+    def close(self):
+        self._load_timeout.stop()
+        self.view.close()
+        self.view.deleteLater()
 
-            self.progress.emit(self._current, self._total)
-            # Let UI repaint between files
-            QApplication.processEvents()
 
-        view.close()
-        view.deleteLater()
-        self.finished.emit()
+class PngConverter(QObject):
+    """Converts a queue of in-memory SVGs to PNG using a pool of QWebEngineViews.
 
-    def _convert_one(self, view, svg_path: Path, png_path: Path):
-        """Load a single SVG in the view, wait for render, grab to PNG."""
-        width, height = parse_svg_dimensions(svg_path)
+    Must be used on the main thread. Keeps up to ``pages`` offscreen views
+    rendering concurrently; queued files are dispatched round-robin as pages
+    become free, and ``progress`` is emitted as each file completes.
 
-        # Set view to native SVG size — the SVG fills the viewport exactly.
-        # Use zoomFactor for crisp higher-resolution output.
-        view.setFixedSize(QSize(width * self._scale, height * self._scale))
-        view.setZoomFactor(self._scale)
+    When ``offscreen`` is set the views are never shown on a screen, for use
+    without a display.
+    """
 
-        loop = QEventLoop()
-        loaded_ok = [False]
+    progress = Signal(int, int)  # current, total
+    finished = Signal()
 
-        def on_load(ok):
-            loaded_ok[0] = ok
-            loop.quit()
+    def __init__(
+        self,
+        conversions: list[RenderJob],
+        scale: int = 2,
+        pages: int | None = None,
+        offscreen: bool = False,
+    ):
+        super().__init__()
+        self._queue = deque(conversions)
+        self._total = len(self._queue)
+        self._current = 0
+        self.scale = scale
+        self.offscreen = offscreen
+        self._page_count = max(1, min(pages or default_page_count(), self._total))
+        self._pages: list[_RenderPage] = []
+        # SVG data currently being served to the render pages, keyed by URL path
+        self._served_jobs: dict[str, RenderJob] = {}
+        self._job_number = 0
+        self._profile = None
+        self.render_latencies: list[float] = []
+        self.written: list[Path] = []
 
-        view.loadFinished.connect(on_load)
+    def start(self):
+        # Process the first files after a brief delay to let the UI update
+        QTimer.singleShot(100, self._process_queue)
 
-        # Load the SVG
-        view.load(QUrl.fromLocalFile(str(svg_path.resolve())))
+    def _process_queue(self):
+        """Create the render pages and hand each one its first file."""
+        if not self._queue:
+            self.finished.emit()
+            return
 
-        # Wait for loadFinished with a timeout
-        QTimer.singleShot(_LOAD_TIMEOUT_MS, loop.quit)
-        loop.exec()
+        _logger.info(
+            f"Converting {self._total} SVGs to PNG using {self._page_count} render pages"
+        )
+        from PySide6.QtWebEngineCore import QWebEngineProfile
+
+        # A private off the record profile, so the scheme handler is only seen by our pages
+        self._profile = QWebEngineProfile(self)
+        self._profile.installUrlSchemeHandler(
+            SVG_SCHEME, _create_svg_scheme_handler(self._served_jobs, self._profile)
+        )
+        self._pages = [
+            _RenderPage(self, self._profile, number, self.offscreen)
+            for number in range(1, self._page_count + 1)
+        ]
+
+        for page in self._pages:
+            self._dispatch(page)
+
+    def _dispatch(self, page: _RenderPage):
+        if self._queue:
+            job = self._queue.popleft()
+            self._job_number += 1
+            path = f"{self._job_number}.svg"
+            self._served_jobs[path] = job
+            page.render(job, QUrl(f"{SVG_SCHEME.decode()}:{path}"))
+            return
 
-        view.loadFinished.disconnect(on_load)
+        if all(p.idle for p in self._pages):
+            for p in self._pages:
+                p.close()
+            self._pages = []
+            self._log_latency_summary()
+            self.finished.emit()
 
-        if not loaded_ok[0]:
-            _logger.error(f"Failed to load SVG (timeout or error): {svg_path}")
+    def _log_latency_summary(self):
+        if not self.render_latencies:
             return
 
-        # Give the renderer time to paint after loading
-        paint_loop = QEventLoop()
-        QTimer.singleShot(_RENDER_DELAY_MS, paint_loop.quit)
-        paint_loop.exec()
+        _logger.info(
+            f"PNG render latency over {len(self.render_latencies)} files: "
+            f"min {min(self.render_latencies):.0f}ms, "
+            f"median {statistics.median(self.render_latencies):.0f}ms, "
+            f"max {max(self.render_latencies):.0f}ms"
+        )
+
+    def _on_page_complete(self, page: _RenderPage, job: RenderJob):
+        # Release the SVG data once its page is done with it
+        for path, served in list(self._served_jobs.items()):
+            if served is job:
+                del self._served_jobs[path]
 
-        pixmap = view.grab()
+        self._current += 1
+        self.progress.emit(self._current, self._total)
+        self._dispatch(page)
 
-        if not pixmap.isNull():
-            pixmap.save(str(png_path), "PNG")
-            _logger.info(
-                f"Exported PNG ({pixmap.width()}x{pixmap.height()}) to {png_path}"
+
+def convert_svgs_to_png(
+    conversions: list[RenderJob], scale: int = 2, pages: int | None = None
+) -> list[Path]:
+    """Convert SVGs to PNG, blocking until done. Returns the PNG files written.
+
+    Intended for batch use outside of the UI, a headless QApplication is
+    created if one does not already exist.
+    """
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance()
+    if app is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+        try:
+            register_svg_scheme()
+        except ImportError as e:
+            _logger.warning(
+                f"QtWebEngine unavailable, only plain SVGs will render: {e}"
             )
-        else:
-            _logger.error(f"grab() returned null pixmap for {svg_path}")
+        app = QApplication(sys.argv[:1])
+
+    remaining = rasterize_without_web_engine(conversions, scale)
+    remaining_ids = {id(job) for job in remaining}
+    written = [job.png_path for job in conversions if id(job) not in remaining_ids]
+
+    if not remaining:
+        return written
+
+    converter = PngConverter(remaining, scale=scale, pages=pages, offscreen=True)
+    loop = QEventLoop()
+    converter.finished.connect(loop.quit)
+    converter.start()
+    loop.exec()
+    converter.deleteLater()
+
+    return written + converter.written
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m joystick_diagrams.export_image",
+        description="Render SVG diagrams to PNG without a display.",
+    )
+    parser.add_argument("svgs", nargs="+", type=Path, help="SVG files to convert")
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="Directory to write PNGs to, defaults to alongside each SVG",
+    )
+    parser.add_argument("--scale", type=int, default=2, help="Render scale factor")
+    parser.add_argument("--pages", type=int, help="Concurrent render pages")
+    args = parser.parse_args(argv)
+
+    if args.output:
+        args.output.mkdir(parents=True, exist_ok=True)
+
+    conversions = [
+        RenderJob.from_file(
+            svg, (args.output or svg.parent) / svg.with_suffix(".png").name
+        )
+        for svg in args.svgs
+    ]
+    written = convert_svgs_to_png(conversions, scale=args.scale, pages=args.pages)
+
+    return 0 if len(written) == len(conversions) else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    sys.exit(main())
@@ -127,7 +127,11 @@ class Device_:  # noqa: N801
 
         Returns:  None
         """
-        _logger.debug(f"Adding modifier {modifier} to input {control}")
+        # Called per binding, so skip building messages unless debug logging is on
+        debug = _logger.isEnabledFor(logging.DEBUG)
+
+        if debug:
+            _logger.debug(f"Adding modifier {modifier} to input {control}")
 
         # Magic
         type_key = self.resolve_type(control)
@@ -138,9 +142,10 @@ class Device_:  # noqa: N801
         )
 
         if input_obj is None:
-            _logger.debug(
-                f"Modifier attempted to be added to {control} but input does not exist. So a shell will be created"
-            )
+            if debug:
+                _logger.debug(
+                    f"Modifier attempted to be added to {control} but input does not exist. So a shell will be created"
+                )
 
             # Create the control object
             self.create_input(control, command="")
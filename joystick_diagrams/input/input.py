@@ -44,25 +44,36 @@ class Input_:  # noqa: N801
         """Adds a modifier to an existing input, or amends an existing modifier"""
         existing = self._check_existing_modifier(modifier)
 
-        _logger.debug(f"Existing modifier check is {existing}")
+        # Called per binding, so skip building messages unless debug logging is on
+        debug = _logger.isEnabledFor(logging.DEBUG)
+
+        if debug:
+            _logger.debug(f"Existing modifier check is {existing}")
 
         if existing is None:
-            _logger.debug(
-                f"Modifier {modifier} for input {self.input_control} not found so adding"
-            )
+            if debug:
+                _logger.debug(
+                    f"Modifier {modifier} for input {self.input_control} not found so adding"
+                )
             self.modifiers.append(Modifier(modifier, command))
         else:
-            _logger.debug(
-                f"Modifier {modifier} already exists for {self.input_control} and command has been overidden"
-            )
+            if debug:
+                _logger.debug(
+                    f"Modifier {modifier} already exists for {self.input_control} and command has been overidden"
+                )
             existing.command = command
 
     def _check_existing_modifier(self, modifier: set) -> Modifier | None:
-        _logger.debug(f"Existing modifiers: {self.modifiers}")
+        debug = _logger.isEnabledFor(logging.DEBUG)
+
+        if debug:
+            _logger.debug(f"Existing modifiers: {self.modifiers}")
         for x in self.modifiers:
-            _logger.debug(f"Checking for existing modifier {modifier} in {x}")
+            if debug:
+                _logger.debug(f"Checking for existing modifier {modifier} in {x}")
             if x.modifiers == modifier:
-                _logger.debug(f"Modifier already  exists {x}")
+                if debug:
+                    _logger.debug(f"Modifier already  exists {x}")
                 return x
         return None
 
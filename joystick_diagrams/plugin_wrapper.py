@@ -1,11 +1,13 @@
-""" Wrapper functionality for Plugins for the UI
+"""Wrapper functionality for Plugins for the UI
 
 Primarily handles passthrough plugin_interface concrete implementations.
 """
 
 import logging
+import time
 from dataclasses import dataclass, field
 
+from joystick_diagrams import tracing, utils
 from joystick_diagrams.db import db_plugin_data
 from joystick_diagrams.exceptions import JoystickDiagramsError
 from joystick_diagrams.input.profile_collection import ProfileCollection
@@ -15,12 +17,73 @@ from joystick_diagrams.plugins.plugin_settings import PluginSettings
 _logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class PluginRunMetrics:
+    """Measurements of a single plugin run"""
+
+    wall_time: float  # Seconds
+    files_read: int  # Source files the plugin parses, from its source_files
+    bytes_read: int
+    profiles: int
+    devices: int
+    bindings: int  # Bound inputs, and the modifiers on them
+    peak_memory_delta: int | None  # Bytes the run raised the process peak by
+
+    @classmethod
+    def measure(
+        cls,
+        collection: ProfileCollection | None,
+        wall_time: float,
+        source_files: list[tuple[str, int, int]],
+        peak_memory_delta: int | None,
+    ) -> "PluginRunMetrics":
+        profiles = collection.profiles.values() if collection else []
+        devices = [
+            device for profile in profiles for device in profile.devices.values()
+        ]
+        inputs = [
+            input_
+            for device in devices
+            for input_ in device.get_combined_inputs().values()
+        ]
+        return cls(
+            wall_time=wall_time,
+            files_read=len(source_files),
+            bytes_read=sum(size for _, size, _ in source_files),
+            profiles=len(profiles),
+            devices=len(devices),
+            bindings=len(inputs) + sum(len(input_.modifiers) for input_ in inputs),
+            peak_memory_delta=peak_memory_delta,
+        )
+
+    def summary(self) -> str:
+        text = (
+            f"{self.wall_time:.2f}s, {self.files_read} files ({format_size(self.bytes_read)}), "
+            f"{self.profiles} profiles, {self.devices} devices, {self.bindings} bindings"
+        )
+        if self.peak_memory_delta is not None:
+            text += f", peak memory +{format_size(self.peak_memory_delta)}"
+        return text
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
 @dataclass
 class PluginWrapper:
     plugin: PluginInterface
     _enabled: bool = False
     _error: str = field(default_factory=str)
     plugin_profile_collection: ProfileCollection | None = field(init=False)
+    # Fingerprint of the plugin sources when plugin_profile_collection was produced
+    source_fingerprint: str | None = field(init=False, default=None)
+    # Measurements of the last run, None until the plugin has run
+    run_metrics: PluginRunMetrics | None = field(init=False, default=None)
 
     def __post_init__(self):
         self.plugin_profile_collection = None
@@ -29,11 +92,23 @@ class PluginWrapper:
     def process(self) -> bool:
         """Runs a specific plugin, attaching the result to the wrapper."""
         self.plugin_profile_collection = None
+        self.source_fingerprint = None
+        self.run_metrics = None
         try:
             if self.ready and self.enabled:
-                result = self.plugin.process()
+                # Taken before parsing so edits made during the run count as changes
+                source_files = self.plugin.source_files()
+                fingerprint = self.plugin.source_fingerprint(source_files)
+                peak_memory = utils.peak_memory_usage()
+                start = time.perf_counter()
+                with tracing.span(f"parse {self.name}"):
+                    result = self.plugin.process()
+                wall_time = time.perf_counter() - start
+
                 if isinstance(result, ProfileCollection):
                     self.plugin_profile_collection = result
+                    self.source_fingerprint = fingerprint
+                self.record_run_metrics(wall_time, peak_memory, source_files)
             return True
         except Exception as e:
             _logger.error(JoystickDiagramsError(f"Plugin had an unexpected error: {e}"))
@@ -42,6 +117,26 @@ class PluginWrapper:
             )
             return False
 
+    def record_run_metrics(
+        self,
+        wall_time: float,
+        peak_memory: int | None,
+        source_files: list[tuple[str, int, int]],
+    ):
+        peak_memory_after = utils.peak_memory_usage()
+        peak_memory_delta = (
+            peak_memory_after - peak_memory
+            if peak_memory is not None and peak_memory_after is not None
+            else None
+        )
+        self.run_metrics = PluginRunMetrics.measure(
+            self.plugin_profile_collection,
+            wall_time,
+            source_files,
+            peak_memory_delta,
+        )
+        _logger.info(f"Plugin {self.name} run: {self.run_metrics.summary()}")
+
     def push_error(self, error: str):
         self._error = error
 
@@ -1,30 +1,15 @@
 from pathlib import Path
 
-from pydantic import Field
-
 from joystick_diagrams.input.profile_collection import ProfileCollection
 from joystick_diagrams.plugins.plugin_interface import PluginInterface
-from joystick_diagrams.plugins.plugin_settings import PluginMeta, PluginSettings
-
+from joystick_diagrams.plugins.plugin_manifest import read_manifest
 
-class ExampleSettings(PluginSettings):
-    # Define your path fields here. Required paths block ready state until set.
-    source_dir: Path | None = Field(
-        default=None,
-        title="Source Folder",
-        json_schema_extra={
-            "is_folder": True,
-            "default_path": "~/Saved Games",
-        },
-    )
-    # Add any non-path settings below:
-    # some_toggle: bool = Field(default=True, title="Enable Feature")
+from .settings import ExampleSettings
 
 
 class ParserPlugin(PluginInterface):
-    plugin_meta = PluginMeta(
-        name="EXAMPLE PLUGIN", version="0.0.1", icon_path="img/logo.ico"
-    )
+    # Name, version and icon are read from plugin.json
+    plugin_meta = read_manifest(Path(__file__).parent)
     plugin_settings_model = ExampleSettings
 
     def __init__(self):
@@ -0,0 +1,19 @@
+from pathlib import Path
+
+from pydantic import Field
+
+from joystick_diagrams.plugins.plugin_settings import PluginSettings
+
+
+class ExampleSettings(PluginSettings):
+    # Define your path fields here. Required paths block ready state until set.
+    source_dir: Path | None = Field(
+        default=None,
+        title="Source Folder",
+        json_schema_extra={
+            "is_folder": True,
+            "default_path": "~/Saved Games",
+        },
+    )
+    # Add any non-path settings below:
+    # some_toggle: bool = Field(default=True, title="Enable Feature")
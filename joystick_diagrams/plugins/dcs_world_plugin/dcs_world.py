@@ -1,9 +1,12 @@
 """DCS World Lua Config Parser for use with Joystick Diagrams"""
 
+import hashlib
 import logging
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import NoReturn
 
 from ply import lex, yacc
 
@@ -28,74 +31,94 @@ JOYSTICK_DIR = "joystick"
 GUID_POSITION_SLICE = slice(-46, -10)
 NAME_POSITION_SLICE = slice(-48)
 
+# Compact binding parsed from a device file: (DCS input key, modifier keys, operation name)
+DeviceBinding = tuple[str, tuple[str, ...], str]
+
 
 class DCSWorldParser:
-    def __init__(self, path, easy_modes=True):
+    def __init__(self, path, easy_modes=True, parse_workers: int = 1):
         self.path = Path(path)
         self.remove_easy_modes = easy_modes
+        self.parse_workers = parse_workers
+        # Parsed bindings keyed by sha256 of the device file bytes, shared across profiles and runs
+        self.device_bindings_cache: dict[str, list[DeviceBinding] | None] = {}
         self.__easy_mode = EASY_MODES
-        self.base_directory = self.__validate_base_directory()
-        self.valid_profiles = self.__validate_profiles()
+        # Profile name -> .lua DirEntries in its joystick directory, from a single scandir pass
+        self.profile_device_files: dict[str, list[os.DirEntry]] = {}
+        self.base_directory: list[os.DirEntry] = []
+        self.valid_profiles: list[str] = []
+        self.discover_profiles()
         self.joystick_listing = {}
         self.profiles_to_process = None
         self.profile_devices = None
         self.fq_path = None
 
-    def __validate_base_directory(self) -> list:
+    def discover_profiles(self):
+        """Scan the Input directory once, caching valid profiles and their device files.
+
+        The result is reused by validation, get_validated_profiles and the next process_profiles run.
+        """
+        self.base_directory = self.__validate_base_directory()
+        self.profile_device_files = {}
+        self.valid_profiles = self.__validate_profiles()
+        self.__discovery_consumed = False
+
+    def __validate_base_directory(self) -> list[os.DirEntry]:
         """Validate the base directory structure, make sure there are files."""
-        # TODO refactor
-        if Path(self.path).joinpath(CONFIG_DIR).exists():
-            try:
-                return os.listdir(os.path.join(self.path, CONFIG_DIR, INPUT_DIR))
-            except FileNotFoundError:
-                raise FileNotFoundError("DCS: No input directory found") from None
-        else:
+        if not Path(self.path).joinpath(CONFIG_DIR).exists():
             raise FileNotFoundError("DCS: No Config Folder found in DCS Folder.")
 
+        try:
+            with os.scandir(os.path.join(self.path, CONFIG_DIR, INPUT_DIR)) as entries:
+                return list(entries)
+        except FileNotFoundError:
+            raise FileNotFoundError("DCS: No input directory found") from None
+
     def __validate_profiles(self) -> list[str]:
         """Validate Profiles Routine"""
         if len(self.base_directory) == 0:
             raise FileExistsError("DCS: No profiles exist in Input directory!")
 
         valid_items = []
-        for item in self.base_directory:
-            valid = self.__validate_profile(item)
-            if valid:
-                valid_items.append(item)
+        for entry in self.base_directory:
+            valid_files = self.__validate_profile(entry)
+            if valid_files:
+                self.profile_device_files[entry.name] = valid_files
+                valid_items.append(entry.name)
             else:
-                _logger.info(f"DCS: Profile {item} has no joystick directory files")
+                _logger.info(
+                    f"DCS: Profile {entry.name} has no joystick directory files"
+                )
 
         return valid_items
 
-    def __validate_profile(self, item: str) -> list | bool:
+    def __validate_profile(self, entry: os.DirEntry) -> list[os.DirEntry]:
         """Validate Inidividual Profile
-        Return Valid Profile
+        Return the profile's valid device files
         """
+        if not entry.is_dir():
+            return []
 
-        item_path = Path.joinpath(self.path, CONFIG_DIR, INPUT_DIR, Path(item))
-
-        if not item_path.is_dir():
-            return False
-
-        if not {x for x in item_path.iterdir() if x.stem == JOYSTICK_DIR}:
-            return False
-
-        item_joystick_files_directory = Path.joinpath(item_path, JOYSTICK_DIR)
-        valid_files = self.get_valid_files_for_profile(item_joystick_files_directory)
-
-        if valid_files:
-            return valid_files
-
-        return False
+        try:
+            return scan_device_files(os.path.join(entry.path, JOYSTICK_DIR))
+        except (FileNotFoundError, NotADirectoryError):
+            return []
 
     def get_valid_files_for_profile(self, path: Path) -> list[Path]:
         """Returns a list of files deemed to be valid in a DCS Profile device type directory"""
-        return list(
-            filter(
-                lambda x: x.suffix == ".lua" and not x.is_dir(),
-                path.iterdir(),
+        return [Path(entry.path) for entry in scan_device_files(path)]
+
+    def get_profile_device_files(self, profile: str) -> list[Path]:
+        """Returns the device files for a profile, using the discovery cache where available"""
+        entries = self.profile_device_files.get(profile)
+
+        if entries is None:
+            self.fq_path = os.path.join(
+                self.path, CONFIG_DIR, INPUT_DIR, profile, JOYSTICK_DIR
             )
-        )
+            return self.get_valid_files_for_profile(Path(self.fq_path))
+
+        return [Path(entry.path) for entry in entries]
 
     def get_validated_profiles(self) -> list[str]:
         """Expose Valid Profiles only to UI"""
@@ -108,34 +131,66 @@ class DCSWorldParser:
             )
         return self.valid_profiles
 
+    def device_file_stats(self) -> list[tuple[str, int, int]]:
+        """Returns (path, size, mtime) of the device files process_profiles would parse.
+
+        Rescans the Input directory rather than using the discovery cache, so profiles and
+        device files added or removed since discovery are picked up.
+        """
+        try:
+            with os.scandir(os.path.join(self.path, CONFIG_DIR, INPUT_DIR)) as entries:
+                profiles = sorted(
+                    (entry for entry in entries if entry.is_dir()),
+                    key=lambda entry: entry.name,
+                )
+        except OSError:
+            return []
+
+        stats = []
+        for profile in profiles:
+            if self.remove_easy_modes and self.__easy_mode in profile.name:
+                continue
+            try:
+                device_files = scan_device_files(
+                    os.path.join(profile.path, JOYSTICK_DIR)
+                )
+            except OSError:
+                continue
+
+            for entry in sorted(device_files, key=lambda entry: entry.name):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                stats.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        return stats
+
     def convert_button_format(
         self, button: str
     ) -> Axis | Hat | Button | AxisSlider | None:
         """Convert DCS Buttons to match expected "BUTTON_X" format"""
         split: list = button.split("_")
-        _logger.debug(f"Converting button {button}")
+        # Called per binding, so skip building messages unless debug logging is on
+        if _logger.isEnabledFor(logging.DEBUG):
+            _logger.debug(f"Converting button {button}")
         match len(split):
             case 2:
                 if split[1][0:3] == "BTN":
                     # Standard Button
                     button_number: int = int(split[1][3:])
-                    _logger.debug(f"Parsing button {button_number}")
                     return Button(button_number)
                 elif split[1].isalpha():
                     # Standard Axis
                     axis_id: str = split[1]
-                    _logger.debug(f"Parsing AXIS {axis_id}")
                     return Axis(AxisDirection[axis_id])
                 elif split[1][0:6] == "SLIDER":
                     # Slider Axis
                     slider_id: int = int(split[1][6:])
-                    _logger.debug(f"Parsing Slider Axis {slider_id}")
                     return AxisSlider(slider_id)
             case 4:
                 # POV Slider control
                 pov_id: int = int(split[2][3])
                 pov_direction: str = split[3]
-                _logger.debug(f"Parsing Hat ID {pov_id} direction {pov_direction}")
                 return Hat(pov_id, HatDirection[pov_direction])
             case _:
                 _logger.warning(f"Button format not found for {split}")
@@ -143,6 +198,11 @@ class DCSWorldParser:
         return None
 
     def process_profiles(self, profile_list: list | None = None) -> ProfileCollection:
+        # Discovery from construction is used by the first run, later runs rescan once
+        if self.__discovery_consumed:
+            self.discover_profiles()
+        self.__discovery_consumed = True
+
         if isinstance(profile_list, list) and len(profile_list) > 0:
             self.profiles_to_process = profile_list
         else:
@@ -155,21 +215,93 @@ class DCSWorldParser:
             return collection
 
         _logger.info(f"Profiles to be processed {self.profiles_to_process}")
+        jobs: list[tuple[Path, Profile_]] = []
         for profile in self.profiles_to_process:
             _logger.debug(f"Processing {profile=}")
             profile_object = collection.create_profile(profile_name=profile)
-            self.fq_path = os.path.join(
-                self.path, CONFIG_DIR, INPUT_DIR, profile, JOYSTICK_DIR
-            )
-            self.profile_devices = self.get_valid_files_for_profile(Path(self.fq_path))
+            self.profile_devices = self.get_profile_device_files(profile)
 
-            for item in self.profile_devices:
-                self.process_profile_device(item, profile_object)
+            jobs.extend((item, profile_object) for item in self.profile_devices)
+
+        seen = self.process_profile_devices(jobs)
+
+        # Only keep entries for files still present, so edited files do not accumulate
+        self.device_bindings_cache = {
+            digest: bindings
+            for digest, bindings in self.device_bindings_cache.items()
+            if digest in seen
+        }
 
         return collection
 
     def process_profile_device(self, item: Path, profile: Profile_):
         _logger.debug(f"Processing {profile=} device {item=}")
+        self.process_profile_devices([(item, profile)])
+
+    def process_profile_devices(self, jobs: list[tuple[Path, Profile_]]) -> set[str]:
+        """Parse device files and assign their bindings to profile devices.
+
+        Files are hashed before parsing so byte-identical files, such as layouts copied
+        between aircraft variants, are only parsed once. Unique files are parsed across
+        a process pool when parse_workers > 1, and bindings are assigned in job order so
+        the resulting ProfileCollection matches sequential processing.
+
+        Returns the content hashes of the processed files."""
+        device_files: list[tuple[Path, Device_, str]] = []
+        pending: dict[str, bytes] = {}
+
+        for item, profile in jobs:
+            device = self.add_profile_device(item, profile)
+
+            if device is None:
+                continue
+
+            try:
+                _logger.debug(f"Obtaining file data  for {item}")
+                data = item.read_bytes()
+            except FileNotFoundError as err:
+                self.device_file_not_found(item, err)
+
+            digest = hashlib.sha256(data).hexdigest()
+            device_files.append((item, device, digest))
+
+            if digest not in self.device_bindings_cache:
+                pending[digest] = data
+
+        self.parse_device_data(pending)
+
+        _logger.info(
+            f"DCS: Parsed {len(pending)} of {len(device_files)} device files, "
+            f"{len(device_files) - len(pending)} parses saved by content deduplication"
+        )
+
+        for item, device, digest in device_files:
+            self.assign_device_bindings(
+                item, self.device_bindings_cache[digest], device
+            )
+
+        return {digest for _, _, digest in device_files}
+
+    def parse_device_data(self, pending: dict[str, bytes]):
+        """Parse device file contents into the bindings cache, keyed by content hash"""
+        if self.parse_workers <= 1 or len(pending) <= 1:
+            for digest, data in pending.items():
+                self.device_bindings_cache[digest] = parse_device_bindings(data)
+            return
+
+        _logger.info(
+            f"Parsing {len(pending)} device files with {self.parse_workers} workers"
+        )
+        with ProcessPoolExecutor(max_workers=self.parse_workers) as executor:
+            for digest, bindings in zip(
+                pending,
+                executor.map(parse_device_bindings, pending.values()),
+                strict=True,
+            ):
+                self.device_bindings_cache[digest] = bindings
+
+    def add_profile_device(self, item: Path, profile: Profile_) -> Device_ | None:
+        """Adds the device for a .lua file to the profile, returning None where the file has no valid GUID"""
         guid, name = (
             item.name[GUID_POSITION_SLICE],
             item.name[NAME_POSITION_SLICE],
@@ -180,75 +312,61 @@ class DCSWorldParser:
             Device_.validate_guid(guid)
         except ValueError as e:
             _logger.error(e)
+            return None
+
+        return profile.add_device(guid, name)
+
+    def device_file_not_found(self, item: Path, err: FileNotFoundError) -> NoReturn:
+        _logger.error(
+            f"DCS: File {item} no longer found - \
+                It has been moved/deleted from directory. {err}"
+        )
+        raise JoystickDiagramsError(str(err)) from err
+
+    def assign_device_bindings(
+        self, item: Path, bindings: list[DeviceBinding] | None, device: Device_
+    ):
+        if bindings is None:
+            _logger.debug(f"Parsing failed for {item}")
             return
 
-        active_profile = profile.add_device(guid, name)
+        self.apply_bindings(bindings, device)
 
-        try:
-            _logger.debug(f"Obtaining file data  for {item}")
-            file_data = (
-                item.read_text(encoding="utf-8")
-                .replace("local diff = ", "")
-                .replace("return diff", "")
-            )
+    def assign_to_inputs(self, config: dict, profile: Device_):
+        self.apply_bindings(extract_device_bindings(config), profile)
 
-        except FileNotFoundError as err:
-            _logger.error(
-                f"DCS: File {item} no longer found - \
-                    It has been moved/deleted from directory. {err}"
-            )
-            raise JoystickDiagramsError(str(err)) from err
+    def apply_bindings(self, bindings: list[DeviceBinding], profile: Device_):
+        debug = _logger.isEnabledFor(logging.DEBUG)
 
-        else:
-            parsed_config = self.parse_config(file_data)  ##Better handling - decompose
+        for key, reformers, operation in bindings:
+            if debug:
+                _logger.debug(f"Operation name is currently {operation=}")
+            input_identifier = self.convert_button_format(key)
 
-            if parsed_config is None:
-                _logger.debug(f"Parsing failed for {item}")
-                return
+            if not input_identifier:
+                continue
 
-            self.assign_to_inputs(parsed_config, active_profile)
+            # Create Reforms first
+            if reformers:
+                # Initialise base button if not exists
+                reform_set = set(reformers)
 
-    def assign_to_inputs(self, config: dict, profile: Device_):
-        search_keys = ["keyDiffs", "axisDiffs"]
-
-        for key in search_keys:
-            if key in config.keys():
-                for data in config[key].values():
-                    operation = data["name"]
-                    _logger.debug(f"Operation name is currently {operation=}")
-                    if data.get("added"):
-                        for binding in data["added"].values():
-                            input_identifier = self.convert_button_format(
-                                binding["key"]
-                            )
-
-                            if not input_identifier:
-                                continue
-
-                            # Create Reforms first
-                            if binding.get("reformers"):
-                                # Initialise base button if not exists
-
-                                reform_set = self.reformers_to_set(
-                                    binding.get("reformers")
-                                )
-
-                                _logger.debug(
-                                    f"Modifiers {reform_set=} and type is {type(reform_set)}"
-                                )
-
-                                profile.add_modifier_to_input(
-                                    input_identifier, reform_set, operation
-                                )
-                            else:
-                                profile.create_input(input_identifier, operation)
+                if debug:
+                    _logger.debug(
+                        f"Modifiers {reform_set=} and type is {type(reform_set)}"
+                    )
+
+                profile.add_modifier_to_input(input_identifier, reform_set, operation)
+            else:
+                profile.create_input(input_identifier, operation)
 
     def reformers_to_set(self, reformers: dict) -> set:
         return {x for x in reformers.values()}
 
-    def parse_config(self, file: str) -> dict | None:
+    @staticmethod
+    def parse_config(file: str) -> dict | None:
         try:
-            return self.parse_file(file)
+            return DCSWorldParser.parse_file(file)
         except Exception as error:
             _logger.error(
                 "There was a parsing issue with the text data, this could mean an unhandled character."
@@ -256,7 +374,8 @@ class DCSWorldParser:
             _logger.error(error)
             return None
 
-    def parse_file(self, file: str) -> dict:  # noqa
+    @staticmethod
+    def parse_file(file: str) -> dict:  # noqa
         # Linter disabled for this function, this is the format required by PLY
 
         tokens = (  # noqa
@@ -382,5 +501,63 @@ class DCSWorldParser:
         return data
 
 
+def scan_device_files(path: str | Path) -> list[os.DirEntry]:
+    """Returns .lua file entries in a profile joystick directory, retaining DirEntry stat data"""
+    with os.scandir(path) as entries:
+        return [
+            entry
+            for entry in entries
+            if os.path.splitext(entry.name)[1] == ".lua" and not entry.is_dir()
+        ]
+
+
+def decode_device_file(data: bytes) -> str:
+    """Decodes device .lua file bytes, stripping the Lua wrapper around the diff table.
+
+    CRLF line endings are normalised as read_text() would, as the lexer does not ignore
+    carriage returns.
+    """
+    return (
+        data.decode("utf-8")
+        .replace("\r\n", "\n")
+        .replace("local diff = ", "")
+        .replace("return diff", "")
+    )
+
+
+def extract_device_bindings(config: dict) -> list[DeviceBinding]:
+    """Flattens a parsed device config into compact (key, modifiers, operation) bindings"""
+    bindings: list[DeviceBinding] = []
+
+    for key in ["keyDiffs", "axisDiffs"]:
+        if key not in config.keys():
+            continue
+
+        for data in config[key].values():
+            if not data.get("added"):
+                continue
+
+            for binding in data["added"].values():
+                reformers = binding.get("reformers") or {}
+                bindings.append(
+                    (binding["key"], tuple(reformers.values()), data["name"])
+                )
+
+    return bindings
+
+
+def parse_device_bindings(data: bytes) -> list[DeviceBinding] | None:
+    """Parses device .lua file contents into compact bindings.
+
+    Module level so it can be dispatched to a ProcessPoolExecutor, returning None where parsing fails.
+    """
+    config = DCSWorldParser.parse_config(decode_device_file(data))
+
+    if config is None:
+        return None
+
+    return extract_device_bindings(config)
+
+
 if __name__ == "__main__":
     pass
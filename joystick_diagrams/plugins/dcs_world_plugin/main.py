@@ -1,31 +1,14 @@
 from pathlib import Path
 
-from pydantic import Field
-
 from joystick_diagrams.input.profile_collection import ProfileCollection
 from joystick_diagrams.plugins.dcs_world_plugin.dcs_world import DCSWorldParser
+from joystick_diagrams.plugins.dcs_world_plugin.settings import DCSSettings
 from joystick_diagrams.plugins.plugin_interface import PluginInterface
-from joystick_diagrams.plugins.plugin_settings import PluginMeta, PluginSettings
-
-
-class DCSSettings(PluginSettings):
-    game_dir: Path | None = Field(
-        default=None,
-        title="DCS Saved Games Directory",
-        json_schema_extra={
-            "is_folder": True,
-            "default_path": "~/Saved Games",
-        },
-    )
-    remove_easy_modes: bool = Field(
-        default=True,
-        title="Remove Easy Mode Profiles",
-        description="Hides aircraft variants whose profile name ends with '_easy' (e.g. A-10A_easy). Requires re-running plugins to take effect.",
-    )
+from joystick_diagrams.plugins.plugin_manifest import read_manifest
 
 
 class ParserPlugin(PluginInterface):
-    plugin_meta = PluginMeta(name="DCS World", version="2.0.0", icon_path="img/dcs.ico")
+    plugin_meta = read_manifest(Path(__file__).parent)
     plugin_settings_model = DCSSettings
 
     def __init__(self):
@@ -37,12 +20,20 @@ class ParserPlugin(PluginInterface):
             return self.instance.process_profiles()
         return ProfileCollection()
 
+    def source_files(self) -> list[tuple[str, int, int]]:
+        # Only the profile device files, not the rest of the Saved Games folder
+        if self.instance:
+            return self.instance.device_file_stats()
+        return []
+
     def _rebuild_instance(self) -> None:
         game_dir = self.get_setting("game_dir")
         if game_dir and Path(game_dir).exists():
             try:
                 self.instance = DCSWorldParser(
-                    game_dir, easy_modes=self.get_setting("remove_easy_modes")
+                    game_dir,
+                    easy_modes=self.get_setting("remove_easy_modes"),
+                    parse_workers=self.get_setting("parse_workers"),
                 )
             except (FileNotFoundError, FileExistsError):
                 self.instance = None
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from pydantic import Field
+
+from joystick_diagrams.plugins.plugin_settings import PluginSettings
+
+
+class DCSSettings(PluginSettings):
+    game_dir: Path | None = Field(
+        default=None,
+        title="DCS Saved Games Directory",
+        json_schema_extra={
+            "is_folder": True,
+            "default_path": "~/Saved Games",
+        },
+    )
+    remove_easy_modes: bool = Field(
+        default=True,
+        title="Remove Easy Mode Profiles",
+        description="Hides aircraft variants whose profile name ends with '_easy' (e.g. A-10A_easy). Requires re-running plugins to take effect.",
+    )
+    parse_workers: int = Field(
+        default=1,
+        ge=1,
+        le=32,
+        title="Parallel Parse Workers",
+        description="Number of processes used to parse profile files. 1 parses files one at a time; higher values speed up large Saved Games folders.",
+    )
@@ -4,7 +4,10 @@ from pydantic import Field
 
 from joystick_diagrams.input.profile_collection import ProfileCollection
 from joystick_diagrams.plugins.fs2020_plugin.ms_flight_simulator import FS2020Parser
-from joystick_diagrams.plugins.plugin_interface import PluginInterface
+from joystick_diagrams.plugins.plugin_interface import (
+    PluginInterface,
+    source_file_stats,
+)
 from joystick_diagrams.plugins.plugin_settings import PluginMeta, PluginSettings
 
 
@@ -34,6 +37,21 @@ class ParserPlugin(PluginInterface):
             return self.instance.run()
         return ProfileCollection()
 
+    def source_files(self) -> list[tuple[str, int, int]]:
+        # Profiles are read from the folders inside the game folder
+        if self.instance is None:
+            return []
+        try:
+            folders = sorted(self.instance.folder_path.iterdir())
+        except OSError:
+            return []
+        return [
+            entry
+            for folder in folders
+            if folder.is_dir()
+            for entry in source_file_stats(folder)
+        ]
+
     def _rebuild_instance(self) -> None:
         game_dir = self.get_setting("game_dir")
         if game_dir and Path(game_dir).exists():
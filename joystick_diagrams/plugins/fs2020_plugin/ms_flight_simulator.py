@@ -1,7 +1,9 @@
 import logging
 import xml.etree.ElementTree as eT
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO
 
 from joystick_diagrams.input.axis import Axis, AxisDirection
 from joystick_diagrams.input.button import Button
@@ -32,6 +34,9 @@ HAT_DIR_TO_DIR = {
 
 default_profile_name = "Default"
 
+# Lines following the XML declaration (<Version/> and <FriendlyName/>) which make the file a multi-root document
+PROFILE_HEADER_LINES = 2
+
 
 class FS2020Parser:
     def __init__(self, folder_path):
@@ -50,9 +55,12 @@ class FS2020Parser:
 
         _logger.debug(f"XMLs detected {xml_files}")
 
-        for xml in xml_files:
-            _logger.debug(f"Processing {xml}")
-            process_xml_file(xml, pc)
+        # Files are parsed concurrently into partial collections, then merged in discovery order
+        with ThreadPoolExecutor() as executor:
+            partials = list(executor.map(process_xml_file_partial, xml_files))
+
+        for partial in partials:
+            merge_partial_collection(partial, pc)
 
         return pc
 
@@ -60,21 +68,110 @@ class FS2020Parser:
         self.data.append(file)
 
 
+class _HeaderSkippingReader:
+    """Binary reader that yields the XML declaration, then the document after the profile header lines"""
+
+    def __init__(self, handle: BinaryIO, skip_lines: int = PROFILE_HEADER_LINES):
+        self._handle = handle
+        self._declaration = handle.readline()
+        for _ in range(skip_lines):
+            handle.readline()
+
+    def read(self, size: int = -1) -> bytes:
+        if self._declaration:
+            data, self._declaration = self._declaration, b""
+            return data
+        return self._handle.read(size)
+
+
 def process_xml_file(file: Path, profile_collection: ProfileCollection):
-    with open(file, "r") as f:
-        total_lines = f.readlines()
+    _logger.debug(f"Processing {file}")
+
+    device_name = device_guid = None
+    controls: list[Control] = []
+    depth = 0
+
+    with open(file, "rb") as f:
+        for event, element in eT.iterparse(
+            _HeaderSkippingReader(f), events=("start", "end")
+        ):
+            if event == "start":
+                if depth == 0:
+                    device_name = element.get("DeviceName")
+                    device_guid = element.get("GUID")
+                depth += 1
+                continue
 
-        xml = eT.fromstringlist(
-            [line for count, line in enumerate(total_lines) if count not in [1, 2]]
-        )
+            depth -= 1
+            # Contexts are processed as soon as they complete, then released
+            if depth == 1 and element.tag == "Context":
+                controls.extend(process_contexts([element]))
+                element.clear()
+
+    add_device_controls(device_name, device_guid, controls, profile_collection)
+
+
+def process_xml_file_partial(file: Path) -> ProfileCollection:
+    """Process a single XML file into its own ProfileCollection, for merging via merge_partial_collection"""
+    partial = ProfileCollection()
+    partial.create_profile(default_profile_name)
+    process_xml_file(file, partial)
+    return partial
+
+
+def merge_partial_collection(partial: ProfileCollection, collection: ProfileCollection):
+    """Merge the default profile of a partial collection into the collection's default profile.
 
-    process_device(xml, profile_collection)
+    Commands for inputs that already exist are combined, matching the behaviour of processing
+    the files sequentially into a single collection."""
+    source = partial.get_profile(default_profile_name)
+    profile = collection.get_profile(default_profile_name)
+
+    if source is None or profile is None:
+        return
+
+    for device in source.devices.values():
+        dev = profile.add_device(device.guid, device.name)
+
+        for input_type, inputs in device.inputs.items():
+            for input_id, input_ in inputs.items():
+                existing_input = dev.get_input(input_type, input_id)
+
+                if existing_input is None:
+                    dev.create_input(input_.input_control, input_.command)
+                    existing_input = dev.get_input(input_type, input_id)
+                elif input_.command:
+                    if existing_input.command:
+                        existing_input.command = (
+                            f"{existing_input.command} | {input_.command}"
+                        )
+                    else:
+                        existing_input.command = input_.command
+
+                if existing_input:
+                    for modifier in input_.modifiers:
+                        existing_input.add_modifier(
+                            modifier.modifiers, modifier.command
+                        )
 
 
 def process_device(device_xml: eT.Element, collection: ProfileCollection):
-    device_name = device_xml.get("DeviceName")
-    device_guid = device_xml.get("GUID")
+    contexts = device_xml.findall("Context")
+
+    add_device_controls(
+        device_xml.get("DeviceName"),
+        device_xml.get("GUID"),
+        process_contexts(contexts),
+        collection,
+    )
+
 
+def add_device_controls(
+    device_name: str | None,
+    device_guid: str | None,
+    controls: list["Control"],
+    collection: ProfileCollection,
+):
     if device_name is None or device_guid is None:
         return
 
@@ -85,10 +182,6 @@ def process_device(device_xml: eT.Element, collection: ProfileCollection):
 
     dev = profile.add_device(device_guid, device_name)
 
-    contexts = device_xml.findall("Context")
-
-    controls = process_contexts(contexts)
-
     for control in controls:
         # Check if we have an existing input for the device
         existing_input = dev.get_input(
@@ -214,11 +307,12 @@ def file_check(file):
 
 def check_folders(folders):
     valid_files = []
-    for folder in folders:
+    # Sorted so files are always merged in the same order, regardless of filesystem listing order
+    for folder in sorted(folders):
         if not folder.is_dir():
             continue
 
-        for file in folder.iterdir():
+        for file in sorted(folder.iterdir()):
             _logger.debug(f"Processing file {file}")
             valid_files.append(file) if file_check(file) else None
 
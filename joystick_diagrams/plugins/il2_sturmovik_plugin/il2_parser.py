@@ -3,7 +3,7 @@
 import logging
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from joystick_diagrams.input.axis import Axis, AxisDirection, AxisSlider
 from joystick_diagrams.input.button import Button
@@ -35,6 +35,9 @@ HAT_DIRECTION_MAPPINGS = {
     "DR": HatDirection.DR,
 }
 
+# Binding index key: (device_id, control type, control id)
+BindingKey = Tuple[str, str, Union[int, str]]
+
 
 class IL2Parser:
     """Parser for IL-2 Sturmovik input directory (global.actions + devices.txt)"""
@@ -45,7 +48,10 @@ class IL2Parser:
         self.devices_file = input_dir / "devices.txt"
         self.devices: Dict[str, Dict] = {}
         self.bindings: List[Dict] = []
+        self.device_bindings: Dict[str, List[Dict]] = {}
+        self.binding_index: Dict[BindingKey, List[Dict]] = {}
         self.action_descriptions: Dict[str, str] = {}
+        self._parsed = False
 
     def process_profiles(self) -> ProfileCollection:
         """Main processing method to create ProfileCollection from IL-2 config"""
@@ -54,13 +60,10 @@ class IL2Parser:
 
         try:
             # Clear previous data to ensure fresh parsing
-            self.devices.clear()
-            self.bindings.clear()
-            self.action_descriptions.clear()
+            self._reset_parsed_state()
             _logger.debug("Cleared previous parsing data")
 
-            self._parse_devices_file()
-            self._parse_global_actions_file()
+            self._parse_files()
             _logger.info(
                 f"Files parsed successfully. Found {len(self.devices)} devices and {len(self.bindings)} bindings"
             )
@@ -74,6 +77,21 @@ class IL2Parser:
 
         return profile_collection
 
+    def _reset_parsed_state(self):
+        """Clear all data produced by a previous parse"""
+        self.devices.clear()
+        self.bindings.clear()
+        self.device_bindings.clear()
+        self.binding_index.clear()
+        self.action_descriptions.clear()
+        self._parsed = False
+
+    def _parse_files(self):
+        """Parse devices.txt and global.actions, marking the parser state as populated"""
+        self._parse_devices_file()
+        self._parse_global_actions_file()
+        self._parsed = True
+
     def _parse_devices_file(self):
         """Parse the devices.txt file to get real device names"""
         try:
@@ -299,13 +317,25 @@ class IL2Parser:
             bindings = self._parse_binding_line(stripped_line, line_num)
             if bindings:
                 # bindings peut être une liste ou un seul binding
-                if isinstance(bindings, list):
-                    self.bindings.extend(bindings)
-                else:
-                    self.bindings.append(bindings)
+                if not isinstance(bindings, list):
+                    bindings = [bindings]
+                for binding in bindings:
+                    self._add_binding(binding)
 
         _logger.info(f"Extracted {len(self.bindings)} bindings from IL-2 config")
 
+    def _add_binding(self, binding: Dict):
+        """Store a binding, indexing it by device and by (device_id, type, control id)"""
+        self.bindings.append(binding)
+        self.device_bindings.setdefault(binding["device_id"], []).append(binding)
+        self.binding_index.setdefault(self._binding_key(binding), []).append(binding)
+
+    @staticmethod
+    def _binding_key(binding: Dict) -> BindingKey:
+        """Build the index key for a binding, e.g. ("3", "button", 42)"""
+        control_type = binding["type"]
+        return (binding["device_id"], control_type, binding[f"{control_type}_id"])
+
     def _build_action_descriptions(self, lines: List[str]):
         """Build a mapping from action names to their descriptions"""
         self.action_descriptions = {}
@@ -507,17 +537,8 @@ class IL2Parser:
         # Use pre-built description mapping
         action_descriptions = self.action_descriptions
 
-        # Group bindings by device ID
-        device_bindings: Dict[str, List[Dict]] = {}
-
-        for binding in self.bindings:
-            device_id = binding["device_id"]
-            if device_id not in device_bindings:
-                device_bindings[device_id] = []
-            device_bindings[device_id].append(binding)
-
-        # Create devices and add bindings
-        for device_id, bindings in device_bindings.items():
+        # Create devices and add bindings, grouped by device ID at extraction time
+        for device_id, bindings in self.device_bindings.items():
             # Get device info from devices.txt mapping or create default
             device_info = self.devices.get(device_id)
             if device_info:
@@ -658,6 +679,9 @@ class IL2Parser:
     ) -> bool:
         """Export IL-2 mappings to a CSV file
 
+        Rows are streamed to the file as they are produced, reusing the bindings
+        already extracted by process_profiles() where available.
+
         Args:
             output_file_path: Path where to save the export.csv file
             profile_collection: Optional ProfileCollection to export (if None, will process fresh)
@@ -670,75 +694,50 @@ class IL2Parser:
 
             # Work directly from bindings instead of processed profiles
             # This ensures we have all the original IL-2 data
-            if not self.bindings:
-                # Process to populate bindings
-                self._parse_devices_file()
-                self._parse_global_actions_file()
-
-            export_data = []
-
-            # Group bindings by device for organized export
-            device_bindings = {}
-            for binding in self.bindings:
-                device_id = binding["device_id"]
-                if device_id not in device_bindings:
-                    device_bindings[device_id] = []
-                device_bindings[device_id].append(binding)
-
-            # Export each device's bindings
-            for device_id, bindings in device_bindings.items():
-                # Get device info
+            if not self._parsed:
+                self._reset_parsed_state()
+                self._parse_files()
+
+            # Group bindings by device name, devices sharing a name are merged
+            bindings_by_name: Dict[str, List[Dict]] = {}
+            for device_id, bindings in self.device_bindings.items():
                 device_info = self.devices.get(device_id, {})
                 device_name = device_info.get("name", f"IL-2 Joystick {device_id}")
+                bindings_by_name.setdefault(device_name, []).extend(bindings)
 
-                for binding in bindings:
-                    technical_name = binding.get("action", "Unknown")
-                    description = binding.get("description", technical_name)
-                    il2_reference = binding.get("device_ref", "Unknown")
-
-                    # Generate real button/control identifier
-                    real_control = self._generate_real_control_identifier(binding)
-
-                    export_data.append(
-                        {
-                            "device_name": device_name,
-                            "technical_name": technical_name,
-                            "description": description,
-                            "il2_button": il2_reference,
-                            "real_button": real_control,
-                        }
-                    )
-
-            # Write to CSV file
+            rows_written = 0
             with open(output_file_path, "w", newline="", encoding="utf-8") as f:
-                fieldnames = [
-                    "Device",
-                    "Technical_Name",
-                    "Description",
-                    "IL2_Control",
-                    "Real_Control",
-                ]
-                writer = csv.DictWriter(f, fieldnames=fieldnames, delimiter=";")
-
-                # Write header
-                writer.writeheader()
+                writer = csv.writer(f, delimiter=";")
+                writer.writerow(
+                    [
+                        "Device",
+                        "Technical_Name",
+                        "Description",
+                        "IL2_Control",
+                        "Real_Control",
+                    ]
+                )
 
                 # Write data (sorted by device name and real control)
-                for item in sorted(
-                    export_data, key=lambda x: (x["device_name"], x["real_button"])
-                ):
-                    writer.writerow(
-                        {
-                            "Device": item["device_name"],
-                            "Technical_Name": item["technical_name"],
-                            "Description": item["description"],
-                            "IL2_Control": item["il2_button"],
-                            "Real_Control": item["real_button"],
-                        }
-                    )
+                for device_name in sorted(bindings_by_name):
+                    rows = []
+                    for binding in bindings_by_name[device_name]:
+                        technical_name = binding.get("action", "Unknown")
+                        rows.append(
+                            (
+                                device_name,
+                                technical_name,
+                                binding.get("description", technical_name),
+                                binding.get("device_ref", "Unknown"),
+                                self._generate_real_control_identifier(binding),
+                            )
+                        )
+                    rows.sort(key=lambda row: row[4])
+                    writer.writerows(rows)
+                    rows_written += len(rows)
 
             _logger.info(
-                f"Successfully exported {len(export_data)} mappings to CSV file {output_file_path}"
+                f"Successfully exported {rows_written} mappings to CSV file {output_file_path}"
             )
             return True
 
@@ -771,41 +770,41 @@ class IL2Parser:
 
     def _find_il2_reference_for_input(self, input_item, device_name: str) -> str:
         """Find the original IL-2 reference (like joy3_b34) for an input"""
-        # Try to find matching binding
-        for binding in self.bindings:
-            if self._binding_matches_input(binding, input_item):
-                return binding.get("device_ref", "Unknown")
+        control_key = self._control_key_for_input(input_item)
+        if control_key is None:
+            return "Unknown"
+
+        device_id = self._get_device_id_from_guid("", device_name)
+        candidate_ids = (
+            [device_id] if device_id != "Unknown" else list(self.device_bindings)
+        )
+
+        for candidate_id in candidate_ids:
+            bindings = self.binding_index.get((candidate_id, *control_key))
+            if bindings:
+                return bindings[0].get("device_ref", "Unknown")
 
         return "Unknown"
 
     def _binding_matches_input(self, binding: dict, input_item) -> bool:
         """Check if a binding matches an input item"""
-        try:
-            input_type = type(input_item).__name__.lower()
-            binding_type = binding.get("type", "")
-
-            if input_type == "button" and binding_type == "button":
-                input_id = getattr(input_item, "identifier", "")
-                if "BUTTON_" in input_id:
-                    button_num = int(input_id.replace("BUTTON_", ""))
-                    return binding.get("button_id") == button_num
-
-            elif input_type == "axis" and binding_type == "axis":
-                input_axis = getattr(input_item, "axis_direction", None)
-                if input_axis:
-                    axis_name = input_axis.name
-                    return binding.get("axis_id") == axis_name
-
-            elif input_type == "hat" and binding_type == "hat":
-                input_id = getattr(input_item, "identifier", "")
-                return binding.get("hat_id", "").replace("_", "") in input_id.replace(
-                    "_", ""
-                )
-
-        except Exception:
-            pass
-
-        return False
+        control_key = self._control_key_for_input(input_item)
+        if control_key is None or "type" not in binding:
+            return False
+        return self._binding_key(binding)[1:] == control_key
+
+    @staticmethod
+    def _control_key_for_input(input_item) -> Optional[Tuple[str, Union[int, str]]]:
+        """Build the (control type, control id) part of a binding key for an input control"""
+        if isinstance(input_item, Button):
+            return ("button", input_item.id)
+        if isinstance(input_item, Axis):
+            return ("axis", input_item.id.name)
+        if isinstance(input_item, AxisSlider):
+            return ("axis", f"SLIDER_{input_item.id}")
+        if isinstance(input_item, Hat):
+            return ("hat", input_item.identifier)
+        return None
 
     def _get_device_id_from_guid(self, device_guid: str, device_name: str) -> str:
         """Get the original device ID from GUID or name"""
@@ -1,30 +1,17 @@
 from pathlib import Path
 
-from pydantic import Field
-
 from joystick_diagrams.plugins.joystick_gremlin_plugin.joystick_gremlin import (
     JoystickGremlinParser,
 )
+from joystick_diagrams.plugins.joystick_gremlin_plugin.settings import (
+    JoystickGremlinSettings,
+)
 from joystick_diagrams.plugins.plugin_interface import PluginInterface
-from joystick_diagrams.plugins.plugin_settings import PluginMeta, PluginSettings
-
-
-class JoystickGremlinSettings(PluginSettings):
-    profile_file: Path | None = Field(
-        default=None,
-        title="Joystick Gremlin Profile",
-        json_schema_extra={
-            "is_folder": False,
-            "default_path": "~/",
-            "extensions": [".xml"],
-        },
-    )
+from joystick_diagrams.plugins.plugin_manifest import read_manifest
 
 
 class ParserPlugin(PluginInterface):
-    plugin_meta = PluginMeta(
-        name="Joystick Gremlin (2.7X)", version="2.0.0", icon_path="img/jg.ico"
-    )
+    plugin_meta = read_manifest(Path(__file__).parent)
     plugin_settings_model = JoystickGremlinSettings
 
     def __init__(self):
@@ -0,0 +1,17 @@
+from pathlib import Path
+
+from pydantic import Field
+
+from joystick_diagrams.plugins.plugin_settings import PluginSettings
+
+
+class JoystickGremlinSettings(PluginSettings):
+    profile_file: Path | None = Field(
+        default=None,
+        title="Joystick Gremlin Profile",
+        json_schema_extra={
+            "is_folder": False,
+            "default_path": "~/",
+            "extensions": [".xml"],
+        },
+    )
@@ -27,7 +27,7 @@ class ExportResult:
     device_guid: str
     source_plugin: str
     template_name: str | None
-    export_format: str  # "SVG" or "PNG"
+    export_format: str  # "SVG", "SVGZ" or "PNG"
     file_path: Path  # the primary output file (SVG or PNG)
     export_directory: Path
     device: Device_  # full device model with all inputs, axes, hats, modifiers
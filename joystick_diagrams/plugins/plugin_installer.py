@@ -8,6 +8,7 @@ import logging
 import shutil
 import tempfile
 import zipfile
+from functools import partial
 from pathlib import Path
 from typing import Literal
 
@@ -172,6 +173,11 @@ def _install_from_url(url: str, plugin_type: PluginType) -> Path:
 def _validate_parser_plugin(plugin_path: Path) -> tuple[bool, str]:
     from joystick_diagrams.plugins.plugin_interface import PluginInterface
     from joystick_diagrams.plugins.plugin_manager import load_user_parser_plugin
+    from joystick_diagrams.plugins.plugin_manifest import (
+        LazyParserPlugin,
+        has_manifest,
+        read_manifest,
+    )
 
     try:
         module = load_user_parser_plugin(plugin_path)
@@ -189,6 +195,16 @@ def _validate_parser_plugin(plugin_path: Path) -> tuple[bool, str]:
     if not isinstance(instance, PluginInterface):
         return False, "ParserPlugin does not inherit from PluginInterface."
 
+    if has_manifest(plugin_path):
+        try:
+            LazyParserPlugin(
+                read_manifest(plugin_path),
+                plugin_path,
+                partial(load_user_parser_plugin, plugin_path),
+            ).load()
+        except Exception as e:
+            return False, f"plugin.json does not match the plugin: {e}"
+
     return True, instance.name
 
 
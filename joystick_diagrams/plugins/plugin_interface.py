@@ -1,6 +1,8 @@
+import hashlib
 import inspect
 import json
 import logging
+import os
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import ClassVar
@@ -151,6 +153,46 @@ class PluginInterface(ABC):
         except (PermissionError, OSError) as e:
             _logger.error(f"Permission error loading settings for {self.name}: {e}")
 
+    # ------------------------------------------------------------------
+    # Source fingerprint — detects when a stored result is out of date
+    # ------------------------------------------------------------------
+
+    def source_files(self) -> list[tuple[str, int, int]]:
+        """Returns (path, size, mtime) of each source file the plugin parses.
+
+        Covers the files named by Path settings, and the files directly inside folders
+        named by Path settings. Override when the plugin parses files below those
+        folders, or only some of the files in them.
+        """
+        if self._plugin_settings is None:
+            return []
+
+        return [
+            entry
+            for value in self._plugin_settings.model_dump().values()
+            if isinstance(value, Path)
+            for entry in source_file_stats(value)
+        ]
+
+    def source_fingerprint(
+        self, source_files: list[tuple[str, int, int]] | None = None
+    ) -> str:
+        """Returns a digest of the plugin version, its settings and its source files.
+
+        Only file sizes and modification times are read. source_files may be passed
+        when they have already been collected with source_files().
+        """
+        digest = hashlib.sha256(f"{self.name}\0{self.version}".encode())
+        if self._plugin_settings is None:
+            return digest.hexdigest()
+
+        digest.update(self._plugin_settings.model_dump_json().encode())
+        if source_files is None:
+            source_files = self.source_files()
+        for entry in source_files:
+            digest.update(repr(entry).encode())
+        return digest.hexdigest()
+
     # ------------------------------------------------------------------
     # Plugin data directory helpers
     # ------------------------------------------------------------------
@@ -182,6 +224,27 @@ class PluginInterface(ABC):
         return FileTypeInvalidError(value=exception_message)
 
 
+def source_file_stats(path: Path) -> list[tuple[str, int, int]]:
+    """Returns (path, size, mtime) for a file, or for the files directly inside a folder"""
+    if path.is_file():
+        files = [path]
+    else:
+        try:
+            with os.scandir(path) as entries:
+                files = sorted(Path(entry.path) for entry in entries if entry.is_file())
+        except OSError:
+            return []
+
+    stats = []
+    for file in files:
+        try:
+            stat = file.stat()
+        except OSError:
+            continue
+        stats.append((str(file), stat.st_size, stat.st_mtime_ns))
+    return stats
+
+
 def clean_plugin_name(name: str) -> str:
     """Cleans the plugin name from any potentially problematic characters for Windows."""
     disallowed = ["<", ">", ":", '"', "/", "\\", "|", "?", "*"]
@@ -3,6 +3,7 @@
 Plugin manager serves as the main interface between the GUI and the rest of the application.
 
 - It is responsible for loading and unloading plugins
+- Plugins that ship a plugin.json manifest are only imported when they first run
 
 """
 
@@ -10,6 +11,8 @@ import importlib.util
 import logging
 import os
 import sys
+from collections.abc import Callable
+from functools import partial
 from importlib import import_module
 from json import JSONDecodeError
 from pathlib import Path
@@ -19,6 +22,11 @@ from joystick_diagrams import utils
 from joystick_diagrams.exceptions import JoystickDiagramsError, PluginNotValidError
 from joystick_diagrams.plugin_wrapper import PluginWrapper
 from joystick_diagrams.plugins.plugin_interface import PluginInterface
+from joystick_diagrams.plugins.plugin_manifest import (
+    LazyParserPlugin,
+    has_manifest,
+    read_manifest,
+)
 
 _logger = logging.getLogger(__name__)
 
@@ -55,7 +63,8 @@ class ParserPluginManager:
     def load_discovered_plugins(self) -> None:
         """Load and validate the plugins that were found during iniitalisation.
 
-        - Loads a plugin using importlib
+        - Reads the manifest of a plugin that has one, deferring its import
+        - Loads any other plugin using importlib
         - Validates the plugin with further checks
         """
         if not self.plugins and not self.user_plugins:
@@ -66,8 +75,9 @@ class ParserPluginManager:
         for plugin in self.plugins:
             try:
                 _logger.debug(f"Loading plugin {plugin}")
-                loaded_module = load_plugin(plugin_package_name=plugin.name)
-                loaded = loaded_module.ParserPlugin()
+                loaded = create_parser_plugin(
+                    plugin, partial(load_plugin, PLUGIN_REL_PATH, plugin.name)
+                )
                 self.loaded_plugins.append(loaded)
             except (
                 JoystickDiagramsError,
@@ -82,8 +92,9 @@ class ParserPluginManager:
         for plugin_path in self.user_plugins:
             try:
                 _logger.debug(f"Loading user parser plugin {plugin_path}")
-                loaded_module = load_user_parser_plugin(plugin_path)
-                loaded = loaded_module.ParserPlugin()
+                loaded = create_parser_plugin(
+                    plugin_path, partial(load_user_parser_plugin, plugin_path)
+                )
 
                 if loaded.name in bundled_names:
                     _logger.warning(
@@ -109,6 +120,18 @@ class ParserPluginManager:
         return self._user_plugin_paths.get(name)
 
 
+def create_parser_plugin(
+    plugin_path: Path, load_module: Callable[[str], ModuleType]
+) -> PluginInterface:
+    """Creates the plugin at plugin_path, loading its modules with load_module.
+
+    A plugin with a manifest is wrapped unimported, any other has its main.py imported.
+    """
+    if has_manifest(plugin_path):
+        return LazyParserPlugin(read_manifest(plugin_path), plugin_path, load_module)
+    return load_module("main").ParserPlugin()
+
+
 def find_user_parser_plugins() -> list[Path]:
     """Discover user-installed parser plugins from the user data directory."""
     user_dir = utils.user_parser_plugins_root()
@@ -124,24 +147,26 @@ def find_user_parser_plugins() -> list[Path]:
     return folders
 
 
-def load_user_parser_plugin(plugin_path: Path) -> ModuleType:
-    """Load a parser plugin from an arbitrary filesystem path.
+def load_user_parser_plugin(
+    plugin_path: Path, plugin_module: str = "main"
+) -> ModuleType:
+    """Load a parser plugin module from an arbitrary filesystem path.
 
     Uses spec_from_file_location so plugins outside the joystick_diagrams
     package can be loaded. Works in frozen (cx_freeze) environments.
     """
-    main_file = Path.joinpath(plugin_path, "main.py")
+    main_file = Path.joinpath(plugin_path, f"{plugin_module}.py")
     if not main_file.is_file():
         raise PluginNotValidError(
             value=str(plugin_path),
-            error="Plugin directory does not contain main.py",
+            error=f"Plugin directory does not contain {plugin_module}.py",
         )
 
     module_name = f"jd_user_parser_plugin_{plugin_path.name}"
+    # A plain module of the plugin package, so relative imports in main.py and
+    # settings.py resolve to the same modules
     spec = importlib.util.spec_from_file_location(
-        f"{module_name}.main",
-        str(main_file),
-        submodule_search_locations=[str(plugin_path)],
+        f"{module_name}.{plugin_module}", str(main_file)
     )
     if spec is None or spec.loader is None:
         raise PluginNotValidError(
@@ -169,13 +194,15 @@ def load_user_parser_plugin(plugin_path: Path) -> ModuleType:
 
 
 def load_plugin(
-    plugin_package_directory: str = PLUGIN_REL_PATH, plugin_package_name: str = ""
+    plugin_package_directory: str = PLUGIN_REL_PATH,
+    plugin_package_name: str = "",
+    plugin_module: str = "main",
 ) -> ModuleType:
     """Loads a plugin module at a given package directory"""
     try:
         _logger.debug(f"Loading plugin at module path: {plugin_package_name}")
         return import_module(
-            f"{plugin_package_directory}{plugin_package_name}.main",
+            f"{plugin_package_directory}{plugin_package_name}.{plugin_module}",
             package="joystick_diagrams",
         )
     except TypeError as e:
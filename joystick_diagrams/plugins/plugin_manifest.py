@@ -0,0 +1,175 @@
+"""Static manifests for parser plugins.
+
+A plugin may ship a plugin.json next to its main.py, declaring the metadata the app
+shows before the plugin runs:
+
+    {
+        "name": "DCS World",
+        "version": "2.0.0",
+        "icon_path": "img/dcs.ico",
+        "settings": "settings:DCSSettings",
+        "hooks": ["export_mappings"]
+    }
+
+settings names the plugin's PluginSettings model as module:ClassName, the module
+being relative to the plugin folder. Keeping the model in a module of its own lets
+the plugin be configured without importing main.py and the parser it pulls in.
+hooks lists the optional methods, beyond PluginInterface, that the plugin defines.
+
+Plugins with a manifest are wrapped in a LazyParserPlugin, which imports main.py the
+first time the plugin runs, one of its hooks is used, or its source files are read.
+"""
+
+import logging
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from types import ModuleType
+
+from pydantic import Field, ValidationError
+
+from joystick_diagrams.exceptions import PluginNotValidError
+from joystick_diagrams.input.profile_collection import ProfileCollection
+from joystick_diagrams.plugins.plugin_interface import PluginInterface
+from joystick_diagrams.plugins.plugin_settings import PluginMeta, PluginSettings
+
+_logger = logging.getLogger(__name__)
+
+MANIFEST_FILE_NAME: str = "plugin.json"
+
+
+class PluginManifest(PluginMeta):
+    """PluginMeta read from a plugin's plugin.json"""
+
+    settings: str | None = Field(default=None, pattern=r"^\w+:\w+$")
+    hooks: list[str] = Field(default_factory=list)
+
+
+def has_manifest(plugin_path: Path) -> bool:
+    return Path.joinpath(plugin_path, MANIFEST_FILE_NAME).is_file()
+
+
+def read_manifest(plugin_path: Path) -> PluginManifest:
+    """Reads and validates the manifest of the plugin at plugin_path"""
+    manifest_file = Path.joinpath(plugin_path, MANIFEST_FILE_NAME)
+    try:
+        return PluginManifest.model_validate_json(
+            manifest_file.read_text(encoding="UTF8")
+        )
+    except (OSError, ValidationError) as e:
+        raise PluginNotValidError(value=str(plugin_path), error=e) from e
+
+
+class LazyParserPlugin(PluginInterface):
+    """Stands in for a plugin's ParserPlugin until the plugin first runs.
+
+    Name, version, icon and settings come from the manifest, so the plugin can be
+    listed, configured, enabled and disabled without importing its main.py. Hooks
+    declared in the manifest are looked up on the loaded plugin.
+
+    source_files loads the plugin, as plugins may override it. Restored results are
+    revalidated on a background thread after the window first paints, so this import
+    stays off the startup path.
+    """
+
+    def __init__(
+        self,
+        manifest: PluginManifest,
+        plugin_path: Path,
+        load_module: Callable[[str], ModuleType],
+    ):
+        self.plugin_meta = manifest
+        self.plugin_path = plugin_path
+        self._load_module = load_module
+        self.plugin_settings_model = (
+            settings_model(manifest.settings, load_module)
+            if manifest.settings
+            else None
+        )
+        self._plugin_settings = (
+            self.plugin_settings_model() if self.plugin_settings_model else None
+        )
+        self._plugin: PluginInterface | None = None
+        # Snapshot revalidation may load the plugin while a run starts on another thread
+        self._load_lock = threading.Lock()
+
+    @property
+    def icon(self) -> str:
+        return str(self.plugin_path / self.plugin_meta.icon_path)
+
+    @property
+    def loaded(self) -> bool:
+        return self._plugin is not None
+
+    def load(self) -> PluginInterface:
+        """Imports main.py and hands the current settings to its ParserPlugin"""
+        with self._load_lock:
+            if self._plugin is not None:
+                return self._plugin
+
+            _logger.debug(f"Importing plugin {self.name} from {self.plugin_path}")
+            plugin = self._load_module("main").ParserPlugin()
+
+            if plugin.name != self.name:
+                raise PluginNotValidError(
+                    value=str(self.plugin_path),
+                    error=f"ParserPlugin is named {plugin.name}, the manifest {self.name}",
+                )
+            if plugin.plugin_settings_model is not self.plugin_settings_model:
+                raise PluginNotValidError(
+                    value=str(self.plugin_path),
+                    error="ParserPlugin does not use the settings model in the manifest",
+                )
+            missing_hooks = [
+                hook for hook in self.plugin_meta.hooks if not hasattr(plugin, hook)
+            ]
+            if missing_hooks:
+                raise PluginNotValidError(
+                    value=str(self.plugin_path),
+                    error=f"ParserPlugin does not define the hooks {missing_hooks}",
+                )
+
+            self._plugin = plugin
+            self.on_settings_loaded()
+            return plugin
+
+    def __getattr__(self, name: str):
+        # Only hooks declared in the manifest import the plugin, so probing for an
+        # optional hook with hasattr does not load every plugin
+        manifest = self.__dict__.get("plugin_meta")
+        if manifest is None or name not in manifest.hooks:
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def process(self) -> ProfileCollection:
+        return self.load().process()
+
+    def update_setting(self, key: str, value) -> None:
+        if self._plugin is None:
+            super().update_setting(key, value)
+        else:
+            # Settings are shared with the loaded plugin, which saves them
+            self._plugin.update_setting(key, value)
+
+    def on_settings_loaded(self) -> None:
+        if self._plugin is not None:
+            self._plugin._plugin_settings = self._plugin_settings
+            self._plugin.on_settings_loaded()
+
+    def source_files(self) -> list[tuple[str, int, int]]:
+        # Plugins may override source_files, so the plugin is loaded to ask it
+        return self.load().source_files()
+
+
+def settings_model(
+    reference: str, load_module: Callable[[str], ModuleType]
+) -> type[PluginSettings]:
+    """Imports the PluginSettings model a manifest refers to as module:ClassName"""
+    module_name, _, class_name = reference.partition(":")
+    model = getattr(load_module(module_name), class_name, None)
+
+    if not (isinstance(model, type) and issubclass(model, PluginSettings)):
+        raise PluginNotValidError(
+            value=reference, error="Manifest settings is not a PluginSettings model"
+        )
+    return model
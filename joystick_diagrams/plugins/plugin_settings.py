@@ -51,6 +51,7 @@ class PluginSettings(BaseModel):
     computation automatically. Supported field types and their generated controls:
       - bool       → QCheckBox
       - str        → QLineEdit
+      - int        → QSpinBox (bounded by the field's ge/le constraints)
       - Path       → folder/file browse button
       - Path | None → folder/file browse button (optional)
     """
@@ -1,28 +1,13 @@
 from pathlib import Path
 
-from pydantic import Field
-
 from joystick_diagrams.plugins.plugin_interface import PluginInterface
-from joystick_diagrams.plugins.plugin_settings import PluginMeta, PluginSettings
+from joystick_diagrams.plugins.plugin_manifest import read_manifest
+from joystick_diagrams.plugins.star_citizen_plugin.settings import StarCitizenSettings
 from joystick_diagrams.plugins.star_citizen_plugin.star_citizen import StarCitizen
 
 
-class StarCitizenSettings(PluginSettings):
-    actionmaps_file: Path | None = Field(
-        default=None,
-        title="Your actionmaps.xml from export",
-        json_schema_extra={
-            "is_folder": False,
-            "default_path": "~/",
-            "extensions": [".xml"],
-        },
-    )
-
-
 class ParserPlugin(PluginInterface):
-    plugin_meta = PluginMeta(
-        name="Star Citizen", version="2.0.0", icon_path="img/sc.png"
-    )
+    plugin_meta = read_manifest(Path(__file__).parent)
     plugin_settings_model = StarCitizenSettings
 
     def __init__(self):
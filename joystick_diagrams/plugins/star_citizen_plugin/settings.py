@@ -0,0 +1,17 @@
+from pathlib import Path
+
+from pydantic import Field
+
+from joystick_diagrams.plugins.plugin_settings import PluginSettings
+
+
+class StarCitizenSettings(PluginSettings):
+    actionmaps_file: Path | None = Field(
+        default=None,
+        title="Your actionmaps.xml from export",
+        json_schema_extra={
+            "is_folder": False,
+            "default_path": "~/",
+            "extensions": [".xml"],
+        },
+    )
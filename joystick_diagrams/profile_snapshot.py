@@ -0,0 +1,255 @@
+"""Warm start snapshot of the profile collections produced by parser plugins.
+
+After a successful run the ProfileCollection of each plugin is written to the data
+folder, tagged with the app version and a fingerprint of the plugin's sources. At
+startup the collections are restored without running the plugins, so profiles are
+available straight away, and then revalidated against their sources in the background.
+
+Collections are stored as JSON rather than pickled, so reading a tampered snapshot
+cannot run code.
+
+The processed profile wrappers are rebuilt from the restored collections rather than
+stored, as inheritance, routing and aliasing depend on settings that can change
+between sessions.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from joystick_diagrams import utils, version
+from joystick_diagrams.input.axis import Axis, AxisDirection, AxisSlider
+from joystick_diagrams.input.button import Button
+from joystick_diagrams.input.hat import Hat, HatDirection
+from joystick_diagrams.input.input import Input_
+from joystick_diagrams.input.modifier import Modifier
+from joystick_diagrams.input.profile_collection import ProfileCollection
+from joystick_diagrams.input_routing import RouteKey, RouteTarget
+from joystick_diagrams.plugin_wrapper import PluginWrapper
+
+_logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE_NAME = "profile_snapshot.json"
+
+# Bump when the stored collection layout changes, to discard older snapshots
+SNAPSHOT_FORMAT = 2
+
+
+@dataclass
+class PluginSnapshot:
+    plugin_version: str
+    fingerprint: str
+    collection: ProfileCollection
+
+
+def snapshot_path() -> Path:
+    return utils.data_root().joinpath("data", SNAPSHOT_FILE_NAME)
+
+
+def save_snapshot(
+    plugin_wrappers: list[PluginWrapper], path: Path | None = None
+) -> bool:
+    """Store the collections of plugins that ran successfully, replacing any previous snapshot"""
+    path = path or snapshot_path()
+    plugins = {
+        wrapper.name: {
+            "plugin_version": wrapper.version,
+            "fingerprint": wrapper.source_fingerprint,
+            "collection": encode_collection(wrapper.plugin_profile_collection),
+        }
+        for wrapper in plugin_wrappers
+        if wrapper.plugin_profile_collection and wrapper.source_fingerprint
+    }
+    data = {
+        "format": SNAPSHOT_FORMAT,
+        "app_version": version.VERSION,
+        "plugins": plugins,
+    }
+
+    temporary_path = path.with_suffix(".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # dumps rather than dump, as only the one-shot encoder runs in C
+        temporary_path.write_text(
+            json.dumps(data, separators=(",", ":")), encoding="utf-8"
+        )
+        os.replace(temporary_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        _logger.warning(f"Unable to save profile snapshot: {e}")
+        return False
+
+    _logger.info(f"Saved profile snapshot for {len(plugins)} plugins to {path}")
+    return True
+
+
+def load_snapshot(path: Path | None = None) -> dict[str, PluginSnapshot]:
+    """Returns the stored plugin snapshots, empty if missing or made by another version"""
+    path = path or snapshot_path()
+    if not path.is_file():
+        return {}
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        _logger.warning(f"Discarding unreadable profile snapshot {path}: {e}")
+        return {}
+
+    if not isinstance(data, dict) or (
+        data.get("format"),
+        data.get("app_version"),
+    ) != (SNAPSHOT_FORMAT, version.VERSION):
+        _logger.info("Discarding profile snapshot from another version")
+        return {}
+
+    try:
+        return {
+            name: PluginSnapshot(
+                entry["plugin_version"],
+                entry["fingerprint"],
+                decode_collection(entry["collection"]),
+            )
+            for name, entry in data.get("plugins", {}).items()
+        }
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        _logger.warning(f"Discarding unreadable profile snapshot {path}: {e}")
+        return {}
+
+
+def restore_snapshot(
+    plugin_wrappers: list[PluginWrapper], snapshot: dict[str, PluginSnapshot]
+) -> list[PluginWrapper]:
+    """Attach snapshot collections to enabled plugins that have not run, returning those restored"""
+    restored = []
+    for wrapper in plugin_wrappers:
+        entry = snapshot.get(wrapper.name)
+        if (
+            entry is None
+            or not wrapper.enabled
+            or wrapper.plugin_profile_collection is not None
+            or entry.plugin_version != wrapper.version
+        ):
+            continue
+
+        wrapper.plugin_profile_collection = entry.collection
+        wrapper.source_fingerprint = entry.fingerprint
+        restored.append(wrapper)
+
+    return restored
+
+
+def stale_plugin_wrappers(plugin_wrappers: list[PluginWrapper]) -> list[PluginWrapper]:
+    """Returns the plugins whose sources no longer match the fingerprint of their results.
+
+    Plugins whose sources cannot be checked count as stale, so running them reports
+    the error.
+    """
+    stale = []
+    for wrapper in plugin_wrappers:
+        try:
+            fingerprint = wrapper.plugin.source_fingerprint()
+        except Exception as e:
+            _logger.warning(f"Unable to check the sources of {wrapper.name}: {e}")
+            stale.append(wrapper)
+            continue
+
+        if fingerprint != wrapper.source_fingerprint:
+            stale.append(wrapper)
+    return stale
+
+
+# ----------------------------------------------------------------------
+# JSON encoding of profile collections
+# ----------------------------------------------------------------------
+
+
+def encode_collection(collection: ProfileCollection) -> list[dict]:
+    return [
+        {
+            "name": profile.name,
+            "devices": [
+                {
+                    "guid": device.guid,
+                    "name": device.name,
+                    "inputs": [
+                        _encode_input(input_)
+                        for inputs in device.inputs.values()
+                        for input_ in inputs.values()
+                    ],
+                }
+                for device in profile.devices.values()
+            ],
+            "input_routes": [
+                [list(key), [list(target) for target in targets]]
+                for key, targets in profile.input_routes.items()
+            ],
+        }
+        for profile in collection.profiles.values()
+    ]
+
+
+def decode_collection(data: list[dict]) -> ProfileCollection:
+    collection = ProfileCollection()
+    for profile_data in data:
+        profile = collection.create_profile(profile_data["name"])
+
+        for device_data in profile_data["devices"]:
+            device = profile.add_device(device_data["guid"], device_data["name"])
+            for input_data in device_data["inputs"]:
+                input_ = _decode_input(input_data)
+                device.inputs[device.resolve_type(input_.input_control)][
+                    input_.identifier
+                ] = input_
+
+        profile.input_routes = {
+            RouteKey(*key): [RouteTarget(*target) for target in targets]
+            for key, targets in profile_data["input_routes"]
+        }
+    return collection
+
+
+def _encode_input(input_: Input_) -> dict:
+    return {
+        "control": _encode_control(input_.input_control),
+        "command": input_.command,
+        "modifiers": [
+            [sorted(modifier.modifiers), modifier.command]
+            for modifier in input_.modifiers
+        ],
+    }
+
+
+def _decode_input(data: dict) -> Input_:
+    input_ = Input_(_decode_control(data["control"]), data["command"])
+    input_.modifiers = [
+        Modifier(set(modifiers), command) for modifiers, command in data["modifiers"]
+    ]
+    return input_
+
+
+def _encode_control(control: Axis | AxisSlider | Button | Hat) -> list:
+    match control:
+        case Button():
+            return ["button", control.id]
+        case Axis():
+            return ["axis", control.id.name]
+        case AxisSlider():
+            return ["axis_slider", control.id]
+        case Hat():
+            return ["hat", control.id, control.direction.name]
+    raise TypeError(f"Unknown control type {type(control)}")
+
+
+def _decode_control(data: list) -> Axis | AxisSlider | Button | Hat:
+    match data:
+        case ["button", int(id_)]:
+            return Button(id_)
+        case ["axis", str(direction)]:
+            return Axis(AxisDirection[direction])
+        case ["axis_slider", int(id_)]:
+            return AxisSlider(id_)
+        case ["hat", int(id_), str(direction)]:
+            return Hat(id_, HatDirection[direction])
+    raise ValueError(f"Unknown control {data}")
@@ -0,0 +1,174 @@
+"""Captures cProfile and tracemalloc data for plugin runs and exports.
+
+Enabling capture from the Help menu profiles the next plugin run and the next export,
+after which capturing turns itself off. Each run's cProfile statistics are written to
+the logs folder as a .prof file, which can be read with pstats or a viewer such as
+snakeviz, together with a summary of the largest allocations made during the run.
+
+Setting the JOYSTICK_DIAGRAMS_PROFILE environment variable to 1 enables capturing at
+launch and also profiles the startup of the application.
+
+Work runs on several threads, so a capture collects one profiler per profiled block:
+
+    profiling.start_capture("export")
+    ...
+    with profiling.profiled("export"):  # on any thread
+        ...
+    profiling.finish_capture("export")
+"""
+
+import cProfile
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from joystick_diagrams.utils import data_root
+
+_logger = logging.getLogger(__name__)
+
+PROFILE_ENV_VAR = "JOYSTICK_DIAGRAMS_PROFILE"
+TOP_ALLOCATIONS = 25
+# The runs captured once each when capturing is enabled
+CAPTURE_NAMES = ("plugins", "export")
+
+# Captures still to be taken, each name is removed once its capture begins
+_pending: set[str] = set()
+_captures: dict[str, "Capture"] = {}
+# Whether tracemalloc was started for the captures, rather than by someone else
+_owns_tracemalloc = False
+_lock = threading.Lock()
+
+
+@dataclass
+class Capture:
+    name: str
+    baseline: tracemalloc.Snapshot
+    started: float = field(default_factory=time.perf_counter)
+    profiles: list[cProfile.Profile] = field(default_factory=list)
+
+
+def is_enabled() -> bool:
+    """Whether any run is still waiting to be captured"""
+    return bool(_pending)
+
+
+def set_enabled(enabled: bool, names: tuple[str, ...] = CAPTURE_NAMES) -> None:
+    """Capture the next run of each name, or cancel the captures not yet begun"""
+    with _lock:
+        _pending.clear()
+        if enabled:
+            _pending.update(names)
+    _logger.info(f"Performance profile capture {'enabled' if enabled else 'disabled'}")
+
+
+def configure() -> bool:
+    """Enable capturing from the environment variable, returns True when enabled"""
+    value = os.environ.get(PROFILE_ENV_VAR, "")
+    if value.strip().lower() not in ("", "0", "false"):
+        set_enabled(True, ("startup", *CAPTURE_NAMES))
+    return is_enabled()
+
+
+def start_capture(name: str) -> None:
+    """Begin a capture, when the next run of that name is waiting to be captured"""
+    global _owns_tracemalloc  # noqa: PLW0603
+    with _lock:
+        if name not in _pending or name in _captures:
+            return
+        _pending.discard(name)
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _owns_tracemalloc = True
+        else:
+            tracemalloc.reset_peak()
+
+        _captures[name] = Capture(name, tracemalloc.take_snapshot())
+
+
+@contextmanager
+def profiled(name: str):
+    """Profile the enclosed block on the current thread, as part of the named capture"""
+    capture = _captures.get(name)
+    if capture is None:
+        yield
+        return
+
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Another profiler is already active on this thread, it covers this block
+        yield
+        return
+
+    try:
+        yield
+    finally:
+        profile.disable()
+        with _lock:
+            capture.profiles.append(profile)
+
+
+def finish_capture(name: str, directory: Path | None = None) -> list[Path]:
+    """End a capture and write its results to the logs folder, returns the files written"""
+    global _owns_tracemalloc  # noqa: PLW0603
+    with _lock:
+        capture = _captures.pop(name, None)
+        if capture is None:
+            return []
+
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if _owns_tracemalloc and not _captures:
+            tracemalloc.stop()
+            _owns_tracemalloc = False
+
+    directory = directory or data_root() / "logs"
+    base_name = f"profile-{name}-{datetime.now():%Y%m%d-%H%M%S}"
+    written = []
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+
+        if capture.profiles:
+            profile_path = directory / f"{base_name}.prof"
+            pstats.Stats(*capture.profiles).dump_stats(profile_path)
+            written.append(profile_path)
+
+        allocations_path = directory / f"{base_name}-allocations.txt"
+        allocations_path.write_text(
+            format_allocations(capture, snapshot, current, peak), encoding="utf-8"
+        )
+        written.append(allocations_path)
+    except OSError as e:
+        _logger.warning(f"Unable to write performance profile for {name}: {e}")
+
+    for path in written:
+        _logger.info(f"Wrote performance profile {path}")
+    if not is_enabled():
+        _logger.info("Performance profile capture complete")
+    return written
+
+
+def format_allocations(
+    capture: Capture, snapshot: tracemalloc.Snapshot, current: int, peak: int
+) -> str:
+    """Summarise the allocations made since the capture began, largest first"""
+    elapsed = time.perf_counter() - capture.started
+    lines = [
+        f"Capture: {capture.name}",
+        f"Duration: {elapsed:.2f}s",
+        f"Traced memory: {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB",
+        "",
+        f"Top {TOP_ALLOCATIONS} allocation sites by growth:",
+    ]
+    statistics = snapshot.compare_to(capture.baseline, "lineno")
+    lines.extend(str(stat) for stat in statistics[:TOP_ALLOCATIONS])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,335 @@
+"""Generates synthetic profile collections and templates for load testing.
+
+A SyntheticSpec describes the shape of the data: how many profiles, the devices in
+each, the inputs bound on every device, how deep modifiers go, and how many input
+routes, device aliases and inheritance parents to create. generate() builds a matching
+ProfileCollection through the same Profile_ and Device_ methods the parser plugins use,
+and write_template() writes an SVG template with a key for every generated input.
+
+The same spec and seed always produce the same data, so it can be used from tests and
+benchmarks alike. From the command line the generated data is written as fixture files:
+
+    python -m joystick_diagrams.synthetic --profiles 200 --devices 8 output_folder
+
+which writes collection.pickle, a template for each device in templates/, and
+manifest.json listing the devices, aliases and profile parents.
+"""
+
+import argparse
+import json
+import pickle
+import random
+import sys
+import uuid
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+
+from joystick_diagrams.input.axis import Axis, AxisDirection
+from joystick_diagrams.input.button import Button
+from joystick_diagrams.input.device import INPUT_BUTTON_KEY, Device_
+from joystick_diagrams.input.hat import Hat, HatDirection
+from joystick_diagrams.input.profile import Profile_
+from joystick_diagrams.input.profile_collection import ProfileCollection
+from joystick_diagrams.input_routing import RouteKey, RouteTarget
+
+DEFAULT_SEED = 20240601
+
+MODIFIER_KEYS = ["lalt", "lctrl", "lshift", "ralt", "rctrl", "rshift"]
+HAT_DIRECTIONS = [HatDirection.U, HatDirection.R, HatDirection.D, HatDirection.L]
+AXIS_DIRECTIONS = list(AxisDirection)
+ROUTE_QUALIFIERS = ["", "Short", "Long"]
+WORDS = [
+    "Master",
+    "Arm",
+    "Gear",
+    "Flaps",
+    "Trim",
+    "Radar",
+    "Target",
+    "Cycle",
+    "Lock",
+    "Weapon",
+    "Select",
+    "Canopy",
+    "Lights",
+    "Boost",
+    "Shield",
+    "Power",
+]
+
+# Canvas size of generated templates
+TEMPLATE_WIDTH = 1920
+TEMPLATE_HEIGHT = 1080
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    profiles: int = 10
+    devices_per_profile: int = 4
+    buttons: int = 64
+    axes: int = 6
+    hats: int = 1
+    # Modifiers on every third input, the Nth of them holding N modifier keys
+    modifier_depth: int = 1
+    # Routes from a virtual device onto the buttons of the first device, per profile
+    routes: int = 0
+    # Extra devices in alternate profiles, each aliased to one of the regular devices
+    alias_pairs: int = 0
+    # Parents of each profile, chosen from the profiles before it
+    inheritance_fan_out: int = 0
+    seed: int = DEFAULT_SEED
+
+    def __post_init__(self):
+        if self.axes > len(AXIS_DIRECTIONS):
+            raise ValueError(f"A device can have at most {len(AXIS_DIRECTIONS)} axes")
+        if self.modifier_depth > len(MODIFIER_KEYS):
+            raise ValueError(f"Modifier depth can be at most {len(MODIFIER_KEYS)}")
+        if self.routes > self.buttons:
+            raise ValueError("There can be no more routes than buttons")
+        if (self.alias_pairs or self.routes) and not self.devices_per_profile:
+            raise ValueError("Aliases and routes need at least one device per profile")
+
+
+@dataclass
+class SyntheticProfiles:
+    spec: SyntheticSpec
+    collection: ProfileCollection
+    # GUID to name of every device, including alias sources and the routed device
+    devices: dict[str, str] = field(default_factory=dict)
+    # Alias source GUID to target GUID
+    aliases: dict[str, str] = field(default_factory=dict)
+    # Profile name to the names of its parents
+    parents: dict[str, list[str]] = field(default_factory=dict)
+
+
+def device_guid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def command_name(rng: random.Random, index: int) -> str:
+    return f"{rng.choice(WORDS)} {rng.choice(WORDS)} {index}"
+
+
+def device_controls(spec: SyntheticSpec) -> list[Button | Axis | Hat]:
+    "Returns the controls bound on each generated device"
+    controls: list[Button | Axis | Hat] = [
+        Button(number) for number in range(1, spec.buttons + 1)
+    ]
+    controls += [Axis(direction) for direction in AXIS_DIRECTIONS[: spec.axes]]
+    controls += [
+        Hat(number, direction)
+        for number in range(1, spec.hats + 1)
+        for direction in HAT_DIRECTIONS
+    ]
+    return controls
+
+
+def bind_device(device: Device_, spec: SyntheticSpec, rng: random.Random) -> None:
+    for index, control in enumerate(device_controls(spec)):
+        device.create_input(control, command_name(rng, index))
+
+        if index % 3 == 0:
+            keys = rng.sample(MODIFIER_KEYS, spec.modifier_depth)
+            for depth in range(1, spec.modifier_depth + 1):
+                device.add_modifier_to_input(
+                    control, set(keys[:depth]), command_name(rng, index)
+                )
+
+
+def generate(spec: SyntheticSpec | None = None) -> SyntheticProfiles:
+    """Builds a ProfileCollection of the shape described by spec"""
+    spec = spec or SyntheticSpec()
+    rng = random.Random(spec.seed)
+    result = SyntheticProfiles(spec, ProfileCollection())
+
+    regular = {
+        device_guid(rng): f"Synthetic Device {number}"
+        for number in range(spec.devices_per_profile)
+    }
+    result.devices.update(regular)
+
+    targets = list(regular)
+    for number in range(spec.alias_pairs):
+        source = device_guid(rng)
+        result.devices[source] = f"Synthetic Alias {number}"
+        result.aliases[source] = targets[number % len(targets)]
+
+    routed_guid = device_guid(rng) if spec.routes else None
+    if routed_guid:
+        result.devices[routed_guid] = "Synthetic Virtual Device"
+
+    names = [f"synthetic profile {number:04}" for number in range(spec.profiles)]
+    for index, name in enumerate(names):
+        profile = result.collection.create_profile(name)
+
+        for guid, device_name in regular.items():
+            bind_device(profile.add_device(guid, device_name), spec, rng)
+
+        # Alias sources only appear in alternate profiles, as a second device would
+        if index % 2:
+            for guid in result.aliases:
+                bind_device(profile.add_device(guid, result.devices[guid]), spec, rng)
+
+        if routed_guid:
+            add_routes(profile, routed_guid, next(iter(regular)), spec, rng)
+
+        fan_out = min(spec.inheritance_fan_out, index)
+        if fan_out:
+            result.parents[name] = rng.sample(names[:index], fan_out)
+
+    return result
+
+
+def add_routes(
+    profile: Profile_,
+    source_guid: str,
+    target_guid: str,
+    spec: SyntheticSpec,
+    rng: random.Random,
+) -> None:
+    "Binds buttons on the virtual device, and routes them onto the target device"
+    device = profile.add_device(source_guid, "Synthetic Virtual Device")
+    for number in range(1, spec.routes + 1):
+        button = Button(number)
+        device.create_input(button, command_name(rng, number))
+
+        route_key = RouteKey(source_guid, INPUT_BUTTON_KEY, button.identifier)
+        target_button = Button(rng.randrange(1, spec.buttons + 1))
+        profile.input_routes[route_key] = [
+            RouteTarget(
+                target_guid,
+                INPUT_BUTTON_KEY,
+                target_button.identifier,
+                ROUTE_QUALIFIERS[number % len(ROUTE_QUALIFIERS)],
+            )
+        ]
+
+
+def template_keys(spec: SyntheticSpec) -> list[str]:
+    "Returns the template keys for every input generated by spec"
+    keys = []
+    for index, control in enumerate(device_controls(spec)):
+        keys.append(control.identifier)
+        if index % 3 == 0 and spec.modifier_depth:
+            keys.append(f"{control.identifier}_Modifiers")
+            keys += [
+                f"{control.identifier}_Modifier_{depth}"
+                for depth in range(1, spec.modifier_depth + 1)
+            ]
+    return [*keys, "TEMPLATE_NAME", "CURRENT_DATE"]
+
+
+def template_svg(spec: SyntheticSpec | None = None, size_bytes: int = 0) -> str:
+    """Returns an SVG template with a text label for every key of spec.
+
+    When size_bytes is given the labels are padded with path data to about that size,
+    as in templates drawn with detailed device artwork.
+    """
+    spec = spec or SyntheticSpec()
+    rng = random.Random(spec.seed)
+    keys = template_keys(spec)
+    padding = size_bytes // len(keys)
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{TEMPLATE_WIDTH}" '
+        f'height="{TEMPLATE_HEIGHT}" viewBox="0 0 {TEMPLATE_WIDTH} {TEMPLATE_HEIGHT}">'
+    ]
+    for key in keys:
+        if padding:
+            points = []
+            length = 0
+            while length < padding:
+                point = f"L{rng.randrange(TEMPLATE_WIDTH)} {rng.randrange(TEMPLATE_HEIGHT)} "
+                points.append(point)
+                length += len(point)
+            parts.append(f'<path d="M0 0 {"".join(points)}Z"/>')
+
+        x, y = rng.randrange(TEMPLATE_WIDTH), rng.randrange(TEMPLATE_HEIGHT)
+        parts.append(f'<text x="{x}" y="{y}">{key}</text>')
+    parts.append("</svg>\n")
+
+    return "\n".join(parts)
+
+
+def write_template(
+    path: Path, spec: SyntheticSpec | None = None, size_bytes: int = 0
+) -> Path:
+    path.write_text(template_svg(spec, size_bytes), encoding="utf-8")
+    return path
+
+
+def write_fixtures(
+    directory: Path, spec: SyntheticSpec, template_size: int = 0
+) -> SyntheticProfiles:
+    """Writes generated profiles, templates and a manifest of them to directory"""
+    result = generate(spec)
+    templates = directory / "templates"
+    templates.mkdir(parents=True, exist_ok=True)
+
+    with open(directory / "collection.pickle", "wb") as f:
+        pickle.dump(result.collection, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    template_files = {}
+    for guid, name in result.devices.items():
+        file_name = f"{name}.svg"
+        write_template(templates / file_name, spec, template_size)
+        template_files[guid] = file_name
+
+    manifest = {
+        "spec": asdict(spec),
+        "devices": {
+            guid: {"name": name, "template": template_files[guid]}
+            for guid, name in result.devices.items()
+        },
+        "aliases": result.aliases,
+        "parents": result.parents,
+    }
+    (directory / "manifest.json").write_text(
+        json.dumps(manifest, indent=2), encoding="utf-8"
+    )
+
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m joystick_diagrams.synthetic",
+        description="Write synthetic profiles and templates for load testing",
+    )
+    parser.add_argument("output", type=Path, help="folder to write fixtures to")
+    defaults = SyntheticSpec()
+    for spec_field in fields(SyntheticSpec):
+        option = spec_field.name.replace("_", "-")
+        if spec_field.name == "devices_per_profile":
+            option = "devices"
+        parser.add_argument(
+            f"--{option}",
+            dest=spec_field.name,
+            type=int,
+            default=getattr(defaults, spec_field.name),
+        )
+    parser.add_argument(
+        "--template-size",
+        type=int,
+        default=0,
+        help="pad each template to about this many bytes",
+    )
+
+    args = vars(parser.parse_args(argv))
+    output = args.pop("output")
+    template_size = args.pop("template_size")
+
+    try:
+        spec = SyntheticSpec(**args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    result = write_fixtures(output, spec, template_size)
+    print(
+        f"Wrote {len(result.collection)} profiles and {len(result.devices)} templates to {output}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,17 +2,52 @@
 
 Interacts with the template file to allow interogration of template configuration, and compatability with potential devices
 
+Template files are opened lazily. The supported keys are scanned from a memory map
+over the file bytes, and the full text is only decoded when it is needed to export.
+The result of a scan is held as a TemplateSummary, which can be stored and handed back
+to a later Template so that an unchanged file need not be opened at all.
 """
 
 import functools
 import logging
+import mmap
 import re
+from dataclasses import dataclass
 from pathlib import Path
 
 from joystick_diagrams.exceptions import JoystickDiagramsError
 
 _logger = logging.getLogger(__name__)
 
+# Bytes read from the start of a template to find the dimensions of the root element
+SVG_HEADER_SIZE = 2000
+
+
+def parse_svg_header_dimensions(header: str) -> tuple[int, int]:
+    """Extract width and height from the start of an SVG document."""
+    width_match = re.search(r'width="(\d+)', header)
+    height_match = re.search(r'height="(\d+)', header)
+
+    width = int(width_match.group(1)) if width_match else 800
+    height = int(height_match.group(1)) if height_match else 600
+
+    return width, height
+
+
+@dataclass(frozen=True)
+class TemplateSummary:
+    """Everything compatibility checks need from a template, without its text"""
+
+    buttons: frozenset[str]
+    hats: frozenset[str]
+    axis: frozenset[str]
+    modifiers: frozenset[str]
+    template_name: bool
+    date: bool
+    requires_web_engine: bool
+    width: int
+    height: int
+
 
 class Template:
     BUTTON_KEY = re.compile(r"\bBUTTON_\d+\b", flags=re.IGNORECASE)
@@ -32,9 +67,30 @@ class Template:
     TEMPLATE_NAMING_KEY = re.compile(r"\bTEMPLATE_NAME\b", flags=re.IGNORECASE)
     TEMPLATE_DATE_KEY = re.compile(r"\bCURRENT_DATE\b", flags=re.IGNORECASE)
 
-    def __init__(self, template_path: str):
-        self.raw_data: str = self.get_template_data(Path(template_path))
-        self.template_file_name = Path(template_path).name
+    # HTML labels, which only a browser engine can lay out
+    FOREIGN_OBJECT = re.compile(r"<foreignObject\b")
+    # draw.io editor payload, the escaped mxGraph XML stored on the root element
+    EDITOR_PAYLOAD = re.compile(r'(<svg\b[^>]*?)\s+content="([^"]*)"')
+
+    # Every key is a whole word containing an underscore
+    KEY_CANDIDATE = re.compile(rb"\b\w*_\w*\b")
+
+    def __init__(self, template_path: str, summary: TemplateSummary | None = None):
+        self.template_path = Path(template_path)
+        self.template_file_name = self.template_path.name
+
+        if not self.template_path.is_file():
+            _logger.error(f"Template file does not exist: {template_path}")
+            raise JoystickDiagramsError("There was an issue reading the template file")
+
+        # A summary from a previous scan of the same file, saves scanning it again
+        if summary is not None:
+            self.__dict__["summary"] = summary
+
+    @functools.cached_property
+    def raw_data(self) -> str:
+        "Returns the decoded template, read on first use"
+        return self.get_template_data(self.template_path)
 
     def get_template_data(self, template_path: Path):
         try:
@@ -47,25 +103,75 @@ class Template:
                 "There was an issue reading the template file"
             ) from e
 
+    def _scan(self, scanner):
+        """Run scanner over the template bytes without decoding them, or over the text once decoded."""
+        if "raw_data" in self.__dict__:
+            return scanner(self.raw_data.encode("utf-8"))
+
+        try:
+            with self.template_path.open("rb") as f:
+                if self.template_path.stat().st_size == 0:
+                    return scanner(b"")
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return scanner(data)
+        except OSError as e:
+            _logger.error(e)
+            raise JoystickDiagramsError(
+                "There was an issue reading the template file"
+            ) from e
+
     @functools.cached_property
-    def _buttons(self) -> set[str]:
-        return {x.lower() for x in re.findall(self.BUTTON_KEY, self.raw_data)}
+    def _keys(self) -> set[str]:
+        """Returns every distinct key candidate in the template, found in a single pass"""
+        return {
+            key.decode("utf-8", errors="replace")
+            for key in self._scan(lambda data: set(self.KEY_CANDIDATE.findall(data)))
+        }
+
+    def _matching_keys(self, *patterns: re.Pattern) -> set[str]:
+        return {
+            key.lower()
+            for key in self._keys
+            if any(pattern.fullmatch(key) for pattern in patterns)
+        }
 
     @functools.cached_property
+    def summary(self) -> TemplateSummary:
+        "Returns the keys and properties of the template, scanned on first use"
+        width, height = self._scan(
+            lambda data: parse_svg_header_dimensions(
+                bytes(data[:SVG_HEADER_SIZE]).decode("utf-8", errors="ignore")
+            )
+        )
+        return TemplateSummary(
+            buttons=frozenset(self._matching_keys(self.BUTTON_KEY)),
+            hats=frozenset(self._matching_keys(self.HAT_KEY)),
+            axis=frozenset(self._matching_keys(self.AXIS_KEY)),
+            modifiers=frozenset(self._matching_keys(*self.MODIFIER_KEYS)),
+            template_name=bool(self._matching_keys(self.TEMPLATE_NAMING_KEY)),
+            date=bool(self._matching_keys(self.TEMPLATE_DATE_KEY)),
+            requires_web_engine=self._scan(
+                lambda data: data.find(b"<foreignObject") != -1
+            ),
+            width=width,
+            height=height,
+        )
+
+    @property
+    def _buttons(self) -> set[str]:
+        return set(self.summary.buttons)
+
+    @property
     def _hats(self) -> set[str]:
-        return {x.lower() for x in re.findall(self.HAT_KEY, self.raw_data)}
+        return set(self.summary.hats)
 
-    @functools.cached_property
+    @property
     def _axis(self) -> set[str]:
-        return {x.lower() for x in re.findall(self.AXIS_KEY, self.raw_data)}
+        return set(self.summary.axis)
 
-    @functools.cached_property
+    @property
     def _modifiers(self) -> set[str]:
-        result = []
-        for modifier_search_key in self.MODIFIER_KEYS:
-            matches = re.findall(modifier_search_key, self.raw_data)
-            result.extend(matches)
-        return {x.lower() for x in result}
+        return set(self.summary.modifiers)
 
     def get_template_modifiers(self) -> set[str]:
         "Returns the available MODIFIER NUMBERS supported for a given CONTROL from the template"
@@ -83,15 +189,48 @@ class Template:
         "Returns the available BUTTON controls from the template"
         return self._buttons
 
+    @property
+    def requires_web_engine(self) -> bool:
+        "Checks if the template has HTML labels, and so needs WebEngine to render as PNG"
+        return self.summary.requires_web_engine
+
+    @property
+    def dimensions(self) -> tuple[int, int]:
+        "Returns the width and height of the template"
+        return self.summary.width, self.summary.height
+
+    @functools.cached_property
+    def _editor_payload_match(self) -> re.Match | None:
+        return re.search(self.EDITOR_PAYLOAD, self.raw_data)
+
+    @property
+    def editor_payload(self) -> str | None:
+        "Returns the escaped draw.io editor payload embedded in the template, if any"
+        match = self._editor_payload_match
+        return match.group(2) if match else None
+
+    @functools.cached_property
+    def raw_data_without_editor_payload(self) -> str:
+        "Returns the template data with the draw.io editor payload removed"
+        match = self._editor_payload_match
+        if match is None:
+            return self.raw_data
+        return self.raw_data[: match.end(1)] + self.raw_data[match.end() :]
+
     @property
     def template_name(self) -> bool:
         "Checks if the template supports naming"
-        return bool(re.search(self.TEMPLATE_NAMING_KEY, self.raw_data))
+        # Search the text directly once decoded, as it may have been modified
+        if "raw_data" in self.__dict__:
+            return bool(re.search(self.TEMPLATE_NAMING_KEY, self.raw_data))
+        return self.summary.template_name
 
     @property
     def date(self) -> bool:
         "Checks if the template supports dating"
-        return bool(re.search(self.TEMPLATE_DATE_KEY, self.raw_data))
+        if "raw_data" in self.__dict__:
+            return bool(re.search(self.TEMPLATE_DATE_KEY, self.raw_data))
+        return self.summary.date
 
     @property
     def button_count(self) -> int:
@@ -0,0 +1,226 @@
+"""Flattens draw.io HTML labels in templates into native SVG text.
+
+draw.io exports every label as a <switch> holding a <foreignObject> HTML block,
+followed by a single line <text> fallback which draw.io truncates with "...".
+Flattening replaces each switch with a <text> element built from the lines of
+the HTML label, positioned and styled from the fallback. Placeholder keys are
+carried over untouched, so flattened templates export as normal and can be
+rasterized without a browser engine.
+
+HTML wrapping and inline font changes are not reproduced, each <br> or block
+in a label becomes one <tspan> line.
+
+Usage:
+
+    python -m joystick_diagrams.template_flatten templates/
+    python -m joystick_diagrams.template_flatten --output flat/ templates/
+"""
+
+import argparse
+import logging
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+from joystick_diagrams.template import Template
+
+_logger = logging.getLogger(__name__)
+
+SWITCH = re.compile(r"<switch>(.*?)</switch>", re.DOTALL)
+FALLBACK_TEXT = re.compile(r"<text\b([^>]*)>.*?</text>", re.DOTALL)
+# Line boundaries within an HTML label, a <br> always ends a line, blocks only end non-empty ones
+LABEL_BOUNDARY = re.compile(r"(<br\s*/?>)|</?(?:div|p|li)\b[^>]*>", re.IGNORECASE)
+TAG = re.compile(r"<[^>]+>")
+WHITESPACE = re.compile(r"\s+")
+
+FONT_SIZE = re.compile(r'\bfont-size="([\d.]+)')
+LINE_HEIGHT = re.compile(r"line-height:\s*([\d.]+)")
+VERTICAL_ALIGN = re.compile(r"align-items:\s*(?:unsafe\s+)?([\w-]+)")
+POSITION = re.compile(r'\b([xy])="(-?[\d.]+)"')
+
+# draw.io's "Text is not SVG - cannot display" notice, shown by viewers without foreignObject support
+DRAWIO_TEXT_WARNING = "svg-export-text-problems"
+
+
+@dataclass
+class FlattenResult:
+    path: Path
+    original_size: int
+    flattened_size: int
+    labels: int
+
+    @property
+    def reduction(self) -> float:
+        if not self.original_size:
+            return 0.0
+        return (1 - self.flattened_size / self.original_size) * 100
+
+
+def html_label_lines(html: str) -> list[str]:
+    """Split the HTML of a draw.io label into its visible lines of text, markup removed."""
+    lines = []
+    current = ""
+    position = 0
+
+    for boundary in LABEL_BOUNDARY.finditer(html):
+        current += html[position : boundary.start()]
+        position = boundary.end()
+
+        text = WHITESPACE.sub(" ", TAG.sub("", current)).strip()
+        if boundary.group(1) or text:
+            lines.append(text)
+        current = ""
+
+    text = WHITESPACE.sub(" ", TAG.sub("", current + html[position:])).strip()
+    if text:
+        lines.append(text)
+
+    return lines
+
+
+def flatten_label(switch_body: str) -> str | None:
+    """Build a native <text> element for a draw.io label switch, None if it is not a label."""
+    fallback = FALLBACK_TEXT.search(switch_body)
+    if fallback is None or not Template.FOREIGN_OBJECT.search(switch_body):
+        return None
+
+    attributes = fallback.group(1)
+    position = dict(POSITION.findall(attributes))
+    if "x" not in position or "y" not in position:
+        return None
+
+    lines = html_label_lines(switch_body[: fallback.start()])
+
+    font_size = FONT_SIZE.search(attributes)
+    line_height = LINE_HEIGHT.search(switch_body)
+    step = float(font_size.group(1) if font_size else 12) * float(
+        line_height.group(1) if line_height else 1.2
+    )
+
+    # The fallback baseline sits where a single line would, shift to keep the block aligned
+    alignment = VERTICAL_ALIGN.search(switch_body)
+    alignment = alignment.group(1) if alignment else "center"
+    if alignment == "flex-start":
+        offset = 0.0
+    elif alignment == "flex-end":
+        offset = -(len(lines) - 1) * step
+    else:
+        offset = -(len(lines) - 1) * step / 2
+
+    x, y = position["x"], float(position["y"]) + offset
+    tspans = "".join(
+        f'<tspan x="{x}" y="{round(y + index * step, 2):g}">{line}</tspan>'
+        for index, line in enumerate(lines)
+        if line
+    )
+
+    return f"<text{attributes}>{tspans}</text>"
+
+
+def flatten_template(svg: str) -> tuple[str, int]:
+    """Replace the HTML labels in a draw.io SVG with native text.
+
+    Returns the flattened SVG and the number of labels converted.
+    """
+    labels = 0
+
+    def replace_label(match: re.Match) -> str:
+        nonlocal labels
+        text = flatten_label(match.group(1))
+        if text is None:
+            return match.group(0)
+        labels += 1
+        return text
+
+    flattened = SWITCH.sub(replace_label, svg)
+
+    # Only drop the unsupported text notice once nothing depends on foreignObject
+    if not Template.FOREIGN_OBJECT.search(flattened):
+        flattened = SWITCH.sub(
+            lambda m: "" if DRAWIO_TEXT_WARNING in m.group(1) else m.group(0),
+            flattened,
+        )
+
+    return flattened, labels
+
+
+def flatten_file(path: Path, output: Path | None = None) -> FlattenResult:
+    """Flatten a template file, writing it to output when given."""
+    svg = path.read_text(encoding="utf-8")
+    flattened, labels = flatten_template(svg)
+
+    if output is not None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(flattened, encoding="utf-8")
+
+    return FlattenResult(
+        path, len(svg.encode("utf-8")), len(flattened.encode("utf-8")), labels
+    )
+
+
+def find_templates(paths: list[Path]) -> list[tuple[Path, Path]]:
+    """Expand files and directories to (template, path relative to its root) pairs."""
+    templates = []
+    for path in paths:
+        if path.is_dir():
+            templates.extend(
+                (file, file.relative_to(path)) for file in sorted(path.rglob("*.svg"))
+            )
+        else:
+            templates.append((path, Path(path.name)))
+    return templates
+
+
+def format_report(results: list[FlattenResult]) -> str:
+    lines = [f"{'Original':>10} {'Flattened':>10} {'Saved':>7} {'Labels':>6}  Template"]
+    for result in results:
+        lines.append(
+            f"{result.original_size:>10,} {result.flattened_size:>10,} "
+            f"{result.reduction:>6.1f}% {result.labels:>6}  {result.path}"
+        )
+
+    original = sum(r.original_size for r in results)
+    flattened = sum(r.flattened_size for r in results)
+    saved = (1 - flattened / original) * 100 if original else 0.0
+    labels = sum(r.labels for r in results)
+    lines.append(
+        f"{original:>10,} {flattened:>10,} {saved:>6.1f}% {labels:>6}  "
+        f"Total ({len(results)} templates)"
+    )
+
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m joystick_diagrams.template_flatten",
+        description="Convert draw.io HTML labels in templates to native SVG text.",
+    )
+    parser.add_argument(
+        "paths", nargs="+", type=Path, help="Template files or directories"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="Directory to write flattened templates to, report only when omitted",
+    )
+    args = parser.parse_args(argv)
+
+    results = []
+    for template, relative in find_templates(args.paths):
+        output = args.output / relative if args.output else None
+        try:
+            results.append(flatten_file(template, output))
+        except (OSError, UnicodeDecodeError) as e:
+            _logger.error(f"Could not flatten {template}: {e}")
+
+    print(format_report(results))
+
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    sys.exit(main())
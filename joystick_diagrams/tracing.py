@@ -0,0 +1,203 @@
+"""Lightweight tracing of the profile and export pipeline.
+
+Pipeline stages are wrapped in spans, which record nothing unless tracing is enabled.
+When enabled, the spans of each plugin run and export are written to the logs folder
+as a Chrome trace_event JSON file, which can be opened in chrome://tracing or
+https://ui.perfetto.dev.
+
+Tracing is enabled with the "Write pipeline traces" setting, or for a single launch
+by setting the JOYSTICK_DIAGRAMS_TRACE environment variable to 1.
+
+Usage:
+
+    with tracing.span("load template", path=template_path):
+        ...
+
+    @tracing.traced()
+    def create_profile_wrappers(self, ...):
+        ...
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from joystick_diagrams.db import db_settings
+from joystick_diagrams.utils import data_root
+
+_logger = logging.getLogger(__name__)
+
+TRACE_ENV_VAR = "JOYSTICK_DIAGRAMS_TRACE"
+TRACE_SETTING_KEY = "pipeline_tracing"
+
+_enabled = False
+_events: list[dict] = []
+_thread_names: dict[int, str] = {}
+_track_ids: dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled  # noqa: PLW0603
+    _enabled = bool(enabled)
+    if not _enabled:
+        with _lock:
+            _events.clear()
+
+
+def configure() -> None:
+    """Enable tracing from the environment variable, or the stored setting when it is unset"""
+    value = os.environ.get(TRACE_ENV_VAR)
+    if value is None:
+        set_enabled(db_settings.get_setting(TRACE_SETTING_KEY) == "true")
+    else:
+        set_enabled(value.strip().lower() not in ("", "0", "false"))
+
+    if _enabled:
+        _logger.info(f"Pipeline tracing enabled, traces are written to {_logs_path()}")
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        _record(self.name, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **args):
+    """Returns a context manager timing the enclosed block, a shared no-op when disabled"""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def traced(name: str | None = None):
+    """Decorator recording a span for each call of the function"""
+
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(label, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record(
+    name: str, start_ns: int, end_ns: int, track: str | None = None, **args
+) -> None:
+    """Record a span measured elsewhere with time.perf_counter_ns, such as an asynchronous render.
+
+    Spans that overlap on one thread are given a named track, shown as a row of its own.
+    """
+    if _enabled:
+        _record(name, start_ns, end_ns, args, track)
+
+
+def _record(
+    name: str, start_ns: int, end_ns: int, args: dict, track: str | None = None
+) -> None:
+    event = {
+        "name": name,
+        "cat": "pipeline",
+        "ph": "X",
+        "ts": start_ns / 1000,
+        "dur": (end_ns - start_ns) / 1000,
+        "pid": os.getpid(),
+    }
+    if args:
+        event["args"] = args
+
+    thread = threading.current_thread()
+    with _lock:
+        if track is None:
+            event["tid"] = thread.ident
+            _thread_names[thread.ident] = thread.name
+        else:
+            event["tid"] = _track_ids.setdefault(track, -len(_track_ids) - 1)
+            _thread_names[event["tid"]] = track
+        _events.append(event)
+
+
+def _logs_path() -> Path:
+    return data_root() / "logs"
+
+
+def write_trace(run_name: str, directory: Path | None = None) -> Path | None:
+    """Write the spans recorded since the last write as a trace file, then clear them.
+
+    Returns the path written, None when tracing is disabled or nothing was recorded.
+    """
+    with _lock:
+        events = list(_events)
+        _events.clear()
+        thread_names = dict(_thread_names)
+
+    if not _enabled or not events:
+        return None
+
+    pid = os.getpid()
+    metadata = [
+        {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": pid,
+            "tid": tid,
+            "args": {"name": name},
+        }
+        for tid, name in thread_names.items()
+    ]
+
+    directory = directory or _logs_path()
+    path = directory / f"trace-{run_name}-{datetime.now():%Y%m%d-%H%M%S-%f}.json"
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"traceEvents": metadata + events, "displayTimeUnit": "ms"},
+                f,
+                default=str,
+            )
+    except OSError as e:
+        _logger.warning(f"Unable to write trace file {path}: {e}")
+        return None
+
+    _logger.info(f"Wrote {len(events)} trace events to {path}")
+    return path
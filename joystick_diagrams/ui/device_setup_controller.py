@@ -2,11 +2,13 @@ import logging
 from pathlib import Path
 from typing import Union
 
+from joystick_diagrams import tracing
 from joystick_diagrams.app_state import AppState
 from joystick_diagrams.db.db_device_management import (
     get_device_template_path,
     remove_template_path_from_device,
 )
+from joystick_diagrams.db.template_index_service import load_template
 from joystick_diagrams.exceptions import JoystickDiagramsError
 from joystick_diagrams.export_device import ExportDevice
 from joystick_diagrams.profile_wrapper import ProfileWrapper
@@ -41,6 +43,7 @@ def setup_export_devices(export_device_list: list[ExportDevice]):
             _logger.error(e)
 
 
+@tracing.traced()
 def get_export_devices() -> list[ExportDevice]:
     """Retrieves profiles from global state and converts them to device trees"""
     devices = convert_profile_wrappers_to_export_devices(get_processed_profiles())
@@ -78,7 +81,8 @@ def get_template_for_device(
         remove_template_path_from_device(device_guid)
         result = None
     else:
-        result = Template(template_path)
+        with tracing.span("load template", path=template_path):
+            result = load_template(template_path)
 
     if cache is not None:
         cache[template_path] = result
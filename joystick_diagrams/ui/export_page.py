@@ -18,13 +18,20 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from joystick_diagrams import profiling, tracing
 from joystick_diagrams.app_state import AppState
 from joystick_diagrams.db.db_device_management import (
     add_update_device_template_path,
 )
 from joystick_diagrams.db.db_settings import get_setting
-from joystick_diagrams.export import export
+from joystick_diagrams.export import (
+    DEFAULT_EDITOR_PAYLOAD_MODE,
+    EditorPayloadMode,
+    export,
+    get_editor_payload_mode,
+)
 from joystick_diagrams.export_device import ExportDevice
+from joystick_diagrams.export_image import RenderJob, rasterize_without_web_engine
 from joystick_diagrams.plugins.output_plugin_interface import ExportResult
 from joystick_diagrams.ui import main_window, ui_consts
 from joystick_diagrams.ui.device_setup import DeviceSetup
@@ -259,6 +266,9 @@ class ExportPage(QMainWindow, export_ui.Ui_Form):
         return self.device_widget.get_selected_export_items()
 
     def export_finished(self, data):
+        tracing.write_trace("export")
+        profiling.finish_capture("export")
+
         # TODO handle MW interaction better
         main_window_inst: main_window.MainWindow = self.appState.main_window
         main_window_inst.progressBar.setRange(0, 100)
@@ -306,20 +316,23 @@ class ExportPage(QMainWindow, export_ui.Ui_Form):
     def lock_export_button(self):
         self.ExportButton.setEnabled(False)
 
-    def start_png_conversion(self, conversions: list):
+    def start_png_conversion(self, render_jobs: list, export_results: list):
         """Start converting SVGs to PNGs on the main thread using QWebEngineView."""
-        from joystick_diagrams.export_image import PngConverter
+        from joystick_diagrams.export_image import (
+            PNG_RENDER_PAGES_SETTING_KEY,
+            PngConverter,
+        )
 
         main_window_inst: main_window.MainWindow = self.appState.main_window
         main_window_inst.statusLabel.setText("Converting to PNG...")
         main_window_inst.progressBar.setValue(0)
 
-        self._pending_export_count = len(conversions)
-        # Extract ExportResult objects from the (svg, png, export_result) tuples
-        self._pending_export_results = [t[2] for t in conversions if len(t) == 3]
-        # Pass only (svg, png) pairs to PngConverter
-        png_pairs = [(t[0], t[1]) for t in conversions]
-        self._png_converter = PngConverter(png_pairs)
+        self._pending_export_count = len(export_results)
+        self._pending_export_results = export_results
+        render_pages = get_setting(PNG_RENDER_PAGES_SETTING_KEY)
+        self._png_converter = PngConverter(
+            render_jobs, pages=int(render_pages) if render_pages else None
+        )
         self._png_converter.progress.connect(self._on_png_progress)
         self._png_converter.finished.connect(self._on_png_finished)
         self._png_converter.start()
@@ -392,7 +405,10 @@ class ExportPage(QMainWindow, export_ui.Ui_Form):
             return
 
         worker = ExportDispatch(
-            items_to_export, self.export_settings_widget.export_location, export_format
+            items_to_export,
+            self.export_settings_widget.export_location,
+            export_format,
+            get_editor_payload_mode(),
         )
 
         worker.signals.started.connect(self.lock_export_button)
@@ -403,6 +419,7 @@ class ExportPage(QMainWindow, export_ui.Ui_Form):
         worker.signals.error.connect(self.show_export_error)
         worker.signals.png_conversion_needed.connect(self.start_png_conversion)
         self._pending_export_count = 0
+        profiling.start_capture("export")
         self.threadPool.start(worker)
 
 
@@ -412,9 +429,7 @@ class ExportSignals(QObject):
     progress = Signal(int)
     error = Signal(str)
     status_update = Signal(str)
-    png_conversion_needed = Signal(
-        list
-    )  # list of (svg_path, png_path, ExportResult) tuples
+    png_conversion_needed = Signal(list, list)  # RenderJobs, all ExportResults
 
 
 class OutputPluginSignals(QObject):
@@ -433,15 +448,16 @@ class OutputPluginDispatch(QRunnable):
     def run(self):
         app_state = AppState()
         if app_state.output_plugin_manager:
-            for (
-                wrapper
-            ) in app_state.output_plugin_manager.get_enabled_plugin_wrappers():
-                try:
-                    wrapper.run(self.results)
-                except Exception as e:
-                    _logger.error(
-                        f"Output plugin '{wrapper.name}' raised an exception: {e}"
-                    )
+            with profiling.profiled("export"):
+                for (
+                    wrapper
+                ) in app_state.output_plugin_manager.get_enabled_plugin_wrappers():
+                    try:
+                        wrapper.run(self.results)
+                    except Exception as e:
+                        _logger.error(
+                            f"Output plugin '{wrapper.name}' raised an exception: {e}"
+                        )
         self.signals.finished.emit()
 
 
@@ -457,6 +473,7 @@ class ExportDispatch(QRunnable):
         export_items: list[ExportDevice],
         export_directory: str,
         export_format: str = "SVG",
+        editor_payload: EditorPayloadMode = DEFAULT_EDITOR_PAYLOAD_MODE,
         **kwargs,
     ):
         super(ExportDispatch, self).__init__()
@@ -464,6 +481,7 @@ class ExportDispatch(QRunnable):
         self.export_items = export_items
         self.export_directory = export_directory
         self.export_format = export_format
+        self.editor_payload = editor_payload
         self.signals = ExportSignals()
 
     @Slot()  # QtCore.Slot
@@ -472,9 +490,19 @@ class ExportDispatch(QRunnable):
         Initialise the runner function with passed args, kwargs.
         """
         self.signals.started.emit()
+
+        # Finished is emitted outside the profiled block, so a capture ends after it
+        with profiling.profiled("export"):
+            exported_count = self._export()
+
+        if exported_count is not None:
+            self.signals.finished.emit(exported_count)
+
+    def _export(self) -> int | None:
+        """Export the items, returns the count exported or None when PNG conversion continues on the main thread."""
         item_count = len(self.export_items)
 
-        # Export SVG files (always generates SVGs; for PNG, conversion is post-processed)
+        # Export SVG files, for PNG the populated SVGs are converted in memory afterwards
         exported_count = 0
         png_conversions = []
         export_results = []
@@ -484,12 +512,17 @@ class ExportDispatch(QRunnable):
                 f"Exporting {count}/{item_count} which has profile {item.profile_wrapper.profile_name}"
             )
             try:
-                result = export(item, self.export_directory, self.export_format)
+                result = export(
+                    item,
+                    self.export_directory,
+                    self.export_format,
+                    self.editor_payload,
+                )
                 exported_count += 1
 
                 if result is not None:
-                    svg_path, png_path = result
-                    is_png = png_path is not None
+                    is_png = isinstance(result, RenderJob)
+                    file_path = result.png_path if is_png else Path(result[0])
 
                     export_result = ExportResult(
                         profile_name=item.profile_wrapper.profile_name,
@@ -497,23 +530,22 @@ class ExportDispatch(QRunnable):
                         device_guid=item.device_id,
                         source_plugin=item.profile_wrapper.profile_origin.name,
                         template_name=item.template_file_name,
-                        export_format="PNG" if is_png else "SVG",
-                        file_path=Path(png_path if is_png else svg_path),
+                        export_format="PNG" if is_png else self.export_format,
+                        file_path=file_path,
                         export_directory=Path(self.export_directory),
                         device=item.device,
                     )
                     export_results.append(export_result)
 
                     if is_png:
-                        png_conversions.append((svg_path, png_path, export_result))
+                        png_conversions.append(result)
 
             except PermissionError:
                 self.signals.error.emit(
                     f"Permission denied writing to '{self.export_directory}'. "
                     f"Choose a different export location or check folder permissions."
                 )
-                self.signals.finished.emit(exported_count)
-                return
+                return exported_count
             except Exception as e:
                 _logger.error(
                     f"Failed to export {item.profile_wrapper.profile_name}: {e}"
@@ -529,15 +561,21 @@ class ExportDispatch(QRunnable):
         # After SVG export, call plugin export methods if they exist
         self._call_plugin_exports()
 
-        # If PNG format, signal main thread to do the conversion + output plugins after
+        # Plain SVGs are rasterized on this thread, only HTML labels need WebEngine
         if png_conversions:
-            self.signals.png_conversion_needed.emit(png_conversions)
-        else:
-            # SVG format: dispatch output plugins directly on this worker thread
-            if export_results:
-                self.signals.status_update.emit("Running output plugins...")
-            self._dispatch_output_plugins(export_results)
-            self.signals.finished.emit(exported_count)
+            self.signals.status_update.emit("Converting to PNG...")
+            png_conversions = rasterize_without_web_engine(png_conversions)
+
+        # If any remain, signal main thread to do the conversion + output plugins after
+        if png_conversions:
+            self.signals.png_conversion_needed.emit(png_conversions, export_results)
+            return None
+
+        # Nothing left to convert: dispatch output plugins directly on this worker thread
+        if export_results:
+            self.signals.status_update.emit("Running output plugins...")
+        self._dispatch_output_plugins(export_results)
+        return exported_count
 
     def _call_plugin_exports(self):
         """Call export_mappings method on plugins that implement it"""
@@ -545,11 +583,14 @@ class ExportDispatch(QRunnable):
             appState = AppState()
 
             # Get enabled plugins that have export functionality
-            plugins_with_export = [
-                pw
-                for pw in appState.plugin_manager.get_enabled_plugin_wrappers()
-                if hasattr(pw.plugin, "export_mappings")
-            ]
+            plugins_with_export = []
+            for pw in appState.plugin_manager.get_enabled_plugin_wrappers():
+                try:
+                    # Lazily loaded plugins are imported to look up a declared hook
+                    if hasattr(pw.plugin, "export_mappings"):
+                        plugins_with_export.append(pw)
+                except Exception as e:
+                    _logger.error(f"Error loading plugin {pw.name} for export: {e}")
 
             if not plugins_with_export:
                 return
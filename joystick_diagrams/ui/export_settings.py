@@ -34,6 +34,7 @@ class ExportSettings(QMainWindow, export_settings.Ui_Form):
         self.export_format.clear()
         self.export_format.addItem("SVG", "SVG")
         self.export_format.addItem("PNG", "PNG")
+        self.export_format.addItem("SVGZ (compressed SVG)", "SVGZ")
         self.export_format.setProperty("class", "view-binds-list")
 
         saved_format = get_setting(EXPORT_FORMAT_SETTING_KEY) or "SVG"
@@ -1,8 +1,20 @@
 import logging
 import os
+import time
 
 import qtawesome as qta
-from PySide6.QtCore import QCoreApplication, QSize, Qt, QUrl
+from PySide6.QtCore import (
+    QCoreApplication,
+    QEvent,
+    QObject,
+    QRunnable,
+    QSize,
+    Qt,
+    QThreadPool,
+    QUrl,
+    Signal,
+    Slot,
+)
 from PySide6.QtGui import QAction, QDesktopServices, QIcon
 from PySide6.QtWidgets import (
     QFrame,
@@ -19,7 +31,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from joystick_diagrams import version
+from joystick_diagrams import profiling, version
 from joystick_diagrams.app_state import AppState
 from joystick_diagrams.ui import (
     configure_page,
@@ -35,6 +47,9 @@ _logger = logging.getLogger(__name__)
 
 
 class MainWindow(QMainWindow, main_window.Ui_MainWindow):
+    # Emitted once the work deferred until the first paint has finished
+    startup_finished = Signal()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.setupUi(self)
@@ -61,6 +76,14 @@ class MainWindow(QMainWindow, main_window.Ui_MainWindow):
         self._export_page = None
         self._settings_page = None
 
+        # Shown while a page is created on first navigation
+        self._page_placeholder = QLabel("Loading...")
+        self._page_placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._page_placeholder.setProperty("class", "page-placeholder")
+        self._page_stack.addWidget(self._page_placeholder)
+
+        self._version_check: VersionCheck | None = None
+
         # Step numbers on workflow buttons
         self.setupSectionButton.setText("1. Setup")
         self.customiseSectionButton.setText("2. Customise")
@@ -167,12 +190,15 @@ class MainWindow(QMainWindow, main_window.Ui_MainWindow):
         self.disable_additional_menus()
 
         # Load default tab
-        self.load_setting_widget()
         self.setupSectionButton.click()
 
         # Window Setup
         self.setWindowTitle(f"Joystick Diagrams - {version.get_current_version()}")
 
+    def start_deferred_work(self):
+        """Starts the startup work held back until the window has first painted"""
+        self._setup_page.snapshot_restored.connect(self.startup_finished)
+        self._setup_page.restore_snapshot()
         self.check_for_new_version()
 
     def _setup_menu_bar(self):
@@ -278,6 +304,19 @@ class MainWindow(QMainWindow, main_window.Ui_MainWindow):
         self._debug_action.triggered.connect(self._toggle_debug_mode)
         menu.addAction(self._debug_action)
 
+        self._profile_capture_action = QAction("Capture Performance Profile", self)
+        self._profile_capture_action.setToolTip(
+            "Profile the next plugin run and export, writing the results to the logs folder"
+        )
+        self._profile_capture_action.setCheckable(True)
+        self._profile_capture_action.setChecked(profiling.is_enabled())
+        self._profile_capture_action.triggered.connect(self._toggle_profile_capture)
+        menu.addAction(self._profile_capture_action)
+        # Capturing turns itself off once the runs are captured
+        menu.aboutToShow.connect(
+            lambda: self._profile_capture_action.setChecked(profiling.is_enabled())
+        )
+
         menu.addSeparator()
 
         check_updates_action = QAction("Check for Updates", self)
@@ -315,8 +354,25 @@ class MainWindow(QMainWindow, main_window.Ui_MainWindow):
         else:
             logging.getLogger().setLevel(logging.INFO)
 
+    def _toggle_profile_capture(self, checked):
+        profiling.set_enabled(checked)
+        if checked:
+            self.statusLabel.setText(
+                "Capturing a performance profile of the next plugin run and export"
+            )
+
     def _check_for_updates(self):
-        version_check = version.perform_version_check()
+        if self._version_check is not None:
+            return
+
+        # Keep a strong reference until the check reports back
+        self._version_check = VersionCheck()
+        self._version_check.signals.finished.connect(self._show_version_check)
+        QThreadPool.globalInstance().start(self._version_check)
+
+    @Slot(object)
+    def _show_version_check(self, version_check: bool | None):
+        self._version_check = None
         if version_check is False:
             self.statusLabel.setText(
                 "An update is available! Visit joystick-diagrams.com"
@@ -414,6 +470,7 @@ class MainWindow(QMainWindow, main_window.Ui_MainWindow):
         self._update_nav_icons("customise")
 
         if self._customise_page is None:
+            self._show_page_placeholder()
             self._customise_page = configure_page.configurePage()
             self._page_stack.addWidget(self._customise_page)
 
@@ -425,6 +482,7 @@ class MainWindow(QMainWindow, main_window.Ui_MainWindow):
         self._update_nav_icons("export")
 
         if self._export_page is None:
+            self._show_page_placeholder()
             self._export_page = export_page.ExportPage()
             self._page_stack.addWidget(self._export_page)
         else:
@@ -432,6 +490,11 @@ class MainWindow(QMainWindow, main_window.Ui_MainWindow):
 
         self._page_stack.setCurrentWidget(self._export_page)
 
+    def _show_page_placeholder(self):
+        """Paints the placeholder at once, before a page is created on first navigation"""
+        self._page_stack.setCurrentWidget(self._page_placeholder)
+        self.repaint()
+
     def _uncheck_workflow_buttons(self):
         """Uncheck the Setup/Customise/Export button group."""
         self.buttonGroup_2.setExclusive(False)
@@ -445,6 +508,7 @@ class MainWindow(QMainWindow, main_window.Ui_MainWindow):
         self._update_nav_icons("settings")
 
         if self._settings_page is None:
+            self._show_page_placeholder()
             self._settings_page = settings_page.SettingsPage()
             self._page_stack.addWidget(self._settings_page)
         else:
@@ -462,5 +526,51 @@ class MainWindow(QMainWindow, main_window.Ui_MainWindow):
                 setattr(self, attr, None)
 
 
+class VersionCheckSignals(QObject):
+    finished = Signal(object)
+
+
+class VersionCheck(QRunnable):
+    """Checks for a newer release away from the UI thread, as the request can take seconds."""
+
+    def __init__(self):
+        super(VersionCheck, self).__init__()
+        self.signals = VersionCheckSignals()
+
+    @Slot()
+    def run(self):
+        self.signals.finished.emit(version.perform_version_check())
+
+
+class StartupTiming(QObject):
+    """Logs the time from launch until the main window first paints, and becomes interactive.
+
+    The window is interactive once the work deferred until its first paint has finished.
+    """
+
+    first_painted = Signal()
+
+    def __init__(self, window: QMainWindow, launch_time: float):
+        super().__init__(window)
+        self.launch_time = launch_time
+        self.first_paint: float | None = None
+        window.installEventFilter(self)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Paint and self.first_paint is None:
+            self.first_paint = time.perf_counter() - self.launch_time
+            watched.removeEventFilter(self)
+            self.first_painted.emit()
+        return False
+
+    @Slot()
+    def log_interactive(self):
+        interactive = time.perf_counter() - self.launch_time
+        _logger.info(
+            f"Startup: first paint after {(self.first_paint or 0) * 1000:.0f} ms, "
+            f"interactive after {interactive * 1000:.0f} ms"
+        )
+
+
 if __name__ == "__main__":
     pass
@@ -2,7 +2,16 @@ import logging
 from pathlib import Path
 
 import qtawesome as qta
-from PySide6.QtCore import QObject, QRunnable, QSize, Qt, QThreadPool, Signal, Slot
+from PySide6.QtCore import (
+    QObject,
+    QRunnable,
+    QSize,
+    Qt,
+    QThreadPool,
+    QTimer,
+    Signal,
+    Slot,
+)
 from PySide6.QtGui import QFont, QIcon
 from PySide6.QtWidgets import (
     QCheckBox,
@@ -16,13 +25,19 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QPushButton,
     QScrollArea,
+    QSpinBox,
     QVBoxLayout,
     QWidget,
 )
 
+from joystick_diagrams import profile_snapshot, profiling, tracing
 from joystick_diagrams.app_state import AppState
 from joystick_diagrams.db.db_settings import add_update_setting_value, get_setting
-from joystick_diagrams.plugin_wrapper import PluginWrapper
+from joystick_diagrams.plugin_wrapper import (
+    PluginRunMetrics,
+    PluginWrapper,
+    format_size,
+)
 from joystick_diagrams.ui.qt_designer import setting_page_ui
 from joystick_diagrams.ui.widgets.section_header import SectionHeader
 
@@ -37,6 +52,7 @@ class PluginsPage(QMainWindow, setting_page_ui.Ui_Form):
     togglePluginEnabledState = Signal(object)
     statistics_change = Signal()
     total_parsed_profiles = Signal(int)
+    snapshot_restored = Signal()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -99,6 +115,9 @@ class PluginsPage(QMainWindow, setting_page_ui.Ui_Form):
 
         self.threadPool = QThreadPool()
         self._current_worker: PluginExecutor | None = None
+        self._snapshot_loader: SnapshotLoader | None = None
+        self._revalidator: SnapshotRevalidator | None = None
+        self._plugins_running = False
 
         self.populate_plugin_cards()
 
@@ -261,6 +280,7 @@ class PluginsPage(QMainWindow, setting_page_ui.Ui_Form):
                     else 0
                 )
                 card.set_profile_count(count)
+                card.set_run_metrics(plugin.run_metrics)
                 break
 
     def update_run_button_on_start(self):
@@ -274,19 +294,25 @@ class PluginsPage(QMainWindow, setting_page_ui.Ui_Form):
         self.runPluginsButton.setDisabled(True)
 
     def update_run_button_on_finish(self):
+        self._plugins_running = False
         self.runPluginsButton.setIcon(QIcon())
         self.runPluginsButton.setDisabled(False)
         self.update_run_button_state()
 
     def call_plugin_runner(self):
+        self._run_plugins(self.get_plugin_wrappers())
+
+    def _run_plugins(self, plugin_wrappers: list[PluginWrapper]):
         # Disable immediately to prevent a second run starting before the
         # thread's started signal arrives and disables the button.
         self.runPluginsButton.setDisabled(True)
+        self._plugins_running = True
         self.total_parsed_profiles.emit(0)
+        profiling.start_capture("plugins")
 
         # Keep a strong Python reference so GC doesn't collect the worker
         # (and its Signals QObject) while the thread is still running.
-        self._current_worker = PluginExecutor(self.get_plugin_wrappers())
+        self._current_worker = PluginExecutor(plugin_wrappers)
         self._current_worker.signals.started.connect(self.update_run_button_on_start)
         self._current_worker.signals.finished.connect(
             self.calculate_total_profile_count
@@ -302,7 +328,61 @@ class PluginsPage(QMainWindow, setting_page_ui.Ui_Form):
     @Slot()
     def update_profile_collections(self):
         _logger.debug("Updating profile collections from all plugins")
-        self.appState.process_profiles_from_collections()
+        with profiling.profiled("plugins"):
+            self.appState.process_profiles_from_collections()
+            self.appState.save_profile_snapshot()
+        tracing.write_trace("plugins")
+        profiling.finish_capture("plugins")
+
+    def restore_snapshot(self):
+        """Loads the results of the last session in the background, then shows them"""
+        self._snapshot_loader = SnapshotLoader()
+        self._snapshot_loader.signals.loaded.connect(self._apply_snapshot)
+        self.threadPool.start(self._snapshot_loader)
+
+    @Slot(object)
+    def _apply_snapshot(self, snapshot: dict):
+        self._snapshot_loader = None
+
+        # Results from a run started since launch supersede the snapshot
+        if not self._plugins_running and not any(
+            p.plugin_profile_collection for p in self.get_plugin_wrappers()
+        ):
+            self.appState.restore_profile_snapshot(snapshot)
+            # Show results restored from the last session, then check them against their sources
+            self._show_restored_plugins()
+
+        self.snapshot_restored.emit()
+
+    def _show_restored_plugins(self):
+        restored = self.appState.restored_plugin_wrappers
+        if not restored:
+            return
+        self.appState.restored_plugin_wrappers = []
+
+        for plugin in restored:
+            self.update_plugin_execute_state(plugin)
+
+        # Deferred until the main window has connected to total_parsed_profiles
+        QTimer.singleShot(0, self.calculate_total_profile_count)
+
+        self._revalidator = SnapshotRevalidator(restored)
+        self._revalidator.signals.stale.connect(self._rerun_stale_plugins)
+        self.threadPool.start(self._revalidator)
+
+    @Slot(list)
+    def _rerun_stale_plugins(self, plugin_wrappers: list[PluginWrapper]):
+        if not plugin_wrappers:
+            _logger.info("Restored plugin results are up to date with their sources")
+            return
+
+        if self._plugins_running:
+            return
+
+        _logger.info(
+            f"Sources changed since the snapshot, running {', '.join(p.name for p in plugin_wrappers)} again"
+        )
+        self._run_plugins(plugin_wrappers)
 
     @Slot()
     def calculate_total_profile_count(self):
@@ -336,6 +416,7 @@ class PluginCard(QFrame):
         # Restore profile count from any previous plugin execution
         if plugin_wrapper.plugin_profile_collection:
             self.set_profile_count(len(plugin_wrapper.plugin_profile_collection))
+        self.set_run_metrics(plugin_wrapper.run_metrics)
 
     def _build_ui(self):
         self.setProperty("class", "plugin-card")
@@ -399,6 +480,12 @@ class PluginCard(QFrame):
         self._status_layout.addWidget(self._status_label)
         self._status_layout.addStretch()
 
+        # Measurements of the last run, hidden until the plugin has run
+        self._metrics_label = QLabel()
+        self._metrics_label.setProperty("class", "plugin-card-version")
+        self._metrics_label.hide()
+        self._status_layout.addWidget(self._metrics_label)
+
         center.addLayout(self._status_layout)
         root.addLayout(center, stretch=1)
 
@@ -481,6 +568,26 @@ class PluginCard(QFrame):
             f"{count} profile{'s' if count != 1 else ''} parsed"
         )
 
+    def set_run_metrics(self, metrics: PluginRunMetrics | None):
+        if metrics is None:
+            self._metrics_label.hide()
+            return
+
+        self._metrics_label.setText(
+            f"{metrics.wall_time:.2f}s · {metrics.bindings} bindings"
+        )
+        details = [
+            f"Run time: {metrics.wall_time:.2f}s",
+            f"Files read: {metrics.files_read} ({format_size(metrics.bytes_read)})",
+            f"Profiles: {metrics.profiles}",
+            f"Devices: {metrics.devices}",
+            f"Bindings: {metrics.bindings}",
+        ]
+        if metrics.peak_memory_delta is not None:
+            details.append(f"Peak memory: +{format_size(metrics.peak_memory_delta)}")
+        self._metrics_label.setToolTip("\n".join(details))
+        self._metrics_label.show()
+
     def set_error_state(self, error_message: str | None):
         self._set_status(
             "error",
@@ -713,6 +820,20 @@ class PluginConfigPanel(QWidget):
             )
             return widget
 
+        if annotation is int:
+            minimum, maximum = 0, 999
+            for constraint in field_info.metadata:
+                minimum = getattr(constraint, "ge", minimum)
+                maximum = getattr(constraint, "le", maximum)
+
+            widget = QSpinBox()
+            widget.setRange(minimum, maximum)
+            widget.setValue(int(current_value or minimum))
+            widget.valueChanged.connect(
+                lambda value, k=field_name: self._on_setting_changed(k, value)
+            )
+            return widget
+
         _logger.warning(f"No widget mapping for setting field type: {annotation}")
         return None
 
@@ -745,6 +866,41 @@ class Signals(QObject):
     finished = Signal()
 
 
+class RevalidationSignals(QObject):
+    stale = Signal(list)
+
+
+class SnapshotSignals(QObject):
+    loaded = Signal(object)
+
+
+class SnapshotLoader(QRunnable):
+    """Reads the profile snapshot of the last session away from the UI thread."""
+
+    def __init__(self):
+        super(SnapshotLoader, self).__init__()
+        self.signals = SnapshotSignals()
+
+    @Slot()
+    def run(self):
+        self.signals.loaded.emit(profile_snapshot.load_snapshot())
+
+
+class SnapshotRevalidator(QRunnable):
+    """Compares plugin results restored from a snapshot with the current plugin sources."""
+
+    def __init__(self, plugin_wrappers: list[PluginWrapper]):
+        super(SnapshotRevalidator, self).__init__()
+        self.plugin_wrappers = plugin_wrappers
+        self.signals = RevalidationSignals()
+
+    @Slot()
+    def run(self):
+        self.signals.stale.emit(
+            profile_snapshot.stale_plugin_wrappers(self.plugin_wrappers)
+        )
+
+
 class PluginExecutor(QRunnable):
     """Executes parser plugins to run their process methods and produce ProfileCollections."""
 
@@ -757,6 +913,12 @@ class PluginExecutor(QRunnable):
     def run(self):
         self.signals.started.emit()
 
+        with profiling.profiled("plugins"):
+            self._process_plugins()
+
+        self.signals.finished.emit()
+
+    def _process_plugins(self):
         for plugin in self.plugin_wrappers:
             if not plugin.enabled:
                 _logger.info(f"Plugin: {plugin.name} was disabled - skipping")
@@ -771,8 +933,6 @@ class PluginExecutor(QRunnable):
 
             self.signals.processed.emit(plugin)
 
-        self.signals.finished.emit()
-
 
 if __name__ == "__main__":
     pass
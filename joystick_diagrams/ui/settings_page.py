@@ -21,12 +21,13 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QPushButton,
     QScrollArea,
+    QSpinBox,
     QStackedWidget,
     QVBoxLayout,
     QWidget,
 )
 
-from joystick_diagrams import utils
+from joystick_diagrams import tracing, utils
 from joystick_diagrams.app_state import AppState
 from joystick_diagrams.conflict_strategy import (
     ALIAS_CONFLICT_STRATEGY_KEY,
@@ -37,6 +38,17 @@ from joystick_diagrams.conflict_strategy import (
     get_inheritance_strategy,
 )
 from joystick_diagrams.db.db_settings import add_update_setting_value, get_setting
+from joystick_diagrams.export import (
+    EDITOR_PAYLOAD_SETTING_KEY,
+    SVGZ_COMPRESSION_SETTING_KEY,
+    EditorPayloadMode,
+    get_editor_payload_mode,
+    get_svgz_compression_level,
+)
+from joystick_diagrams.export_image import (
+    PNG_RENDER_PAGES_SETTING_KEY,
+    default_page_count,
+)
 from joystick_diagrams.ui.widgets.section_header import SectionHeader
 
 _logger = logging.getLogger(__name__)
@@ -60,6 +72,12 @@ ALIAS_STRATEGY_OPTIONS = [
     (AliasConflictStrategy.MODIFIER, "Modifier (losing binding becomes a modifier)"),
 ]
 
+EDITOR_PAYLOAD_OPTIONS = [
+    (EditorPayloadMode.KEEP, "Keep in exported diagrams"),
+    (EditorPayloadMode.STRIP, "Remove from exported diagrams"),
+    (EditorPayloadMode.ARCHIVE, "Remove and save alongside as .drawio"),
+]
+
 INHERITANCE_STRATEGY_OPTIONS = [
     (
         InheritanceConflictStrategy.KEEP_EXISTING,
@@ -170,6 +188,69 @@ class SettingsPage(QMainWindow):
         )
         form.addRow("", self.open_after_export_cb)
 
+        # Pipeline tracing
+        self.pipeline_tracing_cb = QCheckBox("Write pipeline traces to the logs folder")
+        self.pipeline_tracing_cb.setToolTip(
+            "Records how long each stage of plugin runs and exports takes, as a "
+            "Chrome trace file that can be opened in chrome://tracing or Perfetto."
+        )
+        self.pipeline_tracing_cb.setChecked(tracing.is_enabled())
+        self.pipeline_tracing_cb.stateChanged.connect(self._on_pipeline_tracing_changed)
+        form.addRow("", self.pipeline_tracing_cb)
+
+        # Concurrent PNG render pages
+        self.png_render_pages_spin = QSpinBox()
+        self.png_render_pages_spin.setRange(1, 8)
+        self.png_render_pages_spin.setToolTip(
+            "Number of diagrams rendered to PNG at the same time. Higher values "
+            "export faster but use more memory."
+        )
+        saved_pages = get_setting(PNG_RENDER_PAGES_SETTING_KEY)
+        self.png_render_pages_spin.setValue(
+            int(saved_pages) if saved_pages else default_page_count()
+        )
+        self.png_render_pages_spin.valueChanged.connect(
+            self._on_png_render_pages_changed
+        )
+        pages_label = QLabel("PNG render pages")
+        pages_label.setObjectName("device_help_label")
+        form.addRow(pages_label, self.png_render_pages_spin)
+
+        # SVGZ compression level
+        self.svgz_compression_spin = QSpinBox()
+        self.svgz_compression_spin.setRange(1, 9)
+        self.svgz_compression_spin.setToolTip(
+            "Compression level for SVGZ exports, 1 is fastest and 9 is smallest."
+        )
+        self.svgz_compression_spin.setValue(get_svgz_compression_level())
+        self.svgz_compression_spin.valueChanged.connect(
+            self._on_svgz_compression_changed
+        )
+        compression_label = QLabel("SVGZ compression level")
+        compression_label.setObjectName("device_help_label")
+        form.addRow(compression_label, self.svgz_compression_spin)
+
+        # draw.io editor payload handling
+        self.editor_payload_combo = QComboBox()
+        self.editor_payload_combo.setProperty("class", "view-binds-list")
+        self.editor_payload_combo.setMinimumWidth(320)
+        self.editor_payload_combo.setToolTip(
+            "draw.io templates embed a full copy of the diagram for editing. "
+            "Removing it makes exports smaller and faster, but exported diagrams "
+            "can no longer be opened for editing in draw.io."
+        )
+        current_payload_mode = get_editor_payload_mode()
+        for i, (value, label) in enumerate(EDITOR_PAYLOAD_OPTIONS):
+            self.editor_payload_combo.addItem(label, value.value)
+            if value == current_payload_mode:
+                self.editor_payload_combo.setCurrentIndex(i)
+        self.editor_payload_combo.currentIndexChanged.connect(
+            self._on_editor_payload_changed
+        )
+        payload_label = QLabel("draw.io editor data")
+        payload_label.setObjectName("device_help_label")
+        form.addRow(payload_label, self.editor_payload_combo)
+
         # Alias merge strategy
         self.alias_strategy_combo = QComboBox()
         self.alias_strategy_combo.setProperty("class", "view-binds-list")
@@ -222,6 +303,24 @@ class SettingsPage(QMainWindow):
             "true" if state == Qt.CheckState.Checked.value else "false",
         )
 
+    def _on_pipeline_tracing_changed(self, state: int):
+        enabled = state == Qt.CheckState.Checked.value
+        add_update_setting_value(
+            tracing.TRACE_SETTING_KEY, "true" if enabled else "false"
+        )
+        tracing.set_enabled(enabled)
+
+    def _on_png_render_pages_changed(self, value: int):
+        add_update_setting_value(PNG_RENDER_PAGES_SETTING_KEY, str(value))
+
+    def _on_svgz_compression_changed(self, value: int):
+        add_update_setting_value(SVGZ_COMPRESSION_SETTING_KEY, str(value))
+
+    def _on_editor_payload_changed(self, index: int):
+        value = self.editor_payload_combo.currentData()
+        if value:
+            add_update_setting_value(EDITOR_PAYLOAD_SETTING_KEY, value)
+
     def _on_date_format_changed(self, index: int):
         fmt = self.date_format_combo.currentData()
         if fmt:
@@ -107,6 +107,62 @@ def check_path_writable(path: Path) -> bool:
         ) from err
 
 
+def peak_memory_usage() -> int | None:
+    """Returns the peak resident memory of the process in bytes, None when unavailable
+
+    The peak only grows, so the difference across a task is how far that task raised it.
+    """
+    try:
+        if sys.platform == "win32":
+            return _windows_peak_working_set()
+
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS reports bytes, Linux reports kilobytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError, AttributeError) as e:
+        _logger.debug(f"Unable to read peak memory usage: {e}")
+        return None
+
+
+def _windows_peak_working_set() -> int | None:
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    kernel32 = ctypes.WinDLL("kernel32")
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    get_memory_info = kernel32.K32GetProcessMemoryInfo
+    get_memory_info.argtypes = [
+        wintypes.HANDLE,
+        ctypes.POINTER(ProcessMemoryCounters),
+        wintypes.DWORD,
+    ]
+    get_memory_info.restype = wintypes.BOOL
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    if not get_memory_info(
+        kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+    ):
+        return None
+    return counters.PeakWorkingSetSize
+
+
 def install_root() -> str:
     """Returns the current root directory of the package i.e. installation location
 
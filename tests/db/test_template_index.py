@@ -0,0 +1,102 @@
+"""Tests for the template index DB layer and load_template."""
+
+import os
+import shutil
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from joystick_diagrams.db import db_template_index, template_index_service
+from joystick_diagrams.db.template_index_service import load_template
+from joystick_diagrams.template import Template
+
+TEMPLATE = Path("tests/data/template_test.svg")
+
+
+@pytest.fixture(autouse=True)
+def mock_connection():
+    conn = sqlite3.connect(":memory:")
+    with patch("joystick_diagrams.db.db_template_index.connection", return_value=conn):
+        db_template_index.create_new_db_if_not_exist()
+        yield conn
+    conn.close()
+
+
+@pytest.fixture
+def template_path(tmp_path):
+    path = tmp_path / "template.svg"
+    shutil.copy(TEMPLATE, path)
+    return path
+
+
+def scan_spy():
+    return patch.object(Template, "_scan", autospec=True, side_effect=Template._scan)
+
+
+def test_first_load_indexes_template(template_path):
+    template = load_template(template_path)
+
+    entry = db_template_index.get_template_entry(str(template_path.resolve()))
+    assert entry is not None
+    assert entry[0] == template_path.stat().st_size
+    assert template.get_template_buttons() == Template(TEMPLATE).get_template_buttons()
+
+
+def test_unchanged_template_is_not_opened(template_path):
+    expected = load_template(template_path).summary
+
+    with patch.object(Path, "open", side_effect=AssertionError("template was opened")):
+        template = load_template(template_path)
+
+        assert template.summary == expected
+        assert template.button_count == len(expected.buttons)
+        assert template.template_name == expected.template_name
+        assert template.dimensions == (expected.width, expected.height)
+
+
+def test_touched_template_reuses_summary(template_path):
+    expected = load_template(template_path).summary
+    stat = template_path.stat()
+    os.utime(template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    with scan_spy() as scan:
+        assert load_template(template_path).summary == expected
+
+    assert not scan.called
+
+    entry = db_template_index.get_template_entry(str(template_path.resolve()))
+    assert entry[1] == stat.st_mtime_ns + 10**9
+
+
+def test_changed_template_is_rescanned(template_path):
+    load_template(template_path)
+    template_path.write_text(
+        template_path.read_text(encoding="utf-8").replace("BUTTON_10", "BUTTON_99"),
+        encoding="utf-8",
+    )
+
+    template = load_template(template_path)
+
+    assert "button_99" in template.get_template_buttons()
+    assert "button_10" not in template.get_template_buttons()
+
+
+def test_outdated_index_version_is_rescanned(template_path):
+    load_template(template_path)
+
+    with patch.object(template_index_service, "INDEX_VERSION", 2), scan_spy() as scan:
+        load_template(template_path)
+
+    assert scan.called
+
+
+def test_unavailable_index_falls_back_to_scanning(template_path):
+    with patch(
+        "joystick_diagrams.db.db_template_index.connection",
+        side_effect=sqlite3.OperationalError("unable to open database file"),
+    ):
+        template = load_template(template_path)
+
+    assert template.get_template_buttons() == Template(TEMPLATE).get_template_buttons()
@@ -1,4 +1,8 @@
+import shutil
+import tempfile
 import unittest
+from pathlib import Path
+from unittest.mock import patch
 
 import joystick_diagrams.plugins.dcs_world_plugin.dcs_world as dcs
 from joystick_diagrams.input.axis import Axis
@@ -57,6 +61,146 @@ class TestDCSParseTest(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertEqual(result["keyDiffs"]["1"]["name"], "a\\b")
 
+    def test_extract_device_bindings(self):
+        config = {
+            "keyDiffs": {
+                "d1": {
+                    "name": "Fire",
+                    "added": {1: {"key": "JOY_BTN1"}},
+                },
+                "d2": {
+                    "name": "Fire Modified",
+                    "added": {
+                        1: {"key": "JOY_BTN1", "reformers": {1: "JOY_BTN2"}},
+                    },
+                },
+                "d3": {"name": "Removed only", "removed": {1: {"key": "JOY_BTN3"}}},
+            },
+            "axisDiffs": {"a1": {"name": "Pitch", "added": {1: {"key": "JOY_Y"}}}},
+        }
+
+        self.assertEqual(
+            dcs.extract_device_bindings(config),
+            [
+                ("JOY_BTN1", (), "Fire"),
+                ("JOY_BTN1", ("JOY_BTN2",), "Fire Modified"),
+                ("JOY_Y", (), "Pitch"),
+            ],
+        )
+
+    def test_crlf_device_file_parses_without_errors(self):
+        source = Path("./tests/data/dcs_world/valid_dcs_world_directory/Config/Input")
+        data = next((source / "CoolPlane-A" / "joystick").iterdir()).read_bytes()
+        crlf = data.replace(b"\r\n", b"\n").replace(b"\n", b"\r\n")
+
+        with self.assertNoLogs(dcs._logger, level="ERROR"):
+            bindings = dcs.parse_device_bindings(crlf)
+
+        self.assertEqual(bindings, dcs.parse_device_bindings(data))
+        self.assertTrue(bindings)
+
+    def test_parallel_parse_matches_sequential(self):
+        sequential = self.dcs_instance.process_profiles()
+
+        parallel_instance = dcs.DCSWorldParser(
+            "./tests/data/dcs_world/valid_dcs_world_directory", parse_workers=2
+        )
+        parallel = parallel_instance.process_profiles()
+
+        self.assertEqual(list(sequential.profiles), list(parallel.profiles))
+        for name, profile in sequential.profiles.items():
+            parallel_profile = parallel.profiles[name]
+            self.assertEqual(list(profile.devices), list(parallel_profile.devices))
+            for guid, device in profile.devices.items():
+                self.assertEqual(
+                    {k: str(v) for k, v in device.get_combined_inputs().items()},
+                    {
+                        k: str(v)
+                        for k, v in parallel_profile.devices[guid]
+                        .get_combined_inputs()
+                        .items()
+                    },
+                )
+
+    def test_identical_device_files_parsed_once(self):
+        source = Path("./tests/data/dcs_world/valid_dcs_world_directory/Config/Input")
+        device_file = next((source / "CoolPlane-A" / "joystick").iterdir())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            input_dir = Path(tmp, "Config", "Input")
+            for profile in ["Variant-1", "Variant-2", "Variant-3"]:
+                joystick_dir = input_dir / profile / "joystick"
+                joystick_dir.mkdir(parents=True)
+                shutil.copy(device_file, joystick_dir / device_file.name)
+
+            parser = dcs.DCSWorldParser(tmp)
+
+            with patch.object(
+                dcs, "parse_device_bindings", wraps=dcs.parse_device_bindings
+            ) as parse:
+                collection = parser.process_profiles()
+                self.assertEqual(parse.call_count, 1)
+
+                # Unchanged files are reused on subsequent runs
+                parser.process_profiles()
+                self.assertEqual(parse.call_count, 1)
+
+            inputs = [
+                {
+                    k: str(v)
+                    for k, v in next(iter(profile.devices.values()))
+                    .get_combined_inputs()
+                    .items()
+                }
+                for profile in collection.profiles.values()
+            ]
+            self.assertEqual(len(inputs), 3)
+            self.assertTrue(inputs[0])
+            self.assertTrue(all(x == inputs[0] for x in inputs))
+
+    def test_discovery_cached_for_first_run(self):
+        self.assertEqual(
+            sorted(self.dcs_instance.profile_device_files),
+            ["CoolPlane-A", "CoolPlane-B", "CoolPlane-E_easy"],
+        )
+        self.assertEqual(len(self.dcs_instance.profile_device_files["CoolPlane-B"]), 2)
+
+        with patch.object(
+            dcs, "scan_device_files", wraps=dcs.scan_device_files
+        ) as scan:
+            self.dcs_instance.process_profiles()
+            self.assertEqual(scan.call_count, 0)
+
+            # Later runs rescan so newly added files are picked up
+            self.dcs_instance.process_profiles()
+            self.assertEqual(scan.call_count, 3)
+
+    def test_device_file_stats_cover_parsed_files_only(self):
+        source = Path("./tests/data/dcs_world/valid_dcs_world_directory")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            shutil.copytree(source, tmp, dirs_exist_ok=True)
+            Path(tmp, "Logs").mkdir()
+            Path(tmp, "Logs", "dcs.log").write_text("log")
+
+            parser = dcs.DCSWorldParser(tmp)
+            stats = parser.device_file_stats()
+
+            self.assertEqual(
+                sorted(Path(path).parent.parent.name for path, _, _ in stats),
+                ["CoolPlane-A", "CoolPlane-B", "CoolPlane-B"],
+            )
+
+            # Writes elsewhere in the Saved Games folder are not sources
+            Path(tmp, "Logs", "dcs.log").write_text("more log")
+            Path(tmp, "Config", "options.lua").write_text("options")
+            self.assertEqual(parser.device_file_stats(), stats)
+
+            joystick_dir = Path(tmp, "Config", "Input", "CoolPlane-C", "joystick")
+            joystick_dir.mkdir(parents=True)
+            (joystick_dir / "x.diff.lua").write_text("local diff = {} return diff")
+            self.assertEqual(len(parser.device_file_stats()), 4)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,87 @@
+import pytest
+
+from joystick_diagrams.plugins.fs2020_plugin.ms_flight_simulator import (
+    FS2020Parser,
+    default_profile_name,
+)
+
+DEVICE_GUID = "{3833AD30-98C7-11F0-8001-444553540000}"
+
+
+def profile_xml(friendly_name: str, actions: str) -> str:
+    return f"""<?xml version="1.0" encoding="UTF-8" standalone="no" ?>
+<Version Num="1660"/>
+<FriendlyName>{friendly_name}</FriendlyName>
+<Device DeviceName="Joystick - HOTAS Warthog" GUID="{DEVICE_GUID}" ProductID="1026" CompositeID="0" PID="1026" VID="1103">
+    <Context ContextName="PLANE">
+{actions}
+    </Context>
+</Device>
+"""
+
+
+def action(name: str, *keys: str) -> str:
+    key_xml = "".join(f'<KEY Information="{key}">1</KEY>' for key in keys)
+    return f'        <Action ActionName="{name}" Flag="2"><Primary>{key_xml}</Primary></Action>'
+
+
+@pytest.fixture
+def game_dir(tmp_path):
+    first = tmp_path / "Device A"
+    second = tmp_path / "Device B"
+    first.mkdir()
+    second.mkdir()
+
+    (first / "inputprofile_a.xml").write_text(
+        profile_xml(
+            "Profile A",
+            "\n".join(
+                [
+                    action("KEY_TOGGLE_MASTER_BATTERY", "Joystick Button 1"),
+                    action("KEY_GEAR_TOGGLE", "Joystick Button 2", "Joystick Button 3"),
+                    action("KEY_VIEW_MODE", "Joystick Pov Up"),
+                    action("AXIS_ELEVATOR_SET", "Joystick L-Axis Y"),
+                ]
+            ),
+        ),
+        encoding="utf-8",
+    )
+    (second / "inputprofile_b.xml").write_text(
+        profile_xml(
+            "Profile B",
+            action("KEY_PARKING_BRAKES", "Joystick Button 1"),
+        ),
+        encoding="utf-8",
+    )
+    (second / "notes.txt").write_text("not a profile", encoding="utf-8")
+
+    return tmp_path
+
+
+def test_parser_reads_header_skipped_profiles(game_dir):
+    collection = FS2020Parser(game_dir).run()
+
+    profile = collection.get_profile(default_profile_name)
+    assert profile is not None
+    assert len(profile.devices) == 1
+
+    device = next(iter(profile.devices.values()))
+    assert device.name == "Joystick - HOTAS Warthog"
+
+    assert device.get_input("hats", "POV_1_U").command == "View Mode"
+    assert device.get_input("axis", "AXIS_Y").command == "Elevator Set"
+
+    gear = device.get_input("buttons", "BUTTON_2")
+    assert gear.command == ""
+    assert gear.modifiers[0].modifiers == {"BUTTON_3"}
+    assert gear.modifiers[0].command == "Gear Toggle"
+
+
+def test_parser_merges_files_deterministically(game_dir):
+    results = set()
+    for _ in range(5):
+        profile = FS2020Parser(game_dir).run().get_profile(default_profile_name)
+        device = next(iter(profile.devices.values()))
+        results.add(device.get_input("buttons", "BUTTON_1").command)
+
+    assert results == {"Toggle Master Battery | Parking Brakes"}
@@ -393,6 +393,41 @@ invalid_line_without_pipes
         # Verify French characters are preserved (may not always be present depending on test data)
         assert any("é" in line or "à" in line or "ç" in line for line in lines) or True
 
+    def test_csv_export_reuses_parsed_bindings(self, parser, tmp_path):
+        """Test CSV export does not reparse files already parsed by process_profiles"""
+        parser.process_profiles()
+
+        csv_file = tmp_path / "test_export.csv"
+        with patch.object(parser, "_parse_files") as parse_files:
+            assert parser.export_mapping_to_file(csv_file) is True
+            parse_files.assert_not_called()
+
+        rows = csv_file.read_text(encoding="utf-8").strip().split("\n")
+        assert len(rows) == len(parser.bindings) + 1
+
+    def test_binding_index(self, parser, sample_global_actions_content):
+        """Test bindings are indexed by (device_id, control type, control id)"""
+        with patch("builtins.open", mock_open(read_data=sample_global_actions_content)):
+            parser._parse_global_actions_file()
+
+        assert parser.binding_index[("3", "button", 42)][0]["action"] == "screenshot"
+        assert parser.binding_index[("9", "axis", "Y")][0]["action"] == "rpc_pitch"
+        assert len(parser.binding_index[("9", "hat", "POV_1_U")]) == 2
+        assert sum(len(b) for b in parser.device_bindings.values()) == len(
+            parser.bindings
+        )
+
+        assert parser._find_il2_reference_for_input(Button(42), "") == "joy3_b41"
+        assert (
+            parser._find_il2_reference_for_input(Axis(AxisDirection.Y), "")
+            == "joy9_axis_y"
+        )
+        assert (
+            parser._find_il2_reference_for_input(Hat(1, HatDirection.D), "")
+            == "joy9_pov0_180"
+        )
+        assert parser._find_il2_reference_for_input(Button(999), "") == "Unknown"
+
     def test_generate_real_control_identifier(self, parser):
         """Test generation of real control identifiers"""
         # Button binding
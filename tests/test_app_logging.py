@@ -0,0 +1,83 @@
+"""Tests for logging through a queue to the application log."""
+
+import logging
+import queue
+from logging.handlers import RotatingFileHandler
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from joystick_diagrams import app_logging
+from joystick_diagrams.app_logging import BoundedQueueHandler
+
+
+@pytest.fixture
+def root_logger():
+    root = logging.getLogger()
+    level, handlers = root.level, list(root.handlers)
+    yield root
+    for handler in list(root.handlers):
+        if handler not in handlers:
+            root.removeHandler(handler)
+    root.setLevel(level)
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 0, message, None, None)
+
+
+def test_records_are_written_by_the_listener(root_logger, tmp_path):
+    listener = app_logging.configure(tmp_path)
+    try:
+        logging.getLogger("joystick_diagrams.test").info("Queued message")
+        logging.getLogger("joystick_diagrams.test").debug("Hidden message")
+    finally:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+    log = (tmp_path / app_logging.LOG_FILE_NAME).read_text()
+    assert "INFO - Queued message" in log
+    assert "Hidden message" not in log
+
+
+def test_worker_process_writes_to_the_console_only(root_logger, tmp_path):
+    with patch("multiprocessing.parent_process", return_value=MagicMock()):
+        assert app_logging.configure(tmp_path) is None
+
+    handlers = root_logger.handlers
+    assert not [h for h in handlers if isinstance(h, RotatingFileHandler)]
+    assert not [h for h in handlers if isinstance(h, BoundedQueueHandler)]
+    assert [h for h in handlers if type(h) is logging.StreamHandler]
+    assert not (tmp_path / app_logging.LOG_FILE_NAME).exists()
+
+
+def test_forked_worker_replaces_the_queue_with_the_console(root_logger):
+    queue_handler = BoundedQueueHandler(queue.Queue())
+    stream_handler = logging.StreamHandler()
+    root_logger.addHandler(queue_handler)
+
+    app_logging._log_directly(root_logger, queue_handler, stream_handler)
+
+    assert queue_handler not in root_logger.handlers
+    assert stream_handler in root_logger.handlers
+
+
+def test_stalled_queue_drops_records_and_reports_them(monkeypatch):
+    monkeypatch.setattr(app_logging, "FULL_QUEUE_TIMEOUT", 0.01)
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue)
+
+    for message in ("one", "two", "three", "four"):
+        handler.emit(_record(message))
+
+    assert handler.dropped == 2
+    assert [log_queue.get_nowait().getMessage() for _ in range(2)] == ["one", "two"]
+
+    handler.emit(_record("five"))
+
+    assert handler.dropped == 0
+    assert [log_queue.get_nowait().getMessage() for _ in range(2)] == [
+        "2 log records were dropped as the log queue was full",
+        "five",
+    ]
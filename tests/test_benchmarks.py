@@ -0,0 +1,97 @@
+"""Tests for the benchmark fixtures and result comparison."""
+
+import json
+
+from benchmarks import fixtures
+from benchmarks.__main__ import compare_results, main
+from joystick_diagrams.plugins.dcs_world_plugin.dcs_world import DCSWorldParser
+from joystick_diagrams.plugins.il2_sturmovik_plugin.il2_parser import IL2Parser
+from joystick_diagrams.plugins.joystick_gremlin_plugin.joystick_gremlin import (
+    JoystickGremlinParser,
+)
+from joystick_diagrams.plugins.star_citizen_plugin.star_citizen import StarCitizen
+
+
+def _input_count(collection) -> int:
+    return sum(
+        len(device.get_combined_inputs())
+        for profile in collection.profiles.values()
+        for device in profile.devices.values()
+    )
+
+
+def test_dcs_fixture_parses(tmp_path):
+    path = fixtures.write_dcs_install(
+        tmp_path, profiles=3, devices_per_profile=2, bindings_per_device=10
+    )
+
+    collection = DCSWorldParser(path).process_profiles()
+
+    assert len(collection.profiles) == 3
+    assert all(len(p.devices) == 2 for p in collection.profiles.values())
+    assert _input_count(collection) > 0
+
+
+def test_star_citizen_fixture_parses(tmp_path):
+    path = fixtures.write_star_citizen_actionmaps(
+        tmp_path / "actionmaps.xml", actions=200, devices=2
+    )
+
+    collection = StarCitizen(path).parse()
+
+    assert collection.profiles
+    assert _input_count(collection) > 0
+
+
+def test_gremlin_fixture_resolves_inheritance(tmp_path):
+    path = fixtures.write_gremlin_profile(
+        tmp_path / "profile.xml", modes=3, devices=1, buttons_per_mode=16
+    )
+
+    collection = JoystickGremlinParser(path).create_dictionary()
+
+    assert len(collection.profiles) == 3
+    last_mode = collection.get_profile("mode 2")
+    device = next(iter(last_mode.devices.values()))
+    # Every button is bound in the first mode, and inherited by the modes below it
+    assert len(device.inputs["buttons"]) == 16
+
+
+def test_il2_fixture_parses(tmp_path):
+    path = fixtures.write_il2_config(tmp_path, devices=2, bindings=50)
+
+    collection = IL2Parser(path).process_profiles()
+
+    assert _input_count(collection) > 0
+
+
+def test_fixtures_are_deterministic(tmp_path):
+    first = fixtures.write_star_citizen_actionmaps(tmp_path / "a.xml", actions=50)
+    second = fixtures.write_star_citizen_actionmaps(tmp_path / "b.xml", actions=50)
+
+    assert first.read_bytes() == second.read_bytes()
+
+
+def _results(**medians):
+    return {
+        "benchmarks": {name: {"median": median} for name, median in medians.items()}
+    }
+
+
+def test_compare_flags_regressions_over_threshold():
+    baseline = _results(parse=1.0, merge=1.0, export=1.0)
+    results = _results(parse=1.1, merge=1.5, export=0.5, new=1.0)
+
+    assert compare_results(baseline, results, threshold=0.15) == ["merge"]
+
+
+def test_compare_command_exit_status(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    results = tmp_path / "results.json"
+    baseline.write_text(json.dumps(_results(parse=1.0)))
+
+    results.write_text(json.dumps(_results(parse=1.05)))
+    assert main(["compare", str(baseline), str(results)]) == 0
+
+    results.write_text(json.dumps(_results(parse=2.0)))
+    assert main(["compare", str(baseline), str(results)]) == 1
@@ -1,4 +1,6 @@
-from dataclasses import dataclass
+import gzip
+import os
+from dataclasses import dataclass, field
 from datetime import datetime
 
 import pytest
@@ -6,75 +8,105 @@ import pytest
 from joystick_diagrams.export import (
     TEMPLATE_DATING_KEY,
     TEMPLATE_NAMING_KEY,
+    EditorPayloadMode,
+    export_device_to_templates,
     populate_template,
-    replace_input_modifier_id_key,
-    replace_input_modifiers_string,
-    replace_input_string,
-    replace_template_date_string,
-    replace_template_name_string,
-    replace_unused_keys,
+    populate_template_chunks,
     sanitize_string_for_svg,
 )
-from joystick_diagrams.input.axis import Axis, AxisDirection
+from joystick_diagrams.export_image import RenderJob
+from joystick_diagrams.input.axis import Axis, AxisDirection, AxisSlider
 from joystick_diagrams.input.button import Button
 from joystick_diagrams.input.device import Device_
 from joystick_diagrams.input.hat import Hat, HatDirection
 from joystick_diagrams.input.modifier import Modifier
+from joystick_diagrams.template import Template
 
 # Unit Tests
 
+DEVICE_ID = "666ec0a0-556b-11ee-8002-444553540000"
+TEST_STRING = '<testData>STRING="ABC">{}<testData>'
+
+CONTROLS = {
+    "BUTTON_1": Button(1),
+    "BUTTON_5": Button(5),
+    "AXIS_X": Axis(AxisDirection.X),
+    "AXIS_SLIDER_1": AxisSlider(1),
+    "POV_1_U": Hat(1, HatDirection.U),
+    "POV_1_UR": Hat(1, HatDirection.UR),
+}
+
+
+# Quick dirty objects to meet the tests, rather than creating a fully valid ExportDevice
+@dataclass
+class MockTemplate:
+    raw_data: object
+    requires_web_engine: bool = True
+
+
+@dataclass
+class MockWrapper:
+    profile_name: str
+
+
+@dataclass
+class MockExportDevice:
+    template: MockTemplate
+    profile_wrapper: MockWrapper
+    device_id: str = DEVICE_ID
+    device: Device_ = field(default_factory=lambda: Device_(DEVICE_ID, "Test Device"))
+
+
+def _populate(
+    control_keys: str, device: Device_ | None = None, profile_name: str = "profile_1"
+) -> str:
+    export_device = MockExportDevice(
+        MockTemplate(TEST_STRING.format(control_keys)), MockWrapper(profile_name)
+    )
+    if device is not None:
+        export_device.device = device
+    return populate_template(export_device)
+
 
 def test_replacement_of_name_string():
-    test_string = '<testData>STRING="ABC">{}<testData>'
-    test_data = test_string.format(TEMPLATE_NAMING_KEY)
     replacement = "Profile 123 - Name"
 
-    rep = replace_template_name_string(replacement, test_data)
+    rep = _populate(TEMPLATE_NAMING_KEY, profile_name=replacement)
 
-    assert rep == test_string.format(replacement)
+    assert rep == TEST_STRING.format(replacement)
 
 
 def test_replacement_of_date_string():
-    test_string = '<testData>STRING="ABC">{}<testData>'
-    test_data = test_string.format(TEMPLATE_DATING_KEY)
-
-    rep = replace_template_date_string(test_data)
+    rep = _populate(TEMPLATE_DATING_KEY)
 
-    assert rep == test_string.format(datetime.now().strftime("%d/%m/%Y"))
+    assert rep == TEST_STRING.format(datetime.now().strftime("%d/%m/%Y"))
 
 
 def test_unused_keys_cleanup_buttons():
-    test_string = '<testData>STRING="ABC">{}<testData>'
     controls = ["BUTTON_1", "BUTTON_4", "BUTTON_120"]
-    test_data = test_string.format("|".join(controls))
 
-    rep = replace_unused_keys(test_data)
+    rep = _populate("|".join(controls))
 
-    assert rep == test_string.format("|" * (len(controls) - 1))
+    assert rep == TEST_STRING.format("|" * (len(controls) - 1))
 
 
 def test_unused_keys_cleanup_axis():
-    test_string = '<testData>STRING="ABC">{}<testData>'
     controls = ["AXIS_X", "AXIS_Y", "AXIS_RZ", "AXIS_SLIDER_1"]
-    test_data = test_string.format("|".join(controls))
 
-    rep = replace_unused_keys(test_data)
+    rep = _populate("|".join(controls))
 
-    assert rep == test_string.format("|" * (len(controls) - 1))
+    assert rep == TEST_STRING.format("|" * (len(controls) - 1))
 
 
 def test_unused_keys_cleanup_hats():
-    test_string = '<testData>STRING="ABC">{}<testData>'
     controls = ["POV_1_U", "POV_1_UR", "POV_4_DR"]
-    test_data = test_string.format("|".join(controls))
 
-    rep = replace_unused_keys(test_data)
+    rep = _populate("|".join(controls))
 
-    assert rep == test_string.format("|" * (len(controls) - 1))
+    assert rep == TEST_STRING.format("|" * (len(controls) - 1))
 
 
 def test_unused_keys_cleanup_modifiers():
-    test_string = '<testData>STRING="ABC">{}<testData>'
     controls = [
         # Buttons
         "BUTTON_1_MODIFIERS",
@@ -97,15 +129,13 @@ def test_unused_keys_cleanup_modifiers():
         "POV_1_UR_MODIFIER_1_KEY",
         "POV_1_UR_MODIFIER_1_COMMAND",
     ]
-    test_data = test_string.format(" | ".join(controls))
 
-    rep = replace_unused_keys(test_data)
+    rep = _populate(" | ".join(controls))
 
-    assert rep == test_string.format(" | " * (len(controls) - 1))
+    assert rep == TEST_STRING.format(" | " * (len(controls) - 1))
 
 
 def test_replace_basic_key_input_string():
-    test_string = '<testData>STRING="ABC">{}<testData>'
     controls = [
         ("BUTTON_1", "One"),
         ("AXIS_X", "Two"),
@@ -116,9 +146,35 @@ def test_replace_basic_key_input_string():
     # TODO add scenarios for sanitised values
 
     for control, string in controls:
-        test_data = test_string.format(control)
-        rep = replace_input_string(control, string, test_data)
-        assert rep == test_string.format(string)
+        device = Device_(DEVICE_ID, "Test Device")
+        device.create_input(CONTROLS[control], string)
+
+        rep = _populate(control, device)
+
+        assert rep == TEST_STRING.format(string)
+
+
+def _assert_modifier_keys(control: str, mod_id: int, modifier: Modifier) -> None:
+    device = Device_(DEVICE_ID, "Test Device")
+    device.create_input(CONTROLS[control], "Action")
+    # Modifiers are numbered in the order they were added to the input
+    for filler in range(1, mod_id):
+        device.add_modifier_to_input(CONTROLS[control], {f"filler{filler}"}, "Filler")
+    device.add_modifier_to_input(
+        CONTROLS[control], modifier.modifiers, modifier.command
+    )
+
+    test_case = [
+        (f"{control}_modifier_{mod_id}", str(modifier)),
+        (f"{control}_modifier_{mod_id}_key", "+".join(modifier.modifiers)),
+        (f"{control}_modifier_{mod_id}_action", f"{modifier.command}"),
+    ]
+
+    for case, expected in test_case:
+        rep = _populate(case, device)
+        assert rep == TEST_STRING.format(expected)
+        # Verify no Python set notation in output
+        assert "{'" not in rep, f"Python set notation found in output: {rep}"
 
 
 def test_replace_specific_modifier_identifier():
@@ -131,20 +187,7 @@ def test_replace_specific_modifier_identifier():
     ]
 
     for control, mod_id, modifier in controls:
-        test_case = [
-            (
-                f"{control}_modifier_{mod_id}",
-                str(modifier),
-            ),
-            (f"{control}_modifier_{mod_id}_key", "+".join(modifier.modifiers)),
-            (f"{control}_modifier_{mod_id}_action", f"{modifier.command}"),
-        ]
-
-        for case, expected in test_case:
-            test_string = f'<testData>STRING="ABC">{case}<testData>'
-            expected_string = f'<testData>STRING="ABC">{expected}<testData>'
-            rep = replace_input_modifier_id_key(control, mod_id, modifier, test_string)
-            assert rep == expected_string
+        _assert_modifier_keys(control, mod_id, modifier)
 
 
 def test_replace_specific_modifier_identifier_joystick_button():
@@ -155,59 +198,23 @@ def test_replace_specific_modifier_identifier_joystick_button():
     ]
 
     for control, mod_id, modifier in controls:
-        test_case = [
-            (
-                f"{control}_modifier_{mod_id}",
-                str(modifier),
-            ),
-            (f"{control}_modifier_{mod_id}_key", "+".join(modifier.modifiers)),
-            (f"{control}_modifier_{mod_id}_action", f"{modifier.command}"),
-        ]
-
-        for case, expected in test_case:
-            test_string = f'<testData>STRING="ABC">{case}<testData>'
-            expected_string = f'<testData>STRING="ABC">{expected}<testData>'
-            rep = replace_input_modifier_id_key(control, mod_id, modifier, test_string)
-            assert rep == expected_string
-            # Verify no Python set notation in output
-            assert "{'" not in rep, f"Python set notation found in output: {rep}"
+        _assert_modifier_keys(control, mod_id, modifier)
 
 
 def test_replace_input_all_modifiers():
-    controls = [
-        (
-            "BUTTON_1",
-            [Modifier({"ctrl"}, "Modifier 1"), Modifier({"alt"}, "Modifier 2")],
-        ),
-        ("AXIS_X", [Modifier({"ctrl"}, "Modifier 1"), Modifier({"alt"}, "Modifier 2")]),
-        (
-            "AXIS_SLIDER_1",
-            [Modifier({"ctrl"}, "Modifier 1"), Modifier({"alt"}, "Modifier 2")],
-        ),
-        (
-            "POV_1_U",
-            [Modifier({"ctrl"}, "Modifier 1"), Modifier({"alt"}, "Modifier 2")],
-        ),
-        (
-            "POV_1_UR",
-            [Modifier({"ctrl"}, "Modifier 1"), Modifier({"alt"}, "Modifier 2")],
-        ),
-    ]
+    modifiers = [Modifier({"ctrl"}, "Modifier 1"), Modifier({"alt"}, "Modifier 2")]
 
-    for control, modifiers in controls:
-        test_string = f'<testData>STRING="ABC">{control}_Modifiers<testData>'
-        rep = replace_input_modifiers_string(control, modifiers, test_string)
+    for control in ["BUTTON_1", "AXIS_X", "AXIS_SLIDER_1", "POV_1_U", "POV_1_UR"]:
+        device = Device_(DEVICE_ID, "Test Device")
+        device.create_input(CONTROLS[control], "Action")
+        for modifier in modifiers:
+            device.add_modifier_to_input(
+                CONTROLS[control], modifier.modifiers, modifier.command
+            )
 
-        def build_string(modifiers: list[Modifier]):
-            mod_string = ""
-            for idx, mod in enumerate(modifiers, 1):
-                mod_string = mod_string + f"{str(mod)}"
-                if idx != len(modifiers):
-                    mod_string = mod_string + " | "
-            return mod_string
+        rep = _populate(f"{control}_Modifiers", device)
 
-        expected_string = f'<testData>STRING="ABC">{build_string(modifiers)}<testData>'
-        assert rep == expected_string
+        assert rep == TEST_STRING.format(" | ".join(str(mod) for mod in modifiers))
 
 
 def test_svg_sanitization():
@@ -249,21 +256,6 @@ def test_svg_sanitization():
 
 @pytest.fixture()
 def mock_export_device():
-    # Quick dirty object to meet the test, rather than creating a fully valid ExportDevice
-
-    @dataclass
-    class MockExportDevice:
-        template: "MockTemplate"
-        profile_wrapper: "MockWrapper"
-
-    @dataclass
-    class MockTemplate:
-        raw_data: object
-
-    @dataclass
-    class MockWrapper:
-        profile_name: str
-
     obj = MockExportDevice(
         MockTemplate(
             "BUTTON_1 | BUTTON_2 | BUTTON_3 | AXIS_X | POV_1_D | POV_1_U | BUTTON_1_Modifiers"
@@ -271,8 +263,6 @@ def mock_export_device():
         MockWrapper("profile_1"),
     )
 
-    dev = Device_("666ec0a0-556b-11ee-8002-444553540000", "Test Device")
-
     inputs = [
         (Button(1), "Button Action 1"),
         (Button(2), "Button Action 2"),
@@ -280,11 +270,9 @@ def mock_export_device():
         (Hat(1, HatDirection.D), "Hat Control Action 1"),
     ]
     for control, command in inputs:
-        dev.create_input(control, command)
-
-    dev.add_modifier_to_input(Button(1), {"ctrl"}, "Modifier 1")
+        obj.device.create_input(control, command)
 
-    obj.device = dev
+    obj.device.add_modifier_to_input(Button(1), {"ctrl"}, "Modifier 1")
 
     return obj
 
@@ -296,3 +284,87 @@ def test_template_populate(mock_export_device):
         modified_template
         == "Button Action 1 | Button Action 2 |  | AXIS Control 1 | Hat Control Action 1 |  | Modifier 1 - ctrl"
     )
+
+
+def test_png_export_is_held_in_memory(mock_export_device, tmp_path):
+    mock_export_device.template.raw_data = (
+        '<svg width="320px" height="240px">BUTTON_1</svg>'
+    )
+
+    result = export_device_to_templates(mock_export_device, tmp_path, "PNG")
+
+    assert isinstance(result, RenderJob)
+    assert result.svg_data == b'<svg width="320px" height="240px">Button Action 1</svg>'
+    assert (result.width, result.height) == (320, 240)
+    assert result.png_path == tmp_path / "666ec-Test Device-profile_1.png"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_svg_export_is_written(mock_export_device, tmp_path):
+    svg_path, png_path = export_device_to_templates(mock_export_device, tmp_path)
+
+    assert png_path is None
+    assert svg_path == str(tmp_path / "666ec-Test Device-profile_1.svg")
+    assert (tmp_path / "666ec-Test Device-profile_1.svg").exists()
+
+
+@pytest.mark.parametrize(
+    "mode, payload_kept, archived",
+    [
+        (EditorPayloadMode.KEEP, True, False),
+        (EditorPayloadMode.STRIP, False, False),
+        (EditorPayloadMode.ARCHIVE, False, True),
+    ],
+)
+def test_editor_payload_modes(
+    mock_export_device, tmp_path, mode, payload_kept, archived
+):
+    mock_export_device.template = Template("tests/data/template_test.svg")
+
+    svg_path, _ = export_device_to_templates(
+        mock_export_device, tmp_path, "SVG", editor_payload=mode
+    )
+
+    exported = open(svg_path, encoding="utf-8").read()
+    assert ("content=" in exported) is payload_kept
+    assert "Button Action 1" in exported
+
+    archive = tmp_path / "666ec-Test Device-profile_1.drawio"
+    assert archive.exists() is archived
+    if archived:
+        archived_data = archive.read_text(encoding="utf-8")
+        assert archived_data.startswith("<mxfile ")
+        # Archived from the template, keys are left unsubstituted
+        assert "Button Action 1" not in archived_data
+
+
+def test_svgz_export_is_compressed(mock_export_device, tmp_path):
+    mock_export_device.template = Template("tests/data/template_test.svg")
+
+    svgz_path, png_path = export_device_to_templates(
+        mock_export_device, tmp_path, "SVGZ"
+    )
+
+    assert png_path is None
+    assert svgz_path == str(tmp_path / "666ec-Test Device-profile_1.svgz")
+    with gzip.open(svgz_path, "rt", encoding="utf-8") as f:
+        exported = f.read()
+    assert "Button Action 1" in exported
+    assert os.path.getsize(svgz_path) < len(exported.encode("utf-8")) / 2
+
+
+def test_template_populate_chunks(mock_export_device):
+    chunks = list(populate_template_chunks(mock_export_device))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == populate_template(mock_export_device)
+
+
+def test_template_populate_keeps_keys_in_commands(mock_export_device):
+    mock_export_device.template.raw_data = "BUTTON_1 | BUTTON_2 | BUTTON_5"
+    mock_export_device.device.create_input(Button(2), "Toggle BUTTON_5 mode")
+
+    assert (
+        populate_template(mock_export_device)
+        == "Button Action 1 | Toggle BUTTON_5 mode | "
+    )
@@ -0,0 +1,60 @@
+from PySide6.QtGui import QColor, QImage
+
+from joystick_diagrams.export_image import (
+    RenderJob,
+    rasterize_svg,
+    rasterize_without_web_engine,
+    svg_requires_web_engine,
+)
+
+PLAIN_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="40px" height="20px">'
+    '<rect x="0" y="0" width="10" height="10" fill="#ff0000"/>'
+    "</svg>"
+)
+HTML_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="40px" height="20px">'
+    "<foreignObject><div>BUTTON_1</div></foreignObject>"
+    "</svg>"
+)
+
+
+def test_svg_requires_web_engine():
+    assert svg_requires_web_engine(HTML_SVG) is True
+    assert svg_requires_web_engine(PLAIN_SVG) is False
+
+
+def test_render_job_detects_web_engine(tmp_path):
+    assert RenderJob.from_svg(HTML_SVG, tmp_path / "a.png").requires_web_engine
+    assert not RenderJob.from_svg(PLAIN_SVG, tmp_path / "b.png").requires_web_engine
+
+
+def test_rasterize_svg(qapp, tmp_path):
+    job = RenderJob.from_svg(PLAIN_SVG, tmp_path / "plain.png")
+
+    assert rasterize_svg(job, scale=2) is True
+
+    image = QImage(str(job.png_path))
+    assert (image.width(), image.height()) == (80, 40)
+    assert image.pixelColor(2, 2) == QColor("#ff0000")
+    # Unpainted areas match the WebEngine white page background
+    assert image.pixelColor(60, 30) == QColor("#ffffff")
+
+
+def test_rasterize_invalid_svg(qapp, tmp_path):
+    job = RenderJob.from_svg("<svg", tmp_path / "broken.png", False)
+
+    assert rasterize_svg(job) is False
+    assert not job.png_path.exists()
+
+
+def test_rasterize_without_web_engine_leaves_html_jobs(qapp, tmp_path):
+    plain = RenderJob.from_svg(PLAIN_SVG, tmp_path / "plain.png")
+    html = RenderJob.from_svg(HTML_SVG, tmp_path / "html.png")
+    broken = RenderJob.from_svg("<svg", tmp_path / "broken.png", False)
+
+    remaining = rasterize_without_web_engine([plain, html, broken])
+
+    assert remaining == [html, broken]
+    assert plain.png_path.exists()
+    assert not html.png_path.exists()
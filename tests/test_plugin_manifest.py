@@ -0,0 +1,249 @@
+"""Tests for parser plugins loaded lazily from a plugin.json manifest."""
+
+import json
+import sys
+from functools import partial
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from joystick_diagrams.exceptions import PluginNotValidError
+from joystick_diagrams.plugins.plugin_installer import validate_plugin
+from joystick_diagrams.plugins.plugin_manager import (
+    PLUGIN_REL_PATH,
+    ParserPluginManager,
+    create_parser_plugin,
+    load_plugin,
+    load_user_parser_plugin,
+)
+from joystick_diagrams.plugins.plugin_manifest import (
+    LazyParserPlugin,
+    read_manifest,
+)
+
+MAIN = """\
+from pathlib import Path
+
+from joystick_diagrams.input.profile_collection import ProfileCollection
+from joystick_diagrams.plugins.plugin_interface import PluginInterface
+from joystick_diagrams.plugins.plugin_manifest import read_manifest
+
+from .settings import LabelSettings
+
+
+class ParserPlugin(PluginInterface):
+    plugin_meta = read_manifest(Path(__file__).parent)
+    plugin_settings_model = LabelSettings
+
+    def __init__(self):
+        super().__init__()
+        self.label = None
+
+    def process(self):
+        collection = ProfileCollection()
+        collection.create_profile(self.label)
+        return collection
+
+    def on_settings_loaded(self):
+        self.label = self.get_setting("label")
+
+    def update_setting(self, key, value):
+        super().update_setting(key, value)
+        self.on_settings_loaded()
+
+    def export_mappings(self, export_path):
+        return f"{self.label} to {export_path}"
+"""
+
+SETTINGS = """\
+from pydantic import Field
+
+from joystick_diagrams.plugins.plugin_settings import PluginSettings
+
+
+class LabelSettings(PluginSettings):
+    label: str = Field(default="Default", title="Label")
+"""
+
+MANIFEST = {
+    "name": "Lazy Plugin",
+    "version": "1.0.0",
+    "icon_path": "img/icon.ico",
+    "settings": "settings:LabelSettings",
+}
+
+
+@pytest.fixture(autouse=True)
+def plugin_data_root(tmp_path):
+    with patch(
+        "joystick_diagrams.plugins.plugin_interface.utils.plugin_data_root",
+        return_value=tmp_path / "data",
+    ):
+        yield
+
+
+@pytest.fixture
+def plugin_dir(tmp_path) -> Path:
+    # A distinct folder name per test, as user plugins are registered in sys.modules
+    plugin_dir = tmp_path / f"lazy_{tmp_path.name}"
+    plugin_dir.mkdir()
+    (plugin_dir / "__init__.py").write_text("")
+    (plugin_dir / "main.py").write_text(MAIN)
+    (plugin_dir / "settings.py").write_text(SETTINGS)
+    (plugin_dir / "plugin.json").write_text(json.dumps(MANIFEST))
+    return plugin_dir
+
+
+def _create(plugin_dir: Path) -> LazyParserPlugin:
+    plugin = create_parser_plugin(
+        plugin_dir, partial(load_user_parser_plugin, plugin_dir)
+    )
+    assert isinstance(plugin, LazyParserPlugin)
+    return plugin
+
+
+def _main_imported(plugin_dir: Path) -> bool:
+    return f"jd_user_parser_plugin_{plugin_dir.name}.main" in sys.modules
+
+
+def test_manifest_plugin_is_not_imported(plugin_dir):
+    plugin = _create(plugin_dir)
+
+    assert plugin.name == "Lazy Plugin"
+    assert plugin.version == "1.0.0"
+    assert plugin.icon == str(plugin_dir / "img/icon.ico")
+    assert plugin.get_setting("label") == "Default"
+    assert not plugin.loaded
+    assert not _main_imported(plugin_dir)
+
+
+def test_process_imports_the_plugin_with_current_settings(plugin_dir):
+    plugin = _create(plugin_dir)
+    plugin.update_setting("label", "Before Load")
+
+    collection = plugin.process()
+
+    assert plugin.loaded
+    assert _main_imported(plugin_dir)
+    assert list(collection.profiles) == ["before load"]
+
+    plugin.update_setting("label", "After Load")
+
+    assert list(plugin.process().profiles) == ["after load"]
+    assert plugin.get_setting("label") == "After Load"
+
+
+def test_declared_hooks_load_the_plugin(plugin_dir):
+    (plugin_dir / "plugin.json").write_text(
+        json.dumps({**MANIFEST, "hooks": ["export_mappings"]})
+    )
+    plugin = _create(plugin_dir)
+    plugin.update_setting("label", "Exported")
+
+    assert not hasattr(plugin, "missing_hook")
+    assert not plugin.loaded
+
+    assert hasattr(plugin, "export_mappings")
+    assert plugin.loaded
+    assert plugin.export_mappings("out") == "Exported to out"
+
+
+def test_undeclared_hooks_do_not_load_the_plugin(plugin_dir):
+    plugin = _create(plugin_dir)
+
+    assert not hasattr(plugin, "export_mappings")
+    assert not plugin.loaded
+
+
+def test_declared_hooks_must_exist(plugin_dir):
+    (plugin_dir / "plugin.json").write_text(
+        json.dumps({**MANIFEST, "hooks": ["missing_hook"]})
+    )
+
+    with pytest.raises(PluginNotValidError):
+        _create(plugin_dir).process()
+
+
+def test_settings_loaded_from_disk_reach_the_plugin(plugin_dir):
+    _create(plugin_dir).update_setting("label", "Saved")
+
+    plugin = _create(plugin_dir)
+    plugin.load_settings()
+
+    assert plugin.get_setting("label") == "Saved"
+    assert list(plugin.process().profiles) == ["saved"]
+
+
+def test_plugin_named_differently_to_its_manifest(plugin_dir):
+    plugin = _create(plugin_dir)
+    (plugin_dir / "plugin.json").write_text(json.dumps({**MANIFEST, "name": "Other"}))
+
+    with pytest.raises(PluginNotValidError):
+        plugin.process()
+
+
+def test_install_validation_checks_the_manifest(plugin_dir):
+    assert validate_plugin(plugin_dir, "parser") == (True, "Lazy Plugin")
+
+    with open(plugin_dir / "settings.py", "a", encoding="utf-8") as f:
+        f.write("\n\nclass OtherSettings(PluginSettings):\n    pass\n")
+    (plugin_dir / "plugin.json").write_text(
+        json.dumps({**MANIFEST, "settings": "settings:OtherSettings"})
+    )
+    valid, message = validate_plugin(plugin_dir, "parser")
+
+    assert not valid
+    assert "plugin.json" in message
+
+
+def test_invalid_manifest(plugin_dir):
+    (plugin_dir / "plugin.json").write_text(json.dumps({**MANIFEST, "settings": "x"}))
+
+    with pytest.raises(PluginNotValidError):
+        read_manifest(plugin_dir)
+
+    (plugin_dir / "plugin.json").write_text(
+        json.dumps({**MANIFEST, "settings": "settings:Missing"})
+    )
+
+    with pytest.raises(PluginNotValidError):
+        _create(plugin_dir)
+
+
+def test_plugin_without_manifest_is_imported(plugin_dir):
+    (plugin_dir / "main.py").write_text(
+        MAIN.replace(
+            "read_manifest(Path(__file__).parent)",
+            'PluginMeta(name="Eager", version="1", icon_path="x.ico")',
+        ).replace(
+            "from joystick_diagrams.plugins.plugin_manifest import read_manifest",
+            "from joystick_diagrams.plugins.plugin_settings import PluginMeta",
+        )
+    )
+    (plugin_dir / "plugin.json").unlink()
+
+    plugin = create_parser_plugin(
+        plugin_dir, partial(load_user_parser_plugin, plugin_dir)
+    )
+
+    assert not isinstance(plugin, LazyParserPlugin)
+    assert plugin.name == "Eager"
+
+
+def test_bundled_manifests_match_their_plugins():
+    with patch(
+        "joystick_diagrams.plugins.plugin_manager.find_user_parser_plugins",
+        return_value=[],
+    ):
+        manager = ParserPluginManager()
+    manager.load_discovered_plugins()
+
+    assert manager.loaded_plugins
+    for plugin in manager.loaded_plugins:
+        assert isinstance(plugin, LazyParserPlugin)
+        main = load_plugin(PLUGIN_REL_PATH, plugin.plugin_path.name)
+
+        assert main.ParserPlugin.plugin_meta == plugin.plugin_meta
+        assert main.ParserPlugin.plugin_settings_model is plugin.plugin_settings_model
+        assert Path(plugin.icon).is_file()
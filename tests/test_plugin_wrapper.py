@@ -0,0 +1,75 @@
+"""Tests for the run metrics recorded by PluginWrapper."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from joystick_diagrams.input.button import Button
+from joystick_diagrams.input.profile_collection import ProfileCollection
+from joystick_diagrams.plugin_wrapper import PluginWrapper, format_size
+
+DEVICE_GUID = "0200231d-0000-0000-0000-504944564944"
+
+
+def _collection() -> ProfileCollection:
+    collection = ProfileCollection()
+    for name in ("Profile A", "Profile B"):
+        device = collection.create_profile(name).add_device(DEVICE_GUID, "Stick")
+        device.create_input(Button(1), "Fire")
+        device.add_modifier_to_input(Button(1), {"lalt"}, "Alt Fire")
+        device.create_input(Button(2), "Gear")
+    return collection
+
+
+@pytest.fixture
+def wrapper():
+    plugin = MagicMock()
+    plugin.name = "Mock Plugin"
+    plugin.ready = True
+    plugin.process.return_value = _collection()
+    plugin.source_files.return_value = [("a.lua", 1000, 0), ("b.lua", 500, 0)]
+
+    with patch("joystick_diagrams.plugin_wrapper.db_plugin_data") as db:
+        db.get_plugin_configuration.return_value = ("Mock Plugin", 1)
+        yield PluginWrapper(plugin)
+
+
+def test_process_records_run_metrics(wrapper):
+    assert wrapper.process()
+
+    metrics = wrapper.run_metrics
+    assert metrics.wall_time >= 0
+    assert metrics.files_read == 2
+    assert metrics.bytes_read == 1500
+    # Collected once, for both the fingerprint and the metrics
+    wrapper.plugin.source_files.assert_called_once()
+    wrapper.plugin.source_fingerprint.assert_called_once_with(
+        wrapper.plugin.source_files.return_value
+    )
+    assert metrics.profiles == 2
+    assert metrics.devices == 2
+    # Two inputs and one modifier in each profile
+    assert metrics.bindings == 6
+    assert "6 bindings" in metrics.summary()
+
+
+def test_failed_run_clears_metrics(wrapper):
+    wrapper.process()
+    wrapper.plugin.process.side_effect = RuntimeError("Broken")
+
+    assert not wrapper.process()
+    assert wrapper.run_metrics is None
+
+
+def test_disabled_plugin_records_no_metrics(wrapper):
+    wrapper._enabled = False
+
+    assert wrapper.process()
+    assert wrapper.run_metrics is None
+    wrapper.plugin.process.assert_not_called()
+
+
+def test_format_size():
+    assert format_size(512) == "512 B"
+    assert format_size(1536) == "1.5 KiB"
+    assert format_size(3 * 1024 * 1024) == "3.0 MiB"
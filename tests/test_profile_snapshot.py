@@ -0,0 +1,184 @@
+"""Tests for the warm start profile snapshot."""
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic import Field
+
+from joystick_diagrams import profile_snapshot
+from joystick_diagrams.input.axis import Axis, AxisDirection, AxisSlider
+from joystick_diagrams.input.button import Button
+from joystick_diagrams.input.hat import Hat, HatDirection
+from joystick_diagrams.input.profile_collection import ProfileCollection
+from joystick_diagrams.input_routing import RouteKey, RouteTarget
+from joystick_diagrams.plugins.plugin_interface import PluginInterface
+from joystick_diagrams.plugins.plugin_settings import PluginMeta, PluginSettings
+
+DEVICE_GUID = "0200231d-0000-0000-0000-504944564944"
+
+
+def _collection() -> ProfileCollection:
+    collection = ProfileCollection()
+    device = collection.create_profile("Profile A").add_device(DEVICE_GUID, "Stick")
+    device.create_input(Button(1), "Fire")
+    return collection
+
+
+def _wrapper(name="Plugin", version="1.0.0", collection=None, fingerprint=None):
+    return SimpleNamespace(
+        name=name,
+        version=version,
+        enabled=True,
+        plugin_profile_collection=collection,
+        source_fingerprint=fingerprint,
+        plugin=MagicMock(),
+    )
+
+
+@pytest.fixture
+def snapshot_file(tmp_path) -> Path:
+    return tmp_path / "data" / profile_snapshot.SNAPSHOT_FILE_NAME
+
+
+def test_snapshot_round_trip(snapshot_file):
+    assert profile_snapshot.save_snapshot(
+        [_wrapper(collection=_collection(), fingerprint="abc")], snapshot_file
+    )
+
+    wrapper = _wrapper()
+    restored = profile_snapshot.restore_snapshot(
+        [wrapper], profile_snapshot.load_snapshot(snapshot_file)
+    )
+
+    assert restored == [wrapper]
+    assert wrapper.source_fingerprint == "abc"
+    device = wrapper.plugin_profile_collection.get_profile("profile a").get_device(
+        DEVICE_GUID
+    )
+    assert device.get_input("buttons", "BUTTON_1").command == "Fire"
+
+
+def test_collection_encoding_round_trip():
+    collection = _collection()
+    device = collection.get_profile("profile a").get_device(DEVICE_GUID)
+    device.create_input(Axis(AxisDirection.RX), "Pitch")
+    device.create_input(AxisSlider(2), "Throttle")
+    device.create_input(Hat(1, HatDirection.UR), "Trim")
+    device.add_modifier_to_input(Button(1), {"lalt", "lctrl"}, "Alt Fire")
+    collection.get_profile("profile a").input_routes = {
+        RouteKey("vjoy", "buttons", "BUTTON_1"): [
+            RouteTarget(DEVICE_GUID, "buttons", "BUTTON_1", "Long")
+        ]
+    }
+
+    decoded = profile_snapshot.decode_collection(
+        json.loads(json.dumps(profile_snapshot.encode_collection(collection)))
+    )
+
+    profile = decoded.get_profile("profile a")
+    assert profile.input_routes == collection.get_profile("profile a").input_routes
+    assert {
+        key: repr(input_)
+        for key, input_ in profile.get_device(DEVICE_GUID).get_combined_inputs().items()
+    } == {key: repr(input_) for key, input_ in device.get_combined_inputs().items()}
+
+
+def test_snapshot_skips_plugins_without_results(snapshot_file):
+    profile_snapshot.save_snapshot(
+        [_wrapper(name="Ran", collection=_collection(), fingerprint="abc"), _wrapper()],
+        snapshot_file,
+    )
+
+    assert set(profile_snapshot.load_snapshot(snapshot_file)) == {"Ran"}
+
+
+def test_snapshot_from_other_app_version_is_discarded(snapshot_file):
+    with patch.object(profile_snapshot.version, "VERSION", "0.0.1"):
+        profile_snapshot.save_snapshot(
+            [_wrapper(collection=_collection(), fingerprint="abc")], snapshot_file
+        )
+
+    assert profile_snapshot.load_snapshot(snapshot_file) == {}
+
+
+def test_unreadable_snapshot_is_discarded(snapshot_file):
+    snapshot_file.parent.mkdir(parents=True)
+    snapshot_file.write_text("not json")
+
+    assert profile_snapshot.load_snapshot(snapshot_file) == {}
+
+
+def test_snapshot_not_restored_for_new_plugin_version(snapshot_file):
+    profile_snapshot.save_snapshot(
+        [_wrapper(collection=_collection(), fingerprint="abc")], snapshot_file
+    )
+
+    wrapper = _wrapper(version="2.0.0")
+    restored = profile_snapshot.restore_snapshot(
+        [wrapper], profile_snapshot.load_snapshot(snapshot_file)
+    )
+
+    assert restored == []
+    assert wrapper.plugin_profile_collection is None
+
+
+def test_stale_plugin_wrappers():
+    current = _wrapper(fingerprint="abc")
+    current.plugin.source_fingerprint.return_value = "abc"
+    changed = _wrapper(fingerprint="abc")
+    changed.plugin.source_fingerprint.return_value = "def"
+
+    assert profile_snapshot.stale_plugin_wrappers([current, changed]) == [changed]
+
+
+def test_plugins_that_fail_to_fingerprint_are_stale():
+    broken = _wrapper(fingerprint="abc")
+    broken.plugin.source_fingerprint.side_effect = FileNotFoundError("Gone")
+    current = _wrapper(fingerprint="abc")
+    current.plugin.source_fingerprint.return_value = "abc"
+
+    assert profile_snapshot.stale_plugin_wrappers([broken, current]) == [broken]
+
+
+class FileSettings(PluginSettings):
+    source: Path = Field(default=None)
+
+
+class FilePlugin(PluginInterface):
+    plugin_meta = PluginMeta(name="File Plugin", version="1.0.0", icon_path="x.ico")
+    plugin_settings_model = FileSettings
+
+    def process(self) -> ProfileCollection:
+        return ProfileCollection()
+
+
+def test_source_fingerprint_tracks_setting_files(tmp_path):
+    source = tmp_path / "profiles"
+    source.mkdir()
+    (source / "a.lua").write_text("a")
+
+    plugin = FilePlugin()
+    plugin._plugin_settings.source = source
+    fingerprint = plugin.source_fingerprint()
+
+    assert plugin.source_fingerprint() == fingerprint
+
+    (source / "b.lua").write_text("b")
+    assert plugin.source_fingerprint() != fingerprint
+
+
+def test_source_fingerprint_ignores_nested_folders(tmp_path):
+    source = tmp_path / "profiles"
+    (source / "logs").mkdir(parents=True)
+    (source / "a.lua").write_text("a")
+
+    plugin = FilePlugin()
+    plugin._plugin_settings.source = source
+    fingerprint = plugin.source_fingerprint()
+
+    (source / "logs" / "run.log").write_text("log")
+    assert plugin.source_fingerprint() == fingerprint
+    assert plugin.source_fingerprint(plugin.source_files()) == fingerprint
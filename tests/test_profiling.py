@@ -0,0 +1,95 @@
+"""Tests for cProfile and tracemalloc capture."""
+
+import pstats
+import threading
+import tracemalloc
+
+import pytest
+
+from joystick_diagrams import profiling
+
+
+@pytest.fixture(autouse=True)
+def reset_profiling():
+    profiling.set_enabled(False)
+    yield
+    profiling.set_enabled(False)
+    profiling._captures.clear()
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    profiling._owns_tracemalloc = False
+
+
+def _work():
+    return sorted(str(i) for i in range(2000))
+
+
+def test_capture_disabled_writes_nothing(tmp_path):
+    profiling.start_capture("export")
+    with profiling.profiled("export"):
+        _work()
+
+    assert profiling.finish_capture("export", tmp_path) == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_capture_writes_profile_and_allocations(tmp_path):
+    profiling.set_enabled(True)
+    profiling.start_capture("plugins")
+
+    with profiling.profiled("plugins"):
+        _work()
+
+    profile_path, allocations_path = profiling.finish_capture("plugins", tmp_path)
+
+    assert profile_path.suffix == ".prof"
+    functions = {func[2] for func in pstats.Stats(str(profile_path)).stats}
+    assert "_work" in functions
+
+    summary = allocations_path.read_text(encoding="utf-8")
+    assert summary.startswith("Capture: plugins")
+    assert f"Top {profiling.TOP_ALLOCATIONS} allocation sites" in summary
+    assert not tracemalloc.is_tracing()
+
+
+def test_profiles_from_worker_threads_are_merged(tmp_path):
+    profiling.set_enabled(True)
+    profiling.start_capture("export")
+
+    def worker():
+        with profiling.profiled("export"):
+            _work()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    with profiling.profiled("export"):
+        pass
+
+    assert len(profiling._captures["export"].profiles) == 2
+    profile_path, _ = profiling.finish_capture("export", tmp_path)
+    assert "_work" in {func[2] for func in pstats.Stats(str(profile_path)).stats}
+
+
+def test_only_the_next_run_is_captured(tmp_path):
+    profiling.set_enabled(True)
+
+    for name in profiling.CAPTURE_NAMES:
+        profiling.start_capture(name)
+        with profiling.profiled(name):
+            _work()
+        assert len(profiling.finish_capture(name, tmp_path)) == 2
+
+    assert not profiling.is_enabled()
+    profiling.start_capture("export")
+    assert profiling.finish_capture("export", tmp_path) == []
+
+
+def test_configure_from_environment(monkeypatch):
+    monkeypatch.setenv(profiling.PROFILE_ENV_VAR, "1")
+    assert profiling.configure()
+    assert profiling._pending == {"startup", *profiling.CAPTURE_NAMES}
+
+    profiling.set_enabled(False)
+    monkeypatch.setenv(profiling.PROFILE_ENV_VAR, "0")
+    assert not profiling.configure()
@@ -0,0 +1,143 @@
+"""Tests for the synthetic profile and template generator."""
+
+import json
+import pickle
+
+import pytest
+
+from joystick_diagrams import synthetic
+from joystick_diagrams.conflict_strategy import AliasConflictStrategy
+from joystick_diagrams.input_routing import apply_routes, union_profile_routes
+from joystick_diagrams.synthetic import SyntheticSpec
+from joystick_diagrams.template import Template
+
+
+def _device_snapshot(collection):
+    return {
+        name: {
+            guid: {
+                key: (input_.command, [str(m) for m in input_.modifiers])
+                for key, input_ in device.get_combined_inputs().items()
+            }
+            for guid, device in profile.devices.items()
+        }
+        for name, profile in collection.profiles.items()
+    }
+
+
+def test_generates_requested_shape():
+    spec = SyntheticSpec(profiles=3, devices_per_profile=2, buttons=10, axes=2, hats=1)
+
+    result = synthetic.generate(spec)
+
+    assert len(result.collection) == 3
+    for profile in result.collection.profiles.values():
+        assert len(profile.devices) == 2
+        for device in profile.devices.values():
+            assert len(device.inputs["buttons"]) == 10
+            assert len(device.inputs["axis"]) == 2
+            assert len(device.inputs["hats"]) == 4
+
+
+def test_modifier_depth():
+    spec = SyntheticSpec(profiles=1, devices_per_profile=1, buttons=3, modifier_depth=3)
+
+    device = next(
+        iter(synthetic.generate(spec).collection.profiles.popitem()[1].devices.values())
+    )
+    modifiers = device.get_input("buttons", "BUTTON_1").modifiers
+
+    assert sorted(len(m.modifiers) for m in modifiers) == [1, 2, 3]
+    assert device.get_input("buttons", "BUTTON_2").modifiers == []
+
+
+def test_same_seed_generates_same_profiles():
+    spec = SyntheticSpec(profiles=2, modifier_depth=2, routes=4, alias_pairs=1)
+
+    first = synthetic.generate(spec)
+    second = synthetic.generate(spec)
+
+    assert _device_snapshot(first.collection) == _device_snapshot(second.collection)
+    assert first.aliases == second.aliases
+
+
+def test_aliases_target_regular_devices():
+    spec = SyntheticSpec(profiles=2, devices_per_profile=2, alias_pairs=3)
+
+    result = synthetic.generate(spec)
+    profiles = list(result.collection.profiles.values())
+
+    assert len(result.aliases) == 3
+    assert set(result.aliases.values()) <= set(profiles[0].devices)
+    # Alias sources only appear in alternate profiles
+    assert len(profiles[0].devices) == 2
+    assert set(result.aliases) <= set(profiles[1].devices)
+
+
+def test_routes_apply_to_the_first_device():
+    spec = SyntheticSpec(profiles=1, devices_per_profile=1, buttons=8, routes=4)
+
+    result = synthetic.generate(spec)
+    profile = next(iter(result.collection.profiles.values()))
+    routes = union_profile_routes([profile])
+
+    assert len(routes) == 4
+    apply_routes(profile, routes, AliasConflictStrategy.MODIFIER, result.devices)
+
+    # The virtual device is emptied by its routes, and dropped
+    assert len(profile.devices) == 1
+
+
+def test_inheritance_fan_out_picks_earlier_profiles():
+    spec = SyntheticSpec(profiles=5, devices_per_profile=1, inheritance_fan_out=2)
+
+    result = synthetic.generate(spec)
+    names = list(result.collection.profiles)
+
+    assert names[0] not in result.parents
+    assert len(result.parents[names[1]]) == 1
+    for name, parents in result.parents.items():
+        assert len(parents) <= 2
+        assert all(names.index(parent) < names.index(name) for parent in parents)
+
+
+def test_invalid_spec_is_rejected():
+    with pytest.raises(ValueError):
+        SyntheticSpec(axes=20)
+
+    with pytest.raises(ValueError):
+        SyntheticSpec(buttons=2, routes=3)
+
+
+def test_template_has_a_key_for_every_input(tmp_path):
+    spec = SyntheticSpec(buttons=12, axes=3, hats=2, modifier_depth=2)
+
+    path = synthetic.write_template(tmp_path / "template.svg", spec, size_bytes=50_000)
+    template = Template(str(path))
+
+    assert path.stat().st_size >= 50_000
+    assert template.button_count == 12
+    assert template.axis_count == 3
+    assert template.hat_count == 8
+    assert "button_1_modifier_2" in template.get_template_modifiers()
+    assert template.template_name
+    assert template.date
+
+
+def test_command_line_writes_fixtures(tmp_path):
+    assert (
+        synthetic.main(
+            [str(tmp_path), "--profiles", "2", "--devices", "2", "--alias-pairs", "1"]
+        )
+        == 0
+    )
+
+    with open(tmp_path / "collection.pickle", "rb") as f:
+        collection = pickle.load(f)
+    manifest = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+
+    assert len(collection) == 2
+    assert manifest["spec"]["devices_per_profile"] == 2
+    assert len(manifest["aliases"]) == 1
+    for device in manifest["devices"].values():
+        assert (tmp_path / "templates" / device["template"]).is_file()
@@ -101,3 +101,46 @@ def test_template_template_date_missing(get_template_path_valid):
         Template.TEMPLATE_DATE_KEY, "", setup_template.raw_data
     )
     assert setup_template.date is False
+
+
+def test_template_requires_web_engine(get_template_path_valid):
+    setup_template = Template(get_template_path_valid)
+    assert setup_template.requires_web_engine is True
+
+
+def test_template_without_html_labels(tmp_path):
+    template_path = tmp_path / "plain.svg"
+    template_path.write_text(
+        '<svg width="100px" height="50px"><text>BUTTON_1</text></svg>',
+        encoding="utf-8",
+    )
+
+    assert Template(template_path).requires_web_engine is False
+
+
+def test_template_editor_payload(get_template_path_valid):
+    setup_template = Template(get_template_path_valid)
+
+    assert setup_template.editor_payload.startswith("&lt;mxfile ")
+    stripped = setup_template.raw_data_without_editor_payload
+    assert ' content="' not in stripped
+    assert 'viewBox="-0.5 -0.5 1159 808">' in stripped
+    assert len(stripped) == len(setup_template.raw_data) - len(
+        f' content="{setup_template.editor_payload}"'
+    )
+
+
+def test_template_scanned_without_decoding(get_template_path_valid):
+    setup_template = Template(get_template_path_valid)
+
+    assert setup_template.button_count == 3
+    assert setup_template.template_name is True
+    assert setup_template.requires_web_engine is True
+    assert "raw_data" not in setup_template.__dict__
+
+    assert "BUTTON_1" in setup_template.raw_data
+
+
+def test_template_missing_file(tmp_path):
+    with pytest.raises(JoystickDiagramsError):
+        Template(tmp_path / "missing.svg")
@@ -0,0 +1,103 @@
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from joystick_diagrams.template import Template
+from joystick_diagrams.template_flatten import (
+    flatten_file,
+    flatten_template,
+    html_label_lines,
+)
+
+LABEL = (
+    '<switch><foreignObject pointer-events="none" width="100%" height="100%" '
+    'requiredFeatures="http://www.w3.org/TR/SVG11/feature#Extensibility">'
+    '<div xmlns="http://www.w3.org/1999/xhtml" style="display: flex; '
+    'align-items: unsafe center; width: 98px; height: 1px; padding-top: 698px;">'
+    '<div style="box-sizing: border-box;"><div style="display: inline-block; '
+    'font-size: 12px; line-height: 1.2;">{}</div></div></div></foreignObject>'
+    '<text x="625" y="701" fill="rgb(0, 0, 0)" font-family="Helvetica" '
+    'font-size="12px" text-anchor="middle">{}...</text></switch>'
+)
+TEXT_WARNING = (
+    '<switch><g requiredFeatures="http://www.w3.org/TR/SVG11/feature#Extensibility"/>'
+    '<a xlink:href="https://www.drawio.com/doc/faq/svg-export-text-problems">'
+    "<text>Text is not SVG - cannot display</text></a></switch>"
+)
+
+
+def wrap_svg(body: str) -> str:
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        'xmlns:xlink="http://www.w3.org/1999/xlink" width="800px" height="800px">'
+        f"<g>{body}</g>{TEXT_WARNING}</svg>"
+    )
+
+
+def test_html_label_lines():
+    assert html_label_lines("BUTTON_1") == ["BUTTON_1"]
+    assert html_label_lines("<font>AXIS_X / </font><font>AXIS_Y</font><br />") == [
+        "AXIS_X / AXIS_Y"
+    ]
+    assert html_label_lines("BUTTON_1<br>BUTTON_1_Modifiers") == [
+        "BUTTON_1",
+        "BUTTON_1_Modifiers",
+    ]
+    assert html_label_lines("<br /><br />&lt;&gt;<div><br /></div>") == [
+        "",
+        "",
+        "&lt;&gt;",
+        "",
+    ]
+
+
+def test_flatten_single_line_label():
+    flattened, labels = flatten_template(wrap_svg(LABEL.format("BUTTON_1", "BUT")))
+
+    assert labels == 1
+    assert "<foreignObject" not in flattened
+    assert "svg-export-text-problems" not in flattened
+    assert (
+        '<text x="625" y="701" fill="rgb(0, 0, 0)" font-family="Helvetica" '
+        'font-size="12px" text-anchor="middle">'
+        '<tspan x="625" y="701">BUTTON_1</tspan></text>'
+    ) in flattened
+    ET.fromstring(flattened)
+
+
+def test_flatten_multi_line_label_is_centred():
+    flattened, _ = flatten_template(
+        wrap_svg(LABEL.format("BUTTON_1<br>BUTTON_1_Modifiers", "BUT"))
+    )
+
+    assert (
+        '<tspan x="625" y="693.8">BUTTON_1</tspan>'
+        '<tspan x="625" y="708.2">BUTTON_1_Modifiers</tspan>'
+    ) in flattened
+
+
+def test_text_warning_kept_while_html_remains():
+    svg = wrap_svg(
+        "<switch><foreignObject><div>BUTTON_1</div></foreignObject></switch>"
+    )
+
+    flattened, labels = flatten_template(svg)
+
+    assert labels == 0
+    assert flattened == svg
+
+
+def test_flatten_bundled_template_keeps_keys(tmp_path):
+    template_path = Path("templates/CH/CH Fighterstick USB.svg")
+    output = tmp_path / "flat.svg"
+
+    result = flatten_file(template_path, output)
+
+    original, flattened = Template(template_path), Template(output)
+    assert result.labels > 0
+    assert result.flattened_size < result.original_size
+    assert not flattened.requires_web_engine
+    assert flattened.get_template_buttons() == original.get_template_buttons()
+    assert flattened.get_template_hats() == original.get_template_hats()
+    assert flattened.get_template_axis() == original.get_template_axis()
+    assert flattened.get_template_modifiers() == original.get_template_modifiers()
+    ET.parse(output)
@@ -0,0 +1,109 @@
+"""Tests for pipeline tracing spans and trace file output."""
+
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from joystick_diagrams import tracing
+
+
+@pytest.fixture(autouse=True)
+def reset_tracing():
+    tracing.set_enabled(False)
+    yield
+    tracing.set_enabled(False)
+
+
+def _events(path):
+    return [e for e in json.loads(path.read_text())["traceEvents"] if e["ph"] == "X"]
+
+
+def test_disabled_span_records_nothing(tmp_path):
+    with tracing.span("stage"):
+        pass
+
+    assert tracing.span("stage") is tracing.span("other")
+    assert tracing.write_trace("run", tmp_path) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spans_written_as_chrome_trace(tmp_path):
+    tracing.set_enabled(True)
+
+    @tracing.traced()
+    def create_wrappers():
+        with tracing.span("inner", count=2):
+            pass
+
+    create_wrappers()
+    path = tracing.write_trace("plugins", tmp_path)
+
+    events = _events(path)
+    assert [e["name"] for e in events] == ["inner", create_wrappers.__qualname__]
+    assert events[0]["args"] == {"count": 2}
+    assert all(e["dur"] >= 0 for e in events)
+    assert path.name.startswith("trace-plugins-")
+
+
+def test_write_trace_clears_recorded_spans(tmp_path):
+    tracing.set_enabled(True)
+    with tracing.span("stage"):
+        pass
+
+    assert tracing.write_trace("run", tmp_path) is not None
+    assert tracing.write_trace("run", tmp_path) is None
+
+
+def test_spans_from_other_threads_are_named(tmp_path):
+    tracing.set_enabled(True)
+
+    def work():
+        with tracing.span("worker stage"):
+            pass
+
+    thread = threading.Thread(target=work, name="Worker")
+    thread.start()
+    thread.join()
+
+    trace = json.loads(tracing.write_trace("run", tmp_path).read_text())
+    names = {
+        e["tid"]: e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"
+    }
+    (event,) = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert names[event["tid"]] == "Worker"
+
+
+def test_recorded_spans_on_tracks(tmp_path):
+    tracing.set_enabled(True)
+    tracing.record("render", 1_000_000, 3_000_000, track="Page 1", path="a.png")
+
+    trace = json.loads(tracing.write_trace("export", tmp_path).read_text())
+    (event,) = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    names = {
+        e["tid"]: e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"
+    }
+    assert event["dur"] == 2000
+    assert names[event["tid"]] == "Page 1"
+
+
+@pytest.mark.parametrize(
+    "env, setting, expected",
+    [
+        (None, None, False),
+        (None, "true", True),
+        ("1", None, True),
+        ("0", "true", False),
+    ],
+)
+def test_configure(monkeypatch, env, setting, expected):
+    if env is None:
+        monkeypatch.delenv(tracing.TRACE_ENV_VAR, raising=False)
+    else:
+        monkeypatch.setenv(tracing.TRACE_ENV_VAR, env)
+
+    with patch("joystick_diagrams.db.db_settings.get_setting", return_value=setting):
+        tracing.configure()
+
+    assert tracing.is_enabled() is expected